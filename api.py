@@ -1,24 +1,34 @@
 #!/usr/bin/env python3
 
 import os, sys
+import argparse
 import uvicorn
 import aiofiles
 import configparser
 import asyncio
+import math
 import time
 from typing import List
 from fastapi import FastAPI
 from fastapi.responses import JSONResponse
 from fastapi.responses import FileResponse
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import uuid
+import json
 
-from sources.llm_provider import Provider
+from sources.provider_pool import create_provider
 from sources.interaction import Interaction
 from sources.agents import CasualAgent, CoderAgent, FileAgent, PlannerAgent, BrowserAgent
 from sources.browser import Browser, create_driver
 from sources.utility import pretty_print
+from sources.model_registry import model_registry
+from sources.conversation_store import get_conversation_store
+from sources.summarizers import summarizers_report
+from sources.token_stream import TokenStream
+from sources.response_cache import get_response_cache
+from sources.provider_health import get_health_checker
 from sources.logger import Logger
 from sources.schemas import QueryRequest, QueryResponse
 
@@ -43,17 +53,24 @@ api.add_middleware(
 if not os.path.exists(".screenshots"):
     os.makedirs(".screenshots")
 api.mount("/screenshots", StaticFiles(directory=".screenshots"), name="screenshots")
+token_stream = TokenStream()
 
 def initialize_system():
     stealth_mode = config.getboolean('BROWSER', 'stealth_mode')
     personality_folder = "jarvis" if config.getboolean('MAIN', 'jarvis_personality') else "base"
     languages = config["MAIN"]["languages"].split(' ')
 
-    provider = Provider(
+    provider = create_provider(
         provider_name=config["MAIN"]["provider_name"],
         model=config["MAIN"]["provider_model"],
         server_address=config["MAIN"]["provider_server_address"],
-        is_local=config.getboolean('MAIN', 'is_local')
+        is_local=config.getboolean('MAIN', 'is_local'),
+        strategy=config.get('MAIN', 'provider_balancing', fallback='least_outstanding'),
+        max_concurrency=config.getint('MAIN', 'provider_max_concurrency', fallback=4),
+        http_max_connections=config.getint('MAIN', 'http_max_connections', fallback=32),
+        http_timeout=config.getfloat('MAIN', 'http_timeout', fallback=600.0),
+        response_cache=get_response_cache(ttl=config.getfloat('MAIN', 'response_cache_ttl', fallback=86400.0))
+                       if config.getboolean('MAIN', 'response_cache', fallback=False) else None
     )
     logger.info(f"Provider initialized: {provider.provider_name} ({provider.model})")
 
@@ -87,9 +104,14 @@ def initialize_system():
         PlannerAgent(
             name="Planner",
             prompt_path=f"prompts/{personality_folder}/planner_agent.txt",
-            provider=provider, verbose=False, browser=browser
+            provider=provider, verbose=False, browser=browser,
+            plan_samples=config.getint('MAIN', 'planner_samples', fallback=1)
         )
     ]
+    for agent in agents:
+        agent.set_token_stream(token_stream)
+        agent.set_token_budget(config.getint('MAIN', 'memory_token_budget', fallback=0))
+        agent.set_long_term_memory(config.getboolean('MAIN', 'long_term_memory', fallback=False))
     logger.info("Agents initialized")
 
     interaction = Interaction(
@@ -97,13 +119,18 @@ def initialize_system():
         tts_enabled=config.getboolean('MAIN', 'speak'),
         stt_enabled=config.getboolean('MAIN', 'listen'),
         recover_last_session=config.getboolean('MAIN', 'recover_last_session'),
-        langs=languages
+        langs=languages,
+        router_backend=config.get('MAIN', 'router_backend', fallback="torch"),
+        router_multilingual=config.getboolean('MAIN', 'router_multilingual', fallback=False)
     )
     logger.info("Interaction initialized")
     return interaction
 
 interaction = initialize_system()
-is_generating = False
+query_lock = asyncio.Lock() # the interaction answers one query at a time
+QUERY_RETRY_AFTER = 5 # seconds, Retry-After until a query duration is known
+query_started = 0.0
+mean_query_duration = None
 query_resp_history = []
 
 @api.get("/screenshot")
@@ -123,6 +150,50 @@ async def health_check():
     logger.info("Health check endpoint called")
     return {"status": "healthy", "version": "0.1.0"}
 
+@api.get("/models")
+async def get_models():
+    logger.info("Models endpoint called")
+    return {"models": model_registry.report()}
+
+@api.get("/router_stats")
+async def get_router_stats():
+    logger.info("Router stats endpoint called")
+    return interaction.router.get_stats()
+
+@api.get("/summarizers")
+async def get_summarizers():
+    logger.info("Summarizers endpoint called")
+    return {"summarizers": summarizers_report()}
+
+@api.get("/provider_health")
+async def get_provider_health():
+    logger.info("Provider health endpoint called")
+    return {"servers": get_health_checker().get_states()}
+
+@api.get("/response_cache")
+async def get_response_cache_stats():
+    logger.info("Response cache endpoint called")
+    if interaction.current_agent is None or interaction.current_agent.llm.response_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **interaction.current_agent.llm.response_cache.stats()}
+
+@api.get("/sessions")
+async def list_sessions(agent_type: str | None = None, q: str | None = None, limit: int = 20, offset: int = 0):
+    logger.info("Sessions endpoint called")
+    store = get_conversation_store()
+    limit = max(1, min(limit, 100))
+    if q:
+        return store.search_sessions(q, agent_type=agent_type, limit=limit, offset=offset)
+    return store.list_sessions(agent_type=agent_type, limit=limit, offset=offset)
+
+@api.get("/sessions/{session_id}")
+async def get_session(session_id: str):
+    logger.info(f"Session endpoint called for {session_id}")
+    messages = get_conversation_store().load_messages(session_id)
+    if len(messages) == 0:
+        return JSONResponse(status_code=404, content={"error": "Session not found"})
+    return {"id": session_id, "messages": messages}
+
 @api.get("/is_active")
 async def is_active():
     logger.info("Is active endpoint called")
@@ -134,6 +205,22 @@ async def stop():
     interaction.current_agent.request_stop()
     return JSONResponse(status_code=200, content={"status": "stopped"})
 
+@api.get("/stream")
+async def stream_tokens():
+    """
+    Server-sent events of the tokens generated by the agents, as soon as they are generated.
+    Events are "start", "token" (with the token "content") and "end", each with the "agent" name.
+    """
+    logger.info("Stream endpoint called")
+    async def event_source():
+        async for event in token_stream.events(heartbeat=15.0):
+            if event is None:
+                yield ": keep-alive\n\n"
+                continue
+            yield f"event: {event['event']}\ndata: {json.dumps(event)}\n\n"
+    return StreamingResponse(event_source(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
 @api.get("/latest_answer")
 async def get_latest_answer():
     global query_resp_history
@@ -180,9 +267,25 @@ async def think_wrapper(interaction, query):
         interaction.last_success = False
         raise e
 
+async def timed_query(query):
+    """Answer a query and keep a moving average of the query durations for Retry-After."""
+    global query_started, mean_query_duration
+    query_started = time.time()
+    try:
+        return await think_wrapper(interaction, query)
+    finally:
+        duration = time.time() - query_started
+        mean_query_duration = duration if mean_query_duration is None else 0.3 * duration + 0.7 * mean_query_duration
+
+def query_retry_after() -> int:
+    """Estimate the seconds before the query being processed is answered."""
+    if mean_query_duration is None:
+        return QUERY_RETRY_AFTER
+    return max(1, math.ceil(mean_query_duration - (time.time() - query_started)))
+
 @api.post("/query", response_model=QueryResponse)
 async def process_query(request: QueryRequest):
-    global is_generating, query_resp_history
+    global query_resp_history
     logger.info(f"Processing query: {request.query}")
     query_resp = QueryResponse(
         done="false",
@@ -194,14 +297,14 @@ async def process_query(request: QueryRequest):
         status="Ready",
         uid=str(uuid.uuid4())
     )
-    if is_generating:
+    if query_lock.locked():
         logger.warning("Another query is being processed, please wait.")
-        return JSONResponse(status_code=429, content=query_resp.jsonify())
+        return JSONResponse(status_code=429, content=query_resp.jsonify(),
+                            headers={"Retry-After": str(query_retry_after())})
 
     try:
-        is_generating = True
-        success = await think_wrapper(interaction, request.query)
-        is_generating = False
+        async with query_lock:
+            success = await timed_query(request.query)
 
         if not success:
             query_resp.answer = interaction.last_answer
@@ -247,4 +350,9 @@ async def process_query(request: QueryRequest):
             interaction.save_session()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='AgenticSeek API server')
+    parser.add_argument('--warm', action='store_true', help='Preload routing, translation and summarization models in the background')
+    args = parser.parse_args()
+    if args.warm:
+        model_registry.warm()
     uvicorn.run(api, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -0,0 +1,19 @@
+import subprocess
+from typing import List
+
+import numpy as np
+
+def percentiles(values: List[float]) -> dict:
+    """Get the p50/p95/p99 of durations, in milliseconds."""
+    if len(values) == 0:
+        return {"p50": None, "p95": None, "p99": None}
+    p50, p95, p99 = np.percentile(np.array(values) * 1000, [50, 95, 99])
+    return {"p50": round(float(p50), 3), "p95": round(float(p95), 3), "p99": round(float(p99), 3)}
+
+def get_commit() -> str | None:
+    """Get the short hash of the benchmarked commit, None outside of a git checkout."""
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5)
+        return result.stdout.strip() if result.returncode == 0 else None
+    except Exception:
+        return None
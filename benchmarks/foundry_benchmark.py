@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  # Add project root to Python path
+from bench_utils import percentiles, get_commit
+from sources.llm_provider import Provider
+
+MODES = ["cli", "worker"]
+PROMPTS = [
+    "Say hello in one word.",
+    "What is 2 + 2? Answer with a number only.",
+    "Name one color of the rainbow.",
+    "Give a synonym of 'fast' in one word.",
+]
+
+def run_benchmark(provider: Provider, mode: str, calls: int) -> dict:
+    """
+    Time each call of a mode: "cli" spawns `foundry chat` per call, "worker" reuses the Foundry Local service.
+    The first call is reported apart, it includes the service start and model load of the worker.
+    """
+    generate = provider.foundry_cli_fn if mode == "cli" else provider.foundry_fn
+    durations = []
+    errors = 0
+    for i in range(calls):
+        history = [{"role": "user", "content": PROMPTS[i % len(PROMPTS)]}]
+        start_time = time.perf_counter()
+        try:
+            generate(history, verbose=False)
+        except Exception as e:
+            errors += 1
+            print(f"{mode} call {i} failed: {str(e)}", file=sys.stderr)
+        durations.append(time.perf_counter() - start_time)
+    worker = provider.foundry_worker()
+    return {
+        "calls": calls,
+        "errors": errors,
+        "first_call_ms": round(durations[0] * 1000, 3) if durations else None,
+        "latency_ms": percentiles(durations[1:]),
+        "endpoint": worker.base_url if mode == "worker" and worker is not None else None,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='AgenticSeek Foundry Local per-call latency benchmark')
+    parser.add_argument('--model', type=str, default="phi-3.5-mini", help='Foundry Local model alias')
+    parser.add_argument('--calls', type=int, default=10, help='Number of calls per mode')
+    parser.add_argument('--modes', type=str, default="cli worker", help='Modes to compare, space separated: cli worker')
+    parser.add_argument('--output', type=str, default=None, help='Path of the JSON report, printed if not set')
+    args = parser.parse_args()
+
+    provider = Provider("foundry", args.model, is_local=True, health_check=False)
+    report = {
+        "commit": get_commit(),
+        "model": args.model,
+        "modes": {mode: run_benchmark(provider, mode, args.calls) for mode in args.modes.split(' ') if mode in MODES},
+    }
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output is None:
+        print(output)
+        return
+    with open(args.output, 'w', encoding="utf-8") as f:
+        f.write(output + "\n")
+    print(f"Foundry benchmark report saved at {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import time
+import argparse
+from collections import defaultdict
+from typing import Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  # Add project root to Python path
+from bench_utils import percentiles, get_commit
+from sources.router_examples import FEW_SHOTS_COMPLEXITY, FEW_SHOTS_TASKS
+from sources.router_heuristics import LABEL_ALIASES
+
+STAGES = ["detect", "translate", "encode", "complexity", "vote", "total"]
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), "router_corpus.json")
+ROUTER_EXAMPLES_PATH = os.path.join(os.path.dirname(__file__), "..", "llm_router", "examples.json")
+
+class BenchmarkAgent:
+    """Stand-in agent, the router only needs the role, type and name of agents."""
+    def __init__(self, name: str, role: str, agent_type: str):
+        self.agent_name = name
+        self.role = role
+        self.type = agent_type
+
+def build_corpus() -> List[dict]:
+    """
+    Build the labeled routing corpus.
+    Items have the query text, its language, the expected agent role and/or the expected complexity,
+    and their source: "train" for the few-shot and llm_router examples the router learns from,
+    "held_out" for the multilingual corpus the router never sees.
+    """
+    corpus = []
+    for text, label in FEW_SHOTS_TASKS:
+        corpus.append({"text": text, "lang": "en", "role": LABEL_ALIASES.get(label, label), "complexity": None, "source": "train"})
+    for text, label in FEW_SHOTS_COMPLEXITY:
+        corpus.append({"text": text, "lang": "en", "role": None, "complexity": label, "source": "train"})
+    if os.path.exists(ROUTER_EXAMPLES_PATH):
+        with open(ROUTER_EXAMPLES_PATH, 'r', encoding="utf-8") as f:
+            for label, examples in json.load(f).items():
+                for example in examples:
+                    corpus.append({"text": example["text"], "lang": "en", "role": None, "complexity": label, "source": "train"})
+    # a held-out item seen in training would measure memorization, not routing
+    train_texts = {normalize(item["text"]) for item in corpus}
+    with open(CORPUS_PATH, 'r', encoding="utf-8") as f:
+        held_out = json.load(f)
+    overlap = [item["text"] for item in held_out if normalize(item["text"]) in train_texts]
+    if overlap:
+        print(f"Dropping {len(overlap)} held-out items found in the training examples: {overlap}", file=sys.stderr)
+    corpus.extend(dict(item, source="held_out") for item in held_out if normalize(item["text"]) not in train_texts)
+    return corpus
+
+def normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+def confusion_matrix(pairs: List[tuple]) -> Dict[str, Dict[str, int]]:
+    """
+    Build a confusion matrix from (expected, predicted) pairs.
+    Returns:
+        Dict[str, Dict[str, int]]: matrix[expected][predicted] = count
+    """
+    matrix = defaultdict(lambda: defaultdict(int))
+    for expected, predicted in pairs:
+        matrix[expected][str(predicted)] += 1
+    return {expected: dict(row) for expected, row in matrix.items()}
+
+def accuracy(pairs: List[tuple]) -> float | None:
+    if len(pairs) == 0:
+        return None
+    return round(sum(expected == predicted for expected, predicted in pairs) / len(pairs), 4)
+
+def peak_rss_mb() -> float | None:
+    """Get the peak resident memory of the process in MB."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return round(peak / (1024 * 1024), 1) # bytes on macOS
+    return round(peak / 1024, 1) # kilobytes on linux
+
+def run_benchmark(router, corpus: List[dict]) -> dict:
+    """
+    Route every corpus item through the router batcher, as select_agent does on a decision cache miss,
+    and collect accuracy and latency per stage. The total latency includes the batcher.
+    Accuracy and confusion matrices are computed on the held-out items, the accuracy on the training
+    examples is reported apart as it only shows how well the router fits what it learned from.
+    """
+    durations = {stage: [] for stage in STAGES}
+    role_pairs = []
+    complexity_pairs = []
+    train_role_pairs = []
+    train_complexity_pairs = []
+    by_lang = defaultdict(list)
+    complexity_by_lang = defaultdict(list)
+    timings = {}
+    router.batcher.batch_fn = lambda texts: router.route_batch(texts, timings) # record the stage timings
+    for item in corpus:
+        timings.clear()
+        start_time = time.perf_counter()
+        role, complexity = router.batcher.process(item["text"])
+        timings["total"] = time.perf_counter() - start_time
+        for stage in STAGES:
+            durations[stage].append(timings.get(stage, 0.0))
+        predicted_role = "planification" if complexity == "HIGH" else role
+        held_out = item["source"] == "held_out"
+        if item["role"] is not None:
+            (role_pairs if held_out else train_role_pairs).append((item["role"], predicted_role))
+            if held_out:
+                by_lang[item["lang"]].append((item["role"], predicted_role))
+        if item["complexity"] is not None:
+            (complexity_pairs if held_out else train_complexity_pairs).append((item["complexity"], complexity))
+            if held_out:
+                complexity_by_lang[item["lang"]].append((item["complexity"], complexity))
+    return {
+        "items": len(corpus),
+        "held_out_items": sum(item["source"] == "held_out" for item in corpus),
+        "role_accuracy": accuracy(role_pairs),
+        "role_accuracy_by_lang": {lang: accuracy(pairs) for lang, pairs in by_lang.items()},
+        "complexity_accuracy": accuracy(complexity_pairs),
+        "complexity_accuracy_by_lang": {lang: accuracy(pairs) for lang, pairs in complexity_by_lang.items()},
+        "train_role_accuracy": accuracy(train_role_pairs),
+        "train_complexity_accuracy": accuracy(train_complexity_pairs),
+        "role_confusion": confusion_matrix(role_pairs),
+        "complexity_confusion": confusion_matrix(complexity_pairs),
+        "latency_ms": {stage: percentiles(values) for stage, values in durations.items()},
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='AgenticSeek router accuracy and latency benchmark')
+    parser.add_argument('--backend', type=str, default="torch", help='Router backend: torch, quantized, onnx or knn')
+    parser.add_argument('--multilingual', action='store_true', help='Route on the original text with a multilingual encoder (knn backend)')
+    parser.add_argument('--languages', type=str, default="en fr zh", help='Supported languages, space separated')
+    parser.add_argument('--output', type=str, default=None, help='Path of the JSON report, printed if not set')
+    args = parser.parse_args()
+
+    from sources.router import AgentRouter
+    from sources.model_registry import model_registry
+
+    agents = [
+        BenchmarkAgent("jarvis", "talk", "casual_agent"),
+        BenchmarkAgent("coder", "code", "code_agent"),
+        BenchmarkAgent("file", "files", "file_agent"),
+        BenchmarkAgent("browser", "web", "browser_agent"),
+        BenchmarkAgent("planner", "planification", "planner_agent"),
+    ]
+    languages = args.languages.split(' ')
+    router = AgentRouter(agents, supported_language=languages, backend=args.backend, multilingual=args.multilingual)
+    model_registry.warm(background=False)
+    corpus = [item for item in build_corpus() if item["lang"] in languages]
+    report = {
+        "commit": get_commit(),
+        "backend": args.backend,
+        "multilingual": args.multilingual,
+        "languages": languages,
+        "model_load_times": model_registry.report(),
+        **run_benchmark(router, corpus),
+        "tiers": router.get_stats()["tiers"],
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output is None:
+        print(output)
+        return
+    with open(args.output, 'w', encoding="utf-8") as f:
+        f.write(output + "\n")
+    print(f"Router benchmark report saved at {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -5,11 +5,13 @@ import argparse
 import configparser
 import asyncio
 
-from sources.llm_provider import Provider
+from sources.provider_pool import create_provider
 from sources.interaction import Interaction
 from sources.agents import Agent, CoderAgent, CasualAgent, FileAgent, PlannerAgent, BrowserAgent, McpAgent
 from sources.browser import Browser, create_driver
 from sources.utility import pretty_print
+from sources.model_registry import model_registry
+from sources.response_cache import get_response_cache
 
 import warnings
 warnings.filterwarnings("ignore")
@@ -17,16 +19,26 @@ warnings.filterwarnings("ignore")
 config = configparser.ConfigParser()
 config.read('config.ini')
 
+parser = argparse.ArgumentParser(description='AgenticSeek CLI')
+parser.add_argument('--warm', action='store_true', help='Preload routing, translation and summarization models in the background')
+args = parser.parse_args()
+
 async def main():
     pretty_print("Initializing...", color="status")
     stealth_mode = config.getboolean('BROWSER', 'stealth_mode')
     personality_folder = "jarvis" if config.getboolean('MAIN', 'jarvis_personality') else "base"
     languages = config["MAIN"]["languages"].split(' ')
 
-    provider = Provider(provider_name=config["MAIN"]["provider_name"],
-                        model=config["MAIN"]["provider_model"],
-                        server_address=config["MAIN"]["provider_server_address"],
-                        is_local=config.getboolean('MAIN', 'is_local'))
+    provider = create_provider(provider_name=config["MAIN"]["provider_name"],
+                               model=config["MAIN"]["provider_model"],
+                               server_address=config["MAIN"]["provider_server_address"],
+                               is_local=config.getboolean('MAIN', 'is_local'),
+                               strategy=config.get('MAIN', 'provider_balancing', fallback='least_outstanding'),
+                               max_concurrency=config.getint('MAIN', 'provider_max_concurrency', fallback=4),
+                               http_max_connections=config.getint('MAIN', 'http_max_connections', fallback=32),
+                               http_timeout=config.getfloat('MAIN', 'http_timeout', fallback=600.0),
+                               response_cache=get_response_cache(ttl=config.getfloat('MAIN', 'response_cache_ttl', fallback=86400.0))
+                                              if config.getboolean('MAIN', 'response_cache', fallback=False) else None)
 
     browser = Browser(
         create_driver(headless=config.getboolean('BROWSER', 'headless_browser'), stealth_mode=stealth_mode, lang=languages[0]),
@@ -48,18 +60,26 @@ async def main():
                      provider=provider, verbose=False, browser=browser),
         PlannerAgent(name="Planner",
                      prompt_path=f"prompts/{personality_folder}/planner_agent.txt",
-                     provider=provider, verbose=False, browser=browser),
+                     provider=provider, verbose=False, browser=browser,
+                     plan_samples=config.getint('MAIN', 'planner_samples', fallback=1)),
         #McpAgent(name="MCP Agent",
         #            prompt_path=f"prompts/{personality_folder}/mcp_agent.txt",
         #            provider=provider, verbose=False), # NOTE under development
     ]
+    for agent in agents:
+        agent.set_token_budget(config.getint('MAIN', 'memory_token_budget', fallback=0))
+        agent.set_long_term_memory(config.getboolean('MAIN', 'long_term_memory', fallback=False))
 
     interaction = Interaction(agents,
                               tts_enabled=config.getboolean('MAIN', 'speak'),
                               stt_enabled=config.getboolean('MAIN', 'listen'),
                               recover_last_session=config.getboolean('MAIN', 'recover_last_session'),
-                              langs=languages
+                              langs=languages,
+                              router_backend=config.get('MAIN', 'router_backend', fallback="torch"),
+                              router_multilingual=config.getboolean('MAIN', 'router_multilingual', fallback=False)
                             )
+    if args.warm:
+        model_registry.warm()
     try:
         while interaction.is_active:
             interaction.get_user()
@@ -1,8 +1,9 @@
 #!/usr/bin python3
 
 import argparse
+import json
 import time
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, stream_with_context
 
 from sources.llamacpp_handler import LlamacppLLM
 from sources.ollama_handler import OllamaLLM
@@ -44,10 +45,33 @@ def setup():
 
 @app.route('/get_updated_sentence')
 def get_updated_sentence():
+    """
+    Status of the generation. With ?wait=true (long poll), the request blocks until the
+    buffer is longer than ?since=<length> characters or the generation is complete.
+    """
     if not generator:
         return jsonify({"error": "Generator not initialized"}), 405
-    print(generator.get_status())
+    if request.args.get('wait', 'false').lower() == 'true':
+        since = request.args.get('since', 0, type=int)
+        timeout = min(request.args.get('timeout', 30.0, type=float), 120.0)
+        return generator.wait_status(since=since, timeout=timeout)
     return generator.get_status()
 
+@app.route('/stream')
+def stream():
+    """
+    Chunked stream of the current generation, one JSON object per line:
+    {"delta": new text, "is_complete": bool}, the last line has the complete "sentence" (and "error" if any).
+    """
+    if not generator:
+        return jsonify({"error": "Generator not initialized"}), 405
+    def lines():
+        for delta, status in generator.stream():
+            if status["is_complete"]:
+                yield json.dumps({"delta": delta, **status}) + "\n"
+            else:
+                yield json.dumps({"delta": delta, "is_complete": False}) + "\n"
+    return Response(stream_with_context(lines()), mimetype='application/x-ndjson')
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', threaded=True, debug=True, port=args.port)
\ No newline at end of file
@@ -1,23 +1,29 @@
 
 import threading
 import logging
+import time
 from abc import abstractmethod
 from .cache import Cache
 
 class GenerationState:
     def __init__(self):
         self.lock = threading.Lock()
+        self.updated = threading.Condition(self.lock) # notified on every new chunk and at the end of generation
         self.last_complete_sentence = ""
         self.current_buffer = ""
         self.is_generating = False
+        self.error = None
     
     def status(self) -> dict:
-        return {
+        status = {
             "sentence": self.current_buffer,
             "is_complete": not self.is_generating,
             "last_complete_sentence": self.last_complete_sentence,
             "is_generating": self.is_generating,
         }
+        if self.error is not None:
+            status["error"] = self.error
+        return status
 
 class GeneratorLLM():
     def __init__(self):
@@ -43,6 +49,9 @@ class GeneratorLLM():
             if self.state.is_generating:
                 return False
             self.state.is_generating = True
+            self.state.last_complete_sentence = ""
+            self.state.current_buffer = ""
+            self.state.error = None
             self.logger.info("Starting generation")
             threading.Thread(target=self.generate, args=(history,)).start()
         return True
@@ -51,6 +60,52 @@ class GeneratorLLM():
         with self.state.lock:
             return self.state.status()
 
+    def append(self, content: str) -> None:
+        """
+        Add a generated chunk to the buffer and wake up the clients waiting for it.
+        """
+        with self.state.lock:
+            self.state.current_buffer += content
+            self.state.updated.notify_all()
+
+    def finish(self, error: str | None = None) -> None:
+        """
+        Mark the generation as complete and wake up the clients waiting for it.
+        """
+        with self.state.lock:
+            self.state.is_generating = False
+            self.state.error = error
+            self.state.updated.notify_all()
+
+    def wait_status(self, since: int = 0, timeout: float = 30.0) -> dict:
+        """
+        Long poll: wait until the buffer is longer than since characters or the generation is complete.
+        args:
+            since: length of the buffer already received by the client
+            timeout: maximum time to wait in seconds
+        returns:
+            the generation status
+        """
+        with self.state.lock:
+            self.state.updated.wait_for(
+                lambda: len(self.state.current_buffer) > since or not self.state.is_generating,
+                timeout=timeout)
+            return self.state.status()
+
+    def stream(self, heartbeat: float = 15.0):
+        """
+        Yield the new chunks of the current generation as soon as they are generated, until it is complete.
+        Yields (delta, status) tuples, delta is empty for heartbeats and the final status.
+        """
+        sent = 0
+        while True:
+            status = self.wait_status(since=sent, timeout=heartbeat)
+            delta = status["sentence"][sent:]
+            sent += len(delta)
+            yield delta, status
+            if status["is_complete"]:
+                return
+
     @abstractmethod
     def generate(self, history: list) -> None:
         """
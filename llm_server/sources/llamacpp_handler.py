@@ -23,18 +23,18 @@ class LlamacppLLM(GeneratorLLM):
                 verbose=True
             )
         self.logger.info(f"Using {self.model} for generation with Llama.cpp")
+        error = None
         try:
-            with self.state.lock:
-                self.state.is_generating = True
-                self.state.last_complete_sentence = ""
-                self.state.current_buffer = ""
-            output = self.llm.create_chat_completion(
-                  messages = history
+            stream = self.llm.create_chat_completion(
+                  messages = history,
+                  stream = True
             )
-            with self.state.lock:
-                self.state.current_buffer = output['choices'][0]['message']['content']
+            for chunk in stream:
+                content = chunk['choices'][0]['delta'].get('content')
+                if content:
+                    self.append(content)
         except Exception as e:
             self.logger.error(f"Error: {e}")
+            error = str(e)
         finally:
-            with self.state.lock:
-                self.state.is_generating = False
\ No newline at end of file
+            self.finish(error)
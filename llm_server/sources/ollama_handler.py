@@ -15,12 +15,8 @@ class OllamaLLM(GeneratorLLM):
 
     def generate(self, history):
         self.logger.info(f"Using {self.model} for generation with Ollama")
+        error = None
         try:
-            with self.state.lock:
-                self.state.is_generating = True
-                self.state.last_complete_sentence = ""
-                self.state.current_buffer = ""
-
             stream = ollama.chat(
                 model=self.model,
                 messages=history,
@@ -28,23 +24,22 @@ class OllamaLLM(GeneratorLLM):
             )
             for chunk in stream:
                 content = chunk['message']['content']
-
-                with self.state.lock:
-                    if '.' in content:
-                        self.logger.info(self.state.current_buffer)
-                    self.state.current_buffer += content
+                if '.' in content:
+                    self.logger.info(self.state.current_buffer)
+                self.append(content)
 
         except Exception as e:
+            error = str(e)
             if "404" in str(e):
                 self.logger.info(f"Downloading {self.model}...")
                 ollama.pull(self.model)
             if "refused" in str(e).lower():
-                raise Exception("Ollama connection failed. is the server running ?") from e
+                error = "Ollama connection failed. is the server running ?"
+                raise Exception(error) from e
             raise e
         finally:
             self.logger.info("Generation complete")
-            with self.state.lock:
-                self.state.is_generating = False
+            self.finish(error)
 
 if __name__ == "__main__":
     generator = OllamaLLM()
@@ -57,5 +52,7 @@ if __name__ == "__main__":
     generator.set_model("deepseek-r1:1.5b")
     generator.start(history)
     while True:
-        print(generator.get_status())
-        time.sleep(1)
\ No newline at end of file
+        status = generator.wait_status(since=len(generator.get_status()["sentence"]))
+        print(status)
+        if status["is_complete"]:
+            break
\ No newline at end of file
@@ -6,9 +6,9 @@ import random
 import time
 
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
 
 from sources.memory import Memory
+from sources.retrieval_memory import RetrievalMemory
 from sources.utility import pretty_print
 from sources.schemas import executorResult
 
@@ -48,7 +48,9 @@ class Agent():
         self.status_message = "Haven't started yet"
         self.stop = False
         self.verbose = verbose
-        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.token_stream = None # TokenStream the generated tokens are published to, see set_token_stream
+        self.llm_priority = "interactive" # priority of the LLM requests when the provider is busy, see PRIORITIES
+        self.supports_long_term_memory = False # agents keeping a conversation may recall past sessions, see set_long_term_memory
     
     @property
     def get_agent_name(self) -> str:
@@ -155,21 +157,74 @@ class Agent():
         end_idx = text.rfind(end_tag)+8
         return text[start_idx:end_idx]
     
-    async def llm_request(self) -> Tuple[str, str]:
+    def set_token_stream(self, token_stream) -> None:
+        """
+        Publish the tokens generated by the LLM to a TokenStream while they are generated.
+        """
+        self.token_stream = token_stream
+
+    def set_token_budget(self, token_budget: int | None) -> None:
+        """
+        Set the maximum number of tokens of the agent memory, None or 0 for no limit.
+        """
+        if self.memory is not None:
+            self.memory.set_token_budget(token_budget)
+
+    def set_long_term_memory(self, enabled: bool) -> None:
+        """
+        Remember the conversations of the agent across sessions in a local vector index,
+        the relevant past snippets are recalled in the prompt. Only for agents supporting it.
+        """
+        if self.memory is None or not self.supports_long_term_memory:
+            return
+        self.memory.long_term_memory = RetrievalMemory(self.type) if enabled else None
+
+    async def get_memory(self) -> list:
+        """
+        Get the memory to send to the LLM.
+        The recall from the long-term memory embeds the query, it runs off the event loop.
+        """
+        if self.memory.long_term_memory is None:
+            return self.memory.get()
+        return await asyncio.to_thread(self.memory.get)
+
+    async def llm_request(self, priority: str | None = None) -> Tuple[str, str]:
         """
         Asynchronously ask the LLM to process the prompt.
+        The LLM I/O is awaited on the event loop, so requests of many agents can be in flight at once.
+        The answer is streamed if a client listens to the token stream.
+        Args:
+            priority (str | None): Priority of the request on a busy provider, the agent llm_priority if None.
         """
         self.status_message = "Thinking..."
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(self.executor, self.sync_llm_request)
-    
-    def sync_llm_request(self) -> Tuple[str, str]:
+        priority = priority or self.llm_priority
+        if self.token_stream is not None and self.token_stream.has_subscribers:
+            return await self.stream_llm_request(priority)
+        thought = await self.llm.respond_async(await self.get_memory(), self.verbose, priority=priority)
+        return self.process_llm_answer(thought)
+
+    async def stream_llm_request(self, priority: str | None = None) -> Tuple[str, str]:
         """
-        Ask the LLM to process the prompt and return the answer and the reasoning.
+        Ask the LLM to process the prompt, publishing the tokens as they are generated.
+        Generation stops early if the agent is requested to stop.
         """
-        memory = self.memory.get()
-        thought = self.llm.respond(memory, self.verbose)
+        memory = await self.get_memory()
+        thought = ""
+        self.token_stream.publish({"event": "start", "agent": self.agent_name})
+        try:
+            async for token in self.llm.respond_stream(memory, self.verbose, priority=priority or self.llm_priority):
+                thought += token
+                self.token_stream.publish({"event": "token", "agent": self.agent_name, "content": token})
+                if self.stop:
+                    break
+        finally:
+            self.token_stream.publish({"event": "end", "agent": self.agent_name})
+        return self.process_llm_answer(thought)
 
+    def process_llm_answer(self, thought: str) -> Tuple[str, str]:
+        """
+        Split the LLM answer from its reasoning and add it to memory.
+        """
         reasoning = self.extract_reasoning_text(thought)
         answer = self.remove_reasoning_text(thought)
         self.memory.push('assistant', answer)
@@ -182,8 +237,7 @@ class Agent():
                     "Computing... I recommand you have a coffee while I work.",
                     "Hold on, I’m crunching numbers.",
                     "Working on it, please let me think."]
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(self.executor, lambda: speech_module.speak(messages[random.randint(0, len(messages)-1)]))
+        return await asyncio.to_thread(speech_module.speak, messages[random.randint(0, len(messages)-1)])
     
     def get_last_tool_type(self) -> str:
         return self.blocks_result[-1].tool_type if len(self.blocks_result) > 0 else None
@@ -41,7 +41,9 @@ class BrowserAgent(Agent):
         self.memory = Memory(self.load_prompt(prompt_path),
                         recover_last_session=False, # session recovery in handled by the interaction class
                         memory_compression=False,
-                        model_provider=provider.get_model_name())
+                        model_provider=provider.get_model_name(),
+                        index_turns=False) # prompts are rebuilt every step, only notes and answers are remembered
+        self.supports_long_term_memory = True
     
     def get_today_date(self) -> str:
         """Get the date"""
@@ -231,7 +233,9 @@ class BrowserAgent(Agent):
                 buffer.append(line.replace("notes:", ''))
             else:
                 links.extend(self.extract_links(line))
-        self.notes.append('. '.join(buffer).strip())
+        note = '. '.join(buffer).strip()
+        self.notes.append(note)
+        self.memory.remember(note, source="browser_note")
         return links
     
     def select_link(self, links: List[str]) -> str | None:
@@ -338,6 +342,7 @@ class BrowserAgent(Agent):
         complete = False
 
         animate_thinking(f"Thinking...", color="status")
+        self.memory.recall_query = user_prompt
         mem_begin_idx = self.memory.push('user', self.search_prompt(user_prompt))
         ai_prompt, reasoning = await self.llm_request()
         if Action.REQUEST_EXIT.value in ai_prompt:
@@ -422,6 +427,7 @@ class BrowserAgent(Agent):
         self.status_message = "Summarizing findings..."
         answer, reasoning = await self.llm_request()
         pretty_print(answer, color="output")
+        self.memory.remember(f"{user_prompt}\n{answer}", source="answer")
         self.status_message = "Ready"
         self.last_answer = answer
         return answer, reasoning
@@ -22,6 +22,7 @@ class CasualAgent(Agent):
                                 recover_last_session=False, # session recovery in handled by the interaction class
                                 memory_compression=False,
                                 model_provider=provider.get_model_name())
+        self.supports_long_term_memory = True
     
     async def process(self, prompt, speech_module) -> str:
         self.memory.push('user', prompt)
@@ -1,4 +1,5 @@
 import json
+import asyncio
 from typing import List, Tuple, Type, Dict
 from sources.utility import pretty_print, animate_thinking
 from sources.agents.agent import Agent
@@ -12,9 +13,11 @@ from sources.logger import Logger
 from sources.memory import Memory
 
 class PlannerAgent(Agent):
-    def __init__(self, name, prompt_path, provider, verbose=False, browser=None):
+    def __init__(self, name, prompt_path, provider, verbose=False, browser=None, plan_samples=1):
         """
         The planner agent is a special agent that divides and conquers the task.
+        Args:
+            plan_samples (int): Number of plans generated concurrently, the first valid one is kept.
         """
         super().__init__(name, prompt_path, provider, verbose, None)
         self.tools = {
@@ -30,6 +33,8 @@ class PlannerAgent(Agent):
         }
         self.role = "planification"
         self.type = "planner_agent"
+        self.llm_priority = "planning"
+        self.plan_samples = max(1, plan_samples)
         self.memory = Memory(self.load_prompt(prompt_path),
                                 recover_last_session=False, # session recovery in handled by the interaction class
                                 memory_compression=False,
@@ -142,6 +147,66 @@ class PlannerAgent(Agent):
             pretty_print(f"{task['agent']} -> {task['task']}", color="info")
         pretty_print("▔▗ E N D ▖▔", color="status")
 
+    def set_token_budget(self, token_budget: int | None) -> None:
+        super().set_token_budget(token_budget)
+        for agent in self.agents.values():
+            agent.set_token_budget(token_budget)
+
+    def set_long_term_memory(self, enabled: bool) -> None:
+        super().set_long_term_memory(enabled)
+        for agent in self.agents.values():
+            agent.set_long_term_memory(enabled)
+
+    def is_valid_plan(self, answer: str) -> bool:
+        """
+        Check if an answer is a plan that parses against the agents, or a NO_UPDATE answer.
+        """
+        if "NO_UPDATE" in answer:
+            return True
+        try:
+            return self.parse_agent_tasks(answer) != []
+        except Exception as e:
+            self.logger.warning(f"Invalid plan: {str(e)}")
+            return False
+
+    async def speculative_llm_request(self) -> Tuple[str, str]:
+        """
+        Ask the LLM for plan_samples plans concurrently and keep the first one that is valid.
+        The other generations are cancelled as soon as a valid plan is found.
+        Only the first sample may be answered by the response cache, the others are new generations.
+        Returns:
+            Tuple[str, str]: The answer and reasoning of the kept plan, or of the last plan if none is valid.
+        """
+        self.status_message = "Thinking..."
+        history = self.memory.get()
+        requests = [asyncio.create_task(self.llm.respond_async(history, False, use_cache=(i == 0),
+                                                               priority=self.llm_priority))
+                    for i in range(self.plan_samples)]
+        thought = None
+        error = None
+        try:
+            for request in asyncio.as_completed(requests):
+                try:
+                    thought = await request
+                except Exception as e:
+                    error = e
+                    self.logger.warning(f"Plan sample failed: {str(e)}")
+                    continue
+                if self.is_valid_plan(self.remove_reasoning_text(thought)):
+                    break
+        finally:
+            for request in requests:
+                request.cancel()
+            await asyncio.gather(*requests, return_exceptions=True)
+        if thought is None:
+            raise error
+        self.logger.info(f"Kept one of {self.plan_samples} plan samples.")
+        if self.token_stream is not None and self.token_stream.has_subscribers:
+            self.token_stream.publish({"event": "start", "agent": self.agent_name})
+            self.token_stream.publish({"event": "token", "agent": self.agent_name, "content": thought})
+            self.token_stream.publish({"event": "end", "agent": self.agent_name})
+        return self.process_llm_answer(thought)
+
     async def make_plan(self, prompt: str) -> str:
         """
         Asks the LLM to make a plan.
@@ -155,7 +220,10 @@ class PlannerAgent(Agent):
         while not ok:
             animate_thinking("Thinking...", color="status")
             self.memory.push('user', prompt)
-            answer, reasoning = await self.llm_request()
+            if self.plan_samples > 1:
+                answer, reasoning = await self.speculative_llm_request()
+            else:
+                answer, reasoning = await self.llm_request()
             if "NO_UPDATE" in answer:
                 return []
             agents_tasks = self.parse_agent_tasks(answer)
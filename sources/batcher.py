@@ -0,0 +1,103 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List
+
+from sources.logger import Logger
+
+class MicroBatcher:
+    """
+    MicroBatcher collects items submitted concurrently and process them in a single batch call.
+    A daemon worker thread waits for a first item, then gathers more items for at most `max_wait` seconds
+    (or until `max_batch_size` is reached) and calls `batch_fn` once on the whole batch.
+    An item processed while no other one is in flight is processed at once in the calling thread,
+    so a lone caller (eg: the API answering one query at a time) pays neither the handoff nor the wait.
+    """
+    def __init__(self, batch_fn: Callable[[List[Any]], List[Any]],
+                       max_batch_size: int = 8,
+                       max_wait: float = 0.01,
+                       name: str = "batcher"):
+        """
+        Args:
+            batch_fn (Callable): Function taking a list of items and returning a list of results, in order.
+            max_batch_size (int): Maximum number of items processed in one call.
+            max_wait (float): Maximum time in seconds to wait for more items once the first one arrived.
+            name (str): Name of the worker thread.
+        """
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait
+        self.requests = queue.Queue()
+        self.in_flight = 0 # items of process() not answered yet
+        self.lock = threading.Lock()
+        self.batch_lock = threading.Lock() # batch_fn runs one call at a time
+        self.logger = Logger("batcher.log")
+        self.worker = threading.Thread(target=self.run, name=name, daemon=True)
+        self.worker.start()
+
+    def submit(self, item: Any) -> Future:
+        """
+        Submit an item for batched processing.
+        Args:
+            item: The item to process.
+        Returns:
+            Future: Resolved with the result for this item.
+        """
+        future = Future()
+        self.requests.put((item, future))
+        return future
+
+    def process(self, item: Any) -> Any:
+        """
+        Process an item and block until its result is available.
+        The item is processed directly if no other item is in flight, else batched with the concurrent ones.
+        """
+        with self.lock:
+            direct = self.in_flight == 0 and self.requests.empty()
+            self.in_flight += 1
+        try:
+            if direct:
+                return self.call([item])[0]
+            return self.submit(item).result()
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def call(self, items: list) -> list:
+        """Call the batch function on items, one call at a time."""
+        with self.batch_lock:
+            results = self.batch_fn(items)
+        if len(results) != len(items):
+            raise ValueError(f"Batch function returned {len(results)} results for {len(items)} items.")
+        return results
+
+    def collect(self) -> list:
+        """Block for a first request then gather as many as possible within the waiting window."""
+        batch = [self.requests.get()]
+        deadline = time.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.requests.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def run(self) -> None:
+        while True:
+            batch = self.collect()
+            items = [item for item, _ in batch]
+            futures = [future for _, future in batch]
+            try:
+                results = self.call(items)
+            except Exception as e:
+                self.logger.error(f"Batch of {len(items)} items failed: {str(e)}")
+                for future in futures:
+                    future.set_exception(e)
+                continue
+            self.logger.info(f"Processed batch of {len(items)} items.")
+            for future, result in zip(futures, results):
+                future.set_result(result)
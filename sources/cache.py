@@ -0,0 +1,183 @@
+import os
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+class LRUCache:
+    """
+    Thread-safe, size-bounded LRU cache with optional time-to-live.
+    Used to memoize expensive inference results (routing decisions, translations...).
+    """
+    def __init__(self, max_size: int = 512, ttl: float | None = None):
+        """
+        Args:
+            max_size (int): Maximum number of entries before the least recently used is evicted.
+            ttl (float | None): Time-to-live of an entry in seconds, None for no expiry.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a value from the cache and mark it as recently used.
+        Args:
+            key: The cache key.
+            default: Value returned on a miss.
+        Returns:
+            The cached value or default.
+        """
+        with self.lock:
+            if key not in self.entries:
+                self.misses += 1
+                return default
+            value, timestamp = self.entries[key]
+            if self.ttl is not None and time.time() - timestamp > self.ttl:
+                del self.entries[key]
+                self.misses += 1
+                return default
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Add or replace a value, evicting the least recently used entries if full.
+        """
+        if self.max_size <= 0:
+            return
+        with self.lock:
+            self.entries[key] = (value, time.time())
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self.lock:
+            if key not in self.entries:
+                return False
+            _, timestamp = self.entries[key]
+            return self.ttl is None or time.time() - timestamp <= self.ttl
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self) -> dict:
+        """Get the hit/miss counters of the cache."""
+        total = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total > 0 else 0.0
+        }
+
+class DiskLRUCache:
+    """
+    Persistent LRU cache stored in a SQLite file, bounded by the total size of the values.
+    Values must be JSON serializable. Used for results worth keeping across restarts (summaries...).
+    """
+    def __init__(self, path: str, max_bytes: int = 64 * 1024 * 1024, ttl: float | None = None):
+        """
+        Args:
+            path (str): Path of the SQLite file, its folder is created if needed.
+            max_bytes (int): Maximum total size of the values before the least recently used are evicted.
+            ttl (float | None): Time-to-live of an entry in seconds, None for no expiry.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self.connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+            "created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self.connection.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Get a value from the cache and mark it as recently used.
+        Args:
+            key (str): The cache key.
+            default: Value returned on a miss.
+        Returns:
+            The cached value or default.
+        """
+        with self.lock:
+            row = self.connection.execute("SELECT value, created FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None or (self.ttl is not None and time.time() - row[1] > self.ttl):
+                if row is not None:
+                    self.connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self.misses += 1
+                return default
+            self.connection.execute("UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key))
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Add or replace a value, evicting the least recently used entries if over the size limit.
+        """
+        data = json.dumps(value)
+        size = len(data.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self.lock:
+            self.connection.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)", (key, data, size, now, now))
+            total = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            evicted = []
+            for old_key, old_size in self.connection.execute("SELECT key, size FROM entries ORDER BY accessed"):
+                if total <= self.max_bytes:
+                    break
+                evicted.append((old_key,))
+                total -= old_size
+            self.connection.executemany("DELETE FROM entries WHERE key = ?", evicted)
+
+    def __contains__(self, key: str) -> bool:
+        with self.lock:
+            row = self.connection.execute("SELECT created FROM entries WHERE key = ?", (key,)).fetchone()
+        return row is not None and (self.ttl is None or time.time() - row[0] <= self.ttl)
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def clear(self) -> None:
+        with self.lock:
+            self.connection.execute("DELETE FROM entries")
+
+    def stats(self) -> dict:
+        """Get the hit/miss counters and size of the cache."""
+        with self.lock:
+            size, total_bytes = self.connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        total = self.hits + self.misses
+        return {
+            "size": size,
+            "bytes": total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total > 0 else 0.0
+        }
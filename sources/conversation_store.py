@@ -0,0 +1,174 @@
+import os
+import json
+import sqlite3
+import threading
+import time
+from typing import List
+
+from sources.logger import Logger
+
+CONVERSATION_DB_PATH = "conversations/conversations.db"
+MESSAGE_COLUMNS = ("role", "content")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    agent_type TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    message_count INTEGER NOT NULL DEFAULT 0,
+    title TEXT
+);
+CREATE TABLE IF NOT EXISTS messages (
+    session_id TEXT NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    extra TEXT,
+    PRIMARY KEY (session_id, position)
+);
+CREATE INDEX IF NOT EXISTS sessions_agent_updated ON sessions (agent_type, updated_at);
+CREATE INDEX IF NOT EXISTS sessions_updated ON sessions (updated_at);
+"""
+
+class ConversationStore:
+    """
+    SQLite conversation store: one row per session, one row per message.
+    Saves are incremental, only the messages changed since the previous save of the session are written.
+    Sessions can be listed, paged and searched without scanning the filesystem.
+    """
+    def __init__(self, path: str = CONVERSATION_DB_PATH):
+        """
+        Args:
+            path (str): Path of the SQLite database, its folder is created if needed.
+        """
+        self.path = path
+        self.logger = Logger("memory.log")
+        self.lock = threading.Lock()
+        self.saved = {} # session id -> messages as last saved
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA foreign_keys=ON")
+        self.connection.executescript(SCHEMA)
+
+    def message_row(self, session_id: str, position: int, message: dict) -> tuple:
+        extra = {key: value for key, value in message.items() if key not in MESSAGE_COLUMNS}
+        return (session_id, position, message['role'], message['content'], json.dumps(extra) if extra else None)
+
+    def save_session(self, session_id: str, agent_type: str, started_at: float, memory: List[dict]) -> None:
+        """
+        Save a session memory, writing only the messages changed since its last save.
+        Args:
+            session_id (str): Unique id of the session.
+            agent_type (str): Type of the agent owning the memory.
+            started_at (float): Start time of the session (unix timestamp).
+            memory (List[dict]): The memory messages.
+        """
+        with self.lock:
+            saved = self.saved.get(session_id, [])
+            prefix = 0
+            while prefix < min(len(saved), len(memory)) and saved[prefix] == memory[prefix]:
+                prefix += 1
+            title = next((message['content'][:100] for message in memory if message['role'] == 'user'), None)
+            with self.connection:
+                self.connection.execute(
+                    "INSERT INTO sessions (id, agent_type, started_at, updated_at, message_count, title) VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(id) DO UPDATE SET updated_at = excluded.updated_at, "
+                    "message_count = excluded.message_count, title = excluded.title",
+                    (session_id, agent_type, started_at, time.time(), len(memory), title))
+                self.connection.execute("DELETE FROM messages WHERE session_id = ? AND position >= ?", (session_id, prefix))
+                self.connection.executemany("INSERT INTO messages VALUES (?, ?, ?, ?, ?)",
+                    [self.message_row(session_id, position, memory[position]) for position in range(prefix, len(memory))])
+            self.saved[session_id] = saved[:prefix] + [dict(message) for message in memory[prefix:]]
+
+    def last_session(self, agent_type: str) -> str | None:
+        """Get the id of the most recently updated session of an agent type."""
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT id FROM sessions WHERE agent_type = ? ORDER BY updated_at DESC LIMIT 1", (agent_type,)).fetchone()
+        return row["id"] if row is not None else None
+
+    def load_messages(self, session_id: str) -> List[dict]:
+        """Get the messages of a session, in order."""
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT role, content, extra FROM messages WHERE session_id = ? ORDER BY position", (session_id,)).fetchall()
+        messages = []
+        for row in rows:
+            message = {'role': row["role"], 'content': row["content"]}
+            if row["extra"]:
+                message.update(json.loads(row["extra"]))
+            messages.append(message)
+        return messages
+
+    def session_dict(self, row: sqlite3.Row) -> dict:
+        return {
+            "id": row["id"],
+            "agent_type": row["agent_type"],
+            "started_at": row["started_at"],
+            "updated_at": row["updated_at"],
+            "message_count": row["message_count"],
+            "title": row["title"]
+        }
+
+    def list_sessions(self, agent_type: str | None = None, limit: int = 20, offset: int = 0) -> dict:
+        """
+        List sessions, most recently updated first.
+        Args:
+            agent_type (str | None): Only list the sessions of this agent type.
+            limit (int): Page size.
+            offset (int): Number of sessions to skip.
+        Returns:
+            dict: The "sessions" of the page and the "total" number of sessions.
+        """
+        where, params = ("WHERE agent_type = ?", (agent_type,)) if agent_type else ("", ())
+        with self.lock:
+            total = self.connection.execute(f"SELECT COUNT(*) FROM sessions {where}", params).fetchone()[0]
+            rows = self.connection.execute(
+                f"SELECT * FROM sessions {where} ORDER BY updated_at DESC LIMIT ? OFFSET ?", params + (limit, offset)).fetchall()
+        return {"sessions": [self.session_dict(row) for row in rows], "total": total}
+
+    def search_sessions(self, query: str, agent_type: str | None = None, limit: int = 20, offset: int = 0) -> dict:
+        """
+        Find the sessions with a message containing the query (case insensitive), most recently updated first.
+        Returns:
+            dict: The "sessions" of the page and the "total" number of matching sessions.
+        """
+        pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        where = "WHERE id IN (SELECT DISTINCT session_id FROM messages WHERE content LIKE ? ESCAPE '\\')"
+        params = (pattern,)
+        if agent_type:
+            where += " AND agent_type = ?"
+            params += (agent_type,)
+        with self.lock:
+            total = self.connection.execute(f"SELECT COUNT(*) FROM sessions {where}", params).fetchone()[0]
+            rows = self.connection.execute(
+                f"SELECT * FROM sessions {where} ORDER BY updated_at DESC LIMIT ? OFFSET ?", params + (limit, offset)).fetchall()
+        return {"sessions": [self.session_dict(row) for row in rows], "total": total}
+
+    def delete_session(self, session_id: str) -> None:
+        with self.lock:
+            with self.connection:
+                self.connection.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+            self.saved.pop(session_id, None)
+
+    def close(self) -> None:
+        with self.lock:
+            self.connection.close()
+
+conversation_stores = {}
+conversation_stores_lock = threading.Lock()
+
+def get_conversation_store(path: str = CONVERSATION_DB_PATH) -> ConversationStore:
+    """Get the conversation store of a database path, shared by all memories. Reopened if the file was deleted."""
+    with conversation_stores_lock:
+        store = conversation_stores.get(path)
+        if store is None or not os.path.exists(path):
+            store = ConversationStore(path)
+            conversation_stores[path] = store
+        return store
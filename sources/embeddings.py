@@ -0,0 +1,56 @@
+from typing import List
+
+import numpy as np
+import torch
+
+from sources.utility import animate_thinking
+from sources.model_registry import model_registry
+
+DEFAULT_ENCODER = "sentence-transformers/all-MiniLM-L6-v2"
+MULTILINGUAL_ENCODER = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+
+class SentenceEncoder:
+    """
+    Small transformer encoder producing normalized sentence embeddings (mean pooling of the last hidden state).
+    """
+    def __init__(self, model_name: str = DEFAULT_ENCODER, max_length: int = 256):
+        from transformers import AutoTokenizer, AutoModel
+        animate_thinking(f"Loading sentence encoder {model_name}...", color="status")
+        self.model_name = model_name
+        self.max_length = max_length
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.model = AutoModel.from_pretrained(model_name)
+        self.model.eval()
+        self.dim = self.model.config.hidden_size
+
+    def encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """
+        Encode texts into normalized embeddings.
+        Args:
+            texts (List[str]): The texts to encode.
+            batch_size (int): Number of texts per forward pass.
+        Returns:
+            np.ndarray: (len(texts), dim) float32 matrix.
+        """
+        embeddings = []
+        with torch.no_grad():
+            for i in range(0, len(texts), batch_size):
+                inputs = self.tokenizer(texts[i:i+batch_size], padding=True, truncation=True,
+                                        max_length=self.max_length, return_tensors="pt")
+                hidden = self.model(**inputs).last_hidden_state
+                mask = inputs["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+                pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+                embeddings.append(torch.nn.functional.normalize(pooled, dim=-1).numpy())
+        if len(embeddings) == 0:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.concatenate(embeddings).astype(np.float32)
+
+def register_sentence_encoder(model_name: str = DEFAULT_ENCODER) -> str:
+    """Register a sentence encoder in the model registry without loading it, so it can be warmed up."""
+    name = f"encoder-{model_name}"
+    model_registry.register(name, lambda: SentenceEncoder(model_name))
+    return name
+
+def get_sentence_encoder(model_name: str = DEFAULT_ENCODER) -> SentenceEncoder:
+    """Get a sentence encoder through the model registry, so it is loaded once and shared."""
+    return model_registry.get(register_sentence_encoder(model_name))
@@ -0,0 +1,114 @@
+import os
+import re
+import subprocess
+import threading
+from functools import lru_cache
+
+import requests
+
+from sources.logger import Logger
+
+# Work around the CUDA issues of Foundry Local, see FOUNDRY_INTEGRATION.md
+FOUNDRY_CPU_ENV = {
+    "FOUNDRY_EXECUTION_PROVIDER": "CPUExecutionProvider",
+    "CUDA_VISIBLE_DEVICES": "-1",
+    "FOUNDRY_SKIP_CUDA_CHECK": "1",
+    "FOUNDRY_CUDA_VERSION_OVERRIDE": "12.0.0",
+    "CUDA_VERSION": "12.0.0"
+}
+
+class FoundryWorker:
+    """
+    Long-lived Foundry Local session.
+    Instead of spawning `foundry chat` (and loading the model) for every message, the Foundry Local service
+    is started once, the model is loaded once, and messages are sent to its OpenAI-compatible endpoint.
+    The endpoint is read from FOUNDRY_ENDPOINT if set, else from `foundry service status`.
+    """
+    def __init__(self, model: str, endpoint: str | None = None, timeout: float = 300.0):
+        """
+        Args:
+            model (str): Alias or id of the Foundry Local model.
+            endpoint (str | None): Base url of a running Foundry Local service (eg: http://127.0.0.1:5273/v1).
+            timeout (float): Timeout in seconds of the service commands.
+        """
+        self.model = model
+        self.endpoint = endpoint or os.getenv("FOUNDRY_ENDPOINT")
+        self.timeout = timeout
+        self.model_id = None
+        self.lock = threading.Lock()
+        self.failed = False
+        self.logger = Logger("provider.log")
+
+    @property
+    def base_url(self) -> str | None:
+        """The endpoint of the service, None until the worker is started."""
+        return self.endpoint if self.model_id is not None else None
+
+    def run_cli(self, *args: str) -> subprocess.CompletedProcess:
+        env = os.environ.copy()
+        env.update(FOUNDRY_CPU_ENV)
+        return subprocess.run(["foundry", *args], capture_output=True, text=True, env=env, timeout=self.timeout)
+
+    def service_endpoint(self) -> str | None:
+        """
+        Get the endpoint of the Foundry Local service, starting the service if needed.
+        """
+        for command in (["service", "status"], ["service", "start"], ["service", "status"]):
+            result = self.run_cli(*command)
+            match = re.search(r"https?://[\w.\-]+:\d+", result.stdout + result.stderr)
+            if match:
+                return f"{match.group(0)}/v1"
+        return None
+
+    def resolve_model_id(self) -> str:
+        """
+        Get the id of the loaded model matching the alias, the service expects ids (eg: phi-3.5-mini-instruct-generic-cpu).
+        """
+        response = requests.get(f"{self.endpoint}/models", timeout=10)
+        response.raise_for_status()
+        ids = [model["id"] for model in response.json().get("data", [])]
+        for model_id in ids:
+            if model_id.lower() == self.model.lower():
+                return model_id
+        for model_id in ids:
+            if self.model.lower() in model_id.lower():
+                return model_id
+        return self.model
+
+    def start(self) -> str | None:
+        """
+        Start the service and load the model, only the first time.
+        Returns:
+            str | None: The base url of the endpoint, None if the service is unavailable.
+        """
+        with self.lock:
+            if self.model_id is not None or self.failed:
+                return self.base_url
+            try:
+                if self.endpoint is None:
+                    self.endpoint = self.service_endpoint()
+                if self.endpoint is None:
+                    raise Exception("the endpoint of the Foundry Local service was not found")
+                self.endpoint = self.endpoint.rstrip("/")
+                try:
+                    self.run_cli("model", "load", self.model)
+                except FileNotFoundError:
+                    pass # no CLI next to a given endpoint, the service loads the model on the first request
+                self.model_id = self.resolve_model_id()
+                self.logger.info(f"Foundry Local worker ready at {self.endpoint} with {self.model_id}")
+            except Exception as e:
+                self.logger.warning(f"Foundry Local worker unavailable, using the CLI: {str(e)}")
+                self.failed = True
+        return self.base_url
+
+    def reset(self) -> None:
+        """Forget the endpoint, eg: after the service stopped, the next call starts it again."""
+        with self.lock:
+            self.model_id = None
+            self.failed = False
+            self.endpoint = os.getenv("FOUNDRY_ENDPOINT")
+
+@lru_cache(maxsize=None)
+def get_foundry_worker(model: str) -> FoundryWorker:
+    """Get the Foundry Local worker of a model, shared by all providers."""
+    return FoundryWorker(model)
@@ -0,0 +1,185 @@
+import asyncio
+import threading
+import weakref
+from functools import lru_cache
+from typing import Any, Callable
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from sources.logger import Logger
+
+def http2_supported() -> bool:
+    """HTTP/2 needs the optional h2 package (pip install httpx[http2])."""
+    try:
+        import h2
+        return True
+    except ImportError:
+        return False
+
+class HTTPClientPool:
+    """
+    Long-lived HTTP clients shared by the providers, one per (kind, endpoint, api key).
+    A client is created on first use and then reused across calls and threads,
+    so LLM calls keep their connections alive instead of paying a new TCP/TLS handshake each time.
+    """
+    def __init__(self, max_connections: int = 32,
+                 max_keepalive_connections: int = 16,
+                 keepalive_expiry: float = 60.0,
+                 timeout: float = 600.0,
+                 connect_timeout: float = 10.0,
+                 http2: bool = True):
+        """
+        Args:
+            max_connections (int): Maximum number of connections per client.
+            max_keepalive_connections (int): Maximum number of idle connections kept open per client.
+            keepalive_expiry (float): Time in seconds an idle connection is kept open.
+            timeout (float): Read/write timeout in seconds, long because local generations can be slow.
+            connect_timeout (float): Connection timeout in seconds.
+            http2 (bool): Use HTTP/2 for https endpoints when the h2 package is installed.
+        """
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.http2 = http2 and http2_supported()
+        self.logger = Logger("provider.log")
+        self.lock = threading.Lock()
+        self.clients = {}
+        # async clients are bound to their event loop, a closed loop and its clients are dropped together
+        self.async_clients = weakref.WeakKeyDictionary()
+        if http2 and not self.http2:
+            self.logger.info("h2 is not installed, HTTP clients use HTTP/1.1.")
+
+    def get(self, key: tuple, factory: Callable[[], Any]) -> Any:
+        """
+        Get the client of a key, created with the factory on first use.
+        Args:
+            key (tuple): Kind of client, endpoint and credentials.
+            factory (Callable): Creates the client.
+        Returns:
+            Any: The shared client.
+        """
+        with self.lock:
+            if key not in self.clients:
+                self.clients[key] = factory()
+                self.logger.info(f"Created pooled {key[0]} client for {key[1]}")
+            return self.clients[key]
+
+    def get_async(self, key: tuple, factory: Callable[[], Any]) -> Any:
+        """
+        Get the async client of a key for the running event loop, created with the factory on first use.
+        Args:
+            key (tuple): Kind of client, endpoint and credentials.
+            factory (Callable): Creates the client.
+        Returns:
+            Any: The client shared by the calls of the running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        with self.lock:
+            clients = self.async_clients.setdefault(loop, {})
+            if key not in clients:
+                clients[key] = factory()
+                self.logger.info(f"Created pooled {key[0]} client for {key[1]}")
+            return clients[key]
+
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(max_connections=self.max_connections,
+                            max_keepalive_connections=self.max_keepalive_connections,
+                            keepalive_expiry=self.keepalive_expiry)
+
+    def timeouts(self) -> httpx.Timeout:
+        return httpx.Timeout(self.timeout, connect=self.connect_timeout)
+
+    def openai_client(self, api_key: str | None, base_url: str | None = None):
+        """Get a pooled OpenAI (or OpenAI-compatible API) client."""
+        from openai import OpenAI, DefaultHttpxClient, Timeout, DEFAULT_CONNECTION_LIMITS
+        def create():
+            # limits and timeout built from the http library of the openai package, which may not be httpx
+            limits = type(DEFAULT_CONNECTION_LIMITS)(max_connections=self.max_connections,
+                                                     max_keepalive_connections=self.max_keepalive_connections,
+                                                     keepalive_expiry=self.keepalive_expiry)
+            timeout = Timeout(self.timeout, connect=self.connect_timeout)
+            http_client = DefaultHttpxClient(limits=limits, timeout=timeout, http2=self.http2)
+            return OpenAI(api_key=api_key, base_url=base_url, http_client=http_client, timeout=timeout)
+        return self.get(("openai", base_url, api_key), create)
+
+    def async_httpx_client(self, base_url: str = "") -> httpx.AsyncClient:
+        """Get a pooled httpx async client, bound to the running event loop."""
+        return self.get_async(("async-httpx", base_url), lambda: httpx.AsyncClient(
+            limits=self.limits(), timeout=self.timeouts(), http2=self.http2))
+
+    def async_openai_client(self, api_key: str | None, base_url: str | None = None):
+        """Get a pooled AsyncOpenAI client, async clients are bound to the running event loop."""
+        from openai import AsyncOpenAI, DefaultAsyncHttpxClient, Timeout, DEFAULT_CONNECTION_LIMITS
+        def create():
+            limits = type(DEFAULT_CONNECTION_LIMITS)(max_connections=self.max_connections,
+                                                     max_keepalive_connections=self.max_keepalive_connections,
+                                                     keepalive_expiry=self.keepalive_expiry)
+            timeout = Timeout(self.timeout, connect=self.connect_timeout)
+            http_client = DefaultAsyncHttpxClient(limits=limits, timeout=timeout, http2=self.http2)
+            return AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=http_client, timeout=timeout)
+        return self.get_async(("async-openai", base_url, api_key), create)
+
+    def async_ollama_client(self, host: str):
+        """Get a pooled async Ollama client, bound to the running event loop."""
+        from ollama import AsyncClient as AsyncOllamaClient
+        return self.get_async(("async-ollama", host), lambda: AsyncOllamaClient(
+            host=host, limits=self.limits(), timeout=self.timeouts(), http2=self.http2))
+
+    def ollama_client(self, host: str):
+        """Get a pooled Ollama client."""
+        from ollama import Client as OllamaClient
+        return self.get(("ollama", host), lambda: OllamaClient(
+            host=host, limits=self.limits(), timeout=self.timeouts(), http2=self.http2))
+
+    def huggingface_client(self, api_key: str):
+        """Get a pooled huggingface inference client, its requests session is shared by huggingface_hub."""
+        from huggingface_hub import InferenceClient
+        return self.get(("huggingface", "api-inference", api_key), lambda: InferenceClient(
+            api_key=api_key, timeout=self.timeout))
+
+    def requests_session(self, base_url: str) -> requests.Session:
+        """Get a pooled requests session for the servers called with plain requests."""
+        def create():
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.max_connections)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            return session
+        return self.get(("requests", base_url), create)
+
+    def request_timeout(self) -> tuple:
+        """(connect, read) timeout of the requests sessions."""
+        return (self.connect_timeout, self.timeout)
+
+    def close(self) -> None:
+        """Close the synchronous clients and their connections, async clients are dropped (see aclose)."""
+        with self.lock:
+            clients, self.clients = self.clients, {}
+            self.async_clients.clear()
+        for client in clients.values():
+            try:
+                client.close()
+            except Exception as e:
+                self.logger.warning(f"Failed to close HTTP client: {str(e)}")
+
+    async def aclose(self) -> None:
+        """Close the async clients of the running event loop."""
+        with self.lock:
+            clients = self.async_clients.pop(asyncio.get_running_loop(), {})
+        for client in clients.values():
+            try:
+                await (client.aclose() if isinstance(client, httpx.AsyncClient) else client.close())
+            except Exception as e:
+                self.logger.warning(f"Failed to close async HTTP client: {str(e)}")
+
+@lru_cache(maxsize=None)
+def get_http_pool(max_connections: int = 32, timeout: float = 600.0, http2: bool = True) -> HTTPClientPool:
+    """Get the client pool of a configuration, shared by all providers with that configuration."""
+    return HTTPClientPool(max_connections=max_connections,
+                          max_keepalive_connections=max(1, max_connections // 2),
+                          timeout=timeout,
+                          http2=http2)
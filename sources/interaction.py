@@ -1,4 +1,5 @@
 import readline
+import asyncio
 from typing import List, Tuple, Type, Dict
 
 from sources.text_to_speech import Speech
@@ -16,7 +17,9 @@ class Interaction:
                  tts_enabled: bool = True,
                  stt_enabled: bool = True,
                  recover_last_session: bool = False,
-                 langs: List[str] = ["en", "zh"]
+                 langs: List[str] = ["en", "zh"],
+                 router_backend: str = "torch",
+                 router_multilingual: bool = False
                 ):
         self.is_active = True
         self.current_agent = None
@@ -27,7 +30,8 @@ class Interaction:
         self.tts_enabled = tts_enabled
         self.stt_enabled = stt_enabled
         self.recover_last_session = recover_last_session
-        self.router = AgentRouter(self.agents, supported_language=langs)
+        self.router = AgentRouter(self.agents, supported_language=langs, backend=router_backend,
+                                  multilingual=router_multilingual)
         self.ai_name = self.find_ai_name()
         self.speech = None
         self.transcriber = None
@@ -151,7 +155,9 @@ class Interaction:
         push_last_agent_memory = False
         if self.last_query is None or len(self.last_query) == 0:
             return False
-        agent = self.router.select_agent(self.last_query)
+        loop = asyncio.get_event_loop()
+        # routing off the event loop lets concurrent queries share a router batch
+        agent = await loop.run_in_executor(None, self.router.select_agent, self.last_query)
         if agent is None:
             return False
         if self.current_agent != agent and self.last_answer is not None:
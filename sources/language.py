@@ -3,35 +3,60 @@ import re
 import langid
 import nltk
 from nltk.sentiment.vader import SentimentIntensityAnalyzer
-from transformers import MarianMTModel, MarianTokenizer
 
 from sources.utility import pretty_print, animate_thinking
 from sources.logger import Logger
+from sources.model_registry import model_registry
+from sources.cache import LRUCache
 
 class LanguageUtility:
     """LanguageUtility for language, or emotion identification"""
-    def __init__(self, supported_language: List[str] = ["en", "fr", "zh"]):
+    def __init__(self, supported_language: List[str] = ["en", "fr", "zh"], translation_cache_size: int = 1024):
         """
         Initialize the LanguageUtility class
         args:
             supported_language: list of languages for translation, determine which Helsinki-NLP model to load
+            translation_cache_size: number of translations kept in the LRU cache, 0 to disable
         """
-        self.sid = None 
-        self.translators_tokenizer = None 
-        self.translators_model = None
         self.logger = Logger("language.log")
         self.supported_language = supported_language
+        self.translation_cache = LRUCache(max_size=translation_cache_size)
         self.load_model()
     
     def load_model(self) -> None:
-        animate_thinking("Loading language utility...", color="status")
+        """
+        Register the sentiment analyzer and one translation model per supported language.
+        They are loaded on first use by the model registry.
+        """
+        model_registry.register("sentiment-analyzer", self.load_sentiment_analyzer)
+        for lang in self.supported_language:
+            if lang == "en":
+                continue
+            model_registry.register(f"translator-{lang}-en", lambda lang=lang: self.load_translator(lang))
+
+    def load_sentiment_analyzer(self) -> SentimentIntensityAnalyzer:
         try:
             nltk.data.find('vader_lexicon')
         except LookupError:
             nltk.download('vader_lexicon')
-        self.sid = SentimentIntensityAnalyzer()
-        self.translators_tokenizer = {lang: MarianTokenizer.from_pretrained(f"Helsinki-NLP/opus-mt-{lang}-en") for lang in self.supported_language if lang != "en"}
-        self.translators_model = {lang: MarianMTModel.from_pretrained(f"Helsinki-NLP/opus-mt-{lang}-en") for lang in self.supported_language if lang != "en"}
+        return SentimentIntensityAnalyzer()
+
+    def load_translator(self, lang: str) -> tuple:
+        """
+        Load the Helsinki-NLP translation model from a language to English.
+        Args:
+            lang: ISO language code
+        Returns: tuple of (tokenizer, model)
+        """
+        from transformers import MarianMTModel, MarianTokenizer
+        animate_thinking(f"Loading {lang} translation model...", color="status")
+        tokenizer = MarianTokenizer.from_pretrained(f"Helsinki-NLP/opus-mt-{lang}-en")
+        model = MarianMTModel.from_pretrained(f"Helsinki-NLP/opus-mt-{lang}-en")
+        return tokenizer, model
+
+    @property
+    def sid(self) -> SentimentIntensityAnalyzer:
+        return model_registry.get("sentiment-analyzer")
     
     def detect_language(self, text: str) -> str:
         """
@@ -56,14 +81,36 @@ class LanguageUtility:
         """
         if origin_lang == "en":
             return text
-        if origin_lang not in self.translators_tokenizer:
+        if origin_lang not in self.supported_language:
             pretty_print(f"Language {origin_lang} not supported for translation", color="error")
             return text
-        tokenizer = self.translators_tokenizer[origin_lang]
-        inputs = tokenizer(text, return_tensors="pt", padding=True)
-        model = self.translators_model[origin_lang]
-        translation = model.generate(**inputs)
-        return tokenizer.decode(translation[0], skip_special_tokens=True)
+        return self.translate_batch([text], origin_lang)[0]
+
+    def translate_batch(self, texts: List[str], origin_lang: str) -> List[str]:
+        """
+        Translate several texts of the same language to English in a single forward pass
+        Translations are cached by (language, text), only the texts never seen are translated.
+        Args:
+            texts: list of strings to translate
+            origin_lang: ISO language code shared by all texts
+        Returns: list of translated str, in the same order
+        """
+        if origin_lang == "en" or len(texts) == 0:
+            return list(texts)
+        if origin_lang not in self.supported_language:
+            pretty_print(f"Language {origin_lang} not supported for translation", color="error")
+            return list(texts)
+        results = [self.translation_cache.get((origin_lang, text)) for text in texts]
+        missing = list(dict.fromkeys(text for text, result in zip(texts, results) if result is None))
+        if len(missing) > 0:
+            tokenizer, model = model_registry.get(f"translator-{origin_lang}-en")
+            inputs = tokenizer(missing, return_tensors="pt", padding=True)
+            translations = tokenizer.batch_decode(model.generate(**inputs), skip_special_tokens=True)
+            for text, translation in zip(missing, translations):
+                self.translation_cache.put((origin_lang, text), translation)
+            translated = dict(zip(missing, translations))
+            results = [translated[text] if result is None else result for text, result in zip(texts, results)]
+        return results
 
     def detect_emotion(self, text: str) -> str:
         """
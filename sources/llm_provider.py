@@ -1,22 +1,51 @@
 import os
+import json
+import asyncio
 import platform
 import socket
 import subprocess
 import time
+from contextlib import nullcontext
+from typing import AsyncIterator, Tuple
 from urllib.parse import urlparse
 
 import httpx
 import requests
 from dotenv import load_dotenv
-from ollama import Client as OllamaClient
-from openai import OpenAI
 
 from sources.logger import Logger
+from sources.http_pool import HTTPClientPool, get_http_pool
+from sources.response_cache import ResponseCache
+from sources.provider_health import HealthChecker, get_health_checker
+from sources.foundry_worker import FoundryWorker, FOUNDRY_CPU_ENV, get_foundry_worker
+from sources.provider_scheduler import ProviderScheduler
 from sources.utility import pretty_print, animate_thinking
 
+# providers always giving the same answer to the same messages, whose answers can be cached
+GREEDY_PROVIDERS = ["test"]
 
 class Provider:
-    def __init__(self, provider_name, model, server_address="127.0.0.1:5000", is_local=False):
+    def __init__(self, provider_name, model, server_address="127.0.0.1:5000", is_local=False,
+                 http_max_connections=32, http_timeout=600.0, http_pool: HTTPClientPool | None = None,
+                 response_cache: ResponseCache | None = None, health_checker: HealthChecker | None = None,
+                 health_check=True, max_concurrency: int | None = None):
+        """
+        Args:
+            provider_name (str): Name of the provider, see available_providers.
+            model (str): Name of the model.
+            server_address (str): Address of the server for local or self-hosted providers.
+            is_local (bool): The provider runs locally (or on a server of the user).
+            http_max_connections (int): Maximum number of connections of the pooled HTTP clients.
+            http_timeout (float): Timeout in seconds of the HTTP calls.
+            http_pool (HTTPClientPool | None): Client pool, shared by the providers with the same settings if None.
+            response_cache (ResponseCache | None): Cache of the answers to identical requests, disabled if None.
+            health_checker (HealthChecker | None): Reachability cache of the servers, shared by the providers if None.
+            health_check (bool): Watch the server in the background and answer at once when it is known to be offline.
+            max_concurrency (int | None): Maximum number of requests in flight on the server, unlimited if None.
+        """
+        self.http_pool = http_pool or get_http_pool(max_connections=http_max_connections, timeout=http_timeout)
+        self.response_cache = response_cache
+        self.scheduler = ProviderScheduler(max_concurrency) if max_concurrency else None
         self.provider_name = provider_name.lower()
         self.model = model
         self.is_local = is_local
@@ -46,6 +75,9 @@ class Provider:
             self.api_key = self.get_api_key(self.provider_name)
         elif self.provider_name != "ollama":
             pretty_print(f"Provider: {provider_name} initialized at {self.server_ip}", color="success")
+        self.health = (health_checker or get_health_checker()) if health_check else None
+        if self.health is not None and self.health_address() is not None:
+            self.health.watch(self.health_address())
 
     def get_model_name(self) -> str:
         return self.model
@@ -65,7 +97,8 @@ class Provider:
         """
         from anthropic import Anthropic
 
-        client = Anthropic(api_key=self.api_key)
+        client = self.http_pool.get(("anthropic", "api.anthropic.com", self.api_key),
+                                    lambda: Anthropic(api_key=self.api_key))
         system_message = None
         messages = []
         for message in history:
@@ -91,35 +124,280 @@ class Provider:
         except Exception as e:
             raise Exception(f"Anthropic API error: {str(e)}") from e
 
-    def respond(self, history, verbose=True):
+    def respond(self, history, verbose=True, use_cache=True, priority="interactive"):
         """
         Use the choosen provider to generate text.
+        Set use_cache to False to always get a new answer, even with a response cache.
+        With a max_concurrency, the request waits for a slot, served by priority (see PRIORITIES).
         """
         llm = self.available_providers[self.provider_name]
+        key = self.cache_key(history, use_cache)
+        cached = self.cached_answer(key, verbose)
+        if cached is not None:
+            return cached
+        if self.known_offline():
+            return self.offline_answer()
         self.logger.info(f"Using provider: {self.provider_name} at {self.server_ip}")
         try:
-            thought = llm(history, verbose)
+            with self.slot(priority):
+                thought = llm(history, verbose)
         except KeyboardInterrupt:
             self.logger.warning("User interrupted the operation with Ctrl+C")
             return "Operation interrupted by user. REQUEST_EXIT"
-        except ConnectionError as e:
+        except Exception as e:
+            return self.error_answer(e)
+        self.report_health(True)
+        self.cache_answer(key, thought)
+        return thought
+
+    async def respond_async(self, history, verbose=True, use_cache=True, priority="interactive") -> str:
+        """
+        Use the choosen provider to generate text, awaiting the LLM I/O on the event loop.
+        Ollama, server and the OpenAI-compatible providers are async-native,
+        the others run their synchronous implementation in a worker thread.
+        """
+        if self.provider_name == "ollama":
+            llm = self.ollama_async
+        elif self.provider_name == "server":
+            llm = self.server_async
+        elif self.openai_compatible_endpoint() is not None:
+            llm = self.openai_async
+        else:
+            return await asyncio.to_thread(self.respond, history, verbose, use_cache, priority)
+        key = self.cache_key(history, use_cache)
+        cached = self.cached_answer(key, verbose)
+        if cached is not None:
+            return cached
+        if self.known_offline():
+            return self.offline_answer()
+        self.logger.info(f"Using async provider: {self.provider_name} at {self.server_ip}")
+        try:
+            async with self.async_slot(priority):
+                thought = await llm(history, verbose)
+        except Exception as e:
+            return self.error_answer(e)
+        self.report_health(True)
+        self.cache_answer(key, thought)
+        return thought
+
+    def slot(self, priority: str):
+        """Wait for a request slot of the server, if the concurrency is bounded."""
+        return self.scheduler.slot(priority) if self.scheduler is not None else nullcontext()
+
+    def async_slot(self, priority: str):
+        return self.scheduler.async_slot(priority) if self.scheduler is not None else nullcontext()
+
+    def health_address(self) -> str | None:
+        """
+        Get the address of the server the provider runs on, None for cloud APIs.
+        """
+        if self.provider_name == "ollama":
+            return "localhost:11434" if self.is_local else self.server_address
+        if self.provider_name in ["server", "lm-studio"] or (self.provider_name == "openai" and self.is_local):
+            return self.server_ip
+        return None
+
+    def known_offline(self) -> bool:
+        """
+        True if the server was found offline recently, by a probe or a failed request. Never blocks.
+        """
+        address = self.health_address()
+        return self.health is not None and address is not None and self.health.is_online(address) is False
+
+    def report_health(self, online: bool) -> None:
+        address = self.health_address()
+        if self.health is not None and address is not None:
+            self.health.report(address, online)
+
+    def sampling_params(self) -> dict:
+        """
+        Get the effective sampling parameters of the requests, part of the response cache key.
+        The temperature is only known if it is sent with the requests or the provider always answers the same.
+        """
+        endpoint = self.openai_compatible_endpoint()
+        params = dict(endpoint["params"]) if endpoint is not None else {}
+        if self.provider_name in GREEDY_PROVIDERS:
+            params.setdefault("temperature", 0)
+        return params
+
+    def cache_key(self, history, use_cache=True) -> str | None:
+        """
+        Get the response cache key of a request.
+        returns:
+            str | None: The key, None if there is no cache or the request should get a new answer.
+        """
+        if self.response_cache is None:
+            return None
+        if not use_cache or self.response_cache.is_sampled(self.sampling_params()):
+            self.response_cache.bypass()
+            return None
+        return self.response_cache.key(self.provider_name, self.model, history, self.sampling_params())
+
+    def cached_answer(self, key: str | None, verbose=False) -> str | None:
+        if key is None:
+            return None
+        cached = self.response_cache.get(key)
+        if cached is not None and verbose:
+            print(cached)
+        return cached
+
+    def cache_answer(self, key: str | None, thought: str) -> None:
+        if key is not None and thought:
+            self.response_cache.put(key, thought)
+
+    def offline_answer(self) -> str:
+        return f"Server {self.server_ip} seem offline. Unable to answer."
+
+    def overloaded_answer(self) -> str:
+        return f"{self.provider_name} server is overloaded. Please try again later."
+
+    def is_unavailable_answer(self, answer: str) -> bool:
+        """True if the answer means the server could not answer (offline or overloaded)."""
+        return answer in (self.offline_answer(), self.overloaded_answer())
+
+    def error_answer(self, e: Exception) -> str:
+        """
+        Get the answer to give when the server is overloaded or offline, raise the other provider errors.
+        """
+        if isinstance(e, ConnectionError):
             raise ConnectionError(f"{str(e)}\nConnection to {self.server_ip} failed.")
-        except AttributeError as e:
+        if isinstance(e, AttributeError):
             raise NotImplementedError(f"{str(e)}\nIs {self.provider_name} implemented ?")
-        except ModuleNotFoundError as e:
+        if isinstance(e, ModuleNotFoundError):
             raise ModuleNotFoundError(
                 f"{str(e)}\nA import related to provider {self.provider_name} was not found. Is it installed ?")
+        if "try again later" in str(e).lower():
+            return self.overloaded_answer()
+        if "refused" in str(e).lower():
+            self.report_health(False)
+            return self.offline_answer()
+        raise Exception(f"Provider {self.provider_name} failed: {str(e)}") from e
+
+    def openai_compatible_endpoint(self) -> dict | None:
+        """
+        Get the OpenAI-compatible endpoint of the provider.
+        returns:
+            dict | None: The api_key, base_url, model and extra completion parameters, None if the provider has no such endpoint.
+        """
+        if self.provider_name == "openai":
+            base_url = f"http://{self.server_ip}" if self.is_local else None
+            return {"api_key": self.api_key, "base_url": base_url, "model": self.model, "params": {}}
+        if self.provider_name == "lm-studio":
+            return {"api_key": "lm-studio", "base_url": f"{self.server_ip}/v1", "model": self.model,
+                    "params": {"temperature": 0.7, "max_tokens": 4096}}
+        if self.provider_name == "foundry":
+            worker = self.foundry_worker()
+            if worker is None or worker.base_url is None:
+                return None # the worker is started by the first call
+            return {"api_key": "foundry-local", "base_url": worker.base_url, "model": worker.model_id, "params": {}}
+        if self.is_local:
+            return None
+        endpoints = {
+            "google": ("https://generativelanguage.googleapis.com/v1beta/openai/", self.model),
+            "deepseek": ("https://api.deepseek.com", "deepseek-chat"),
+            "openrouter": ("https://openrouter.ai/api/v1", self.model),
+            "together": ("https://api.together.xyz/v1", self.model)
+        }
+        if self.provider_name not in endpoints:
+            return None
+        base_url, model = endpoints[self.provider_name]
+        return {"api_key": self.api_key, "base_url": base_url, "model": model, "params": {}}
+
+    async def respond_stream(self, history, verbose=False, use_cache=True, priority="interactive") -> AsyncIterator[str]:
+        """
+        Use the choosen provider to generate text, token by token.
+        Ollama and the OpenAI-compatible providers stream natively,
+        the others (and cached answers) yield their whole answer at once.
+        """
+        if self.provider_name != "ollama" and self.openai_compatible_endpoint() is None:
+            yield await asyncio.to_thread(self.respond, history, verbose, use_cache, priority)
+            return
+        key = self.cache_key(history, use_cache)
+        cached = self.cached_answer(key, verbose)
+        if cached is not None:
+            yield cached
+            return
+        if self.known_offline():
+            yield self.offline_answer()
+            return
+        self.logger.info(f"Streaming from provider: {self.provider_name} at {self.server_ip}")
+        thought = ""
+        try:
+            async with self.async_slot(priority):
+                stream = self.ollama_stream(history) if self.provider_name == "ollama" else self.openai_stream(history)
+                async for token in stream:
+                    if verbose:
+                        print(token, end="", flush=True)
+                    thought += token
+                    yield token
+        except Exception as e:
+            yield self.error_answer(e)
+            return
+        self.report_health(True)
+        self.cache_answer(key, thought)
+
+    async def ollama_stream(self, history, pull=True) -> AsyncIterator[str]:
+        """
+        Stream the tokens of the Ollama server, the model is downloaded first if the server does not have it.
+        """
+        host = "http://localhost:11434" if self.is_local else f"http://{self.server_address}"
+        client = self.http_pool.async_ollama_client(host)
+        try:
+            async for chunk in await client.chat(model=self.model, messages=history, stream=True):
+                yield chunk["message"]["content"]
+        except httpx.ConnectError as e:
+            raise Exception(f"\nOllama connection refused at {host}. Check if the server is running.") from e
         except Exception as e:
-            if "try again later" in str(e).lower():
-                return f"{self.provider_name} server is overloaded. Please try again later."
-            if "refused" in str(e):
-                return f"Server {self.server_ip} seem offline. Unable to answer."
-            raise Exception(f"Provider {self.provider_name} failed: {str(e)}") from e
+            if pull and getattr(e, 'status_code', None) == 404:
+                animate_thinking(f"Downloading {self.model}...")
+                await client.pull(self.model)
+                async for token in self.ollama_stream(history, pull=False):
+                    yield token
+                return
+            if "refused" in str(e).lower():
+                raise Exception(f"Ollama connection refused at {host}. Is the server running?") from e
+            raise e
+
+    async def openai_stream(self, history) -> AsyncIterator[str]:
+        endpoint = self.openai_compatible_endpoint()
+        client = self.http_pool.async_openai_client(endpoint["api_key"], base_url=endpoint["base_url"])
+        stream = await client.chat.completions.create(
+            model=endpoint["model"],
+            messages=history,
+            stream=True,
+            **endpoint["params"]
+        )
+        async for chunk in stream:
+            if len(chunk.choices) > 0 and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    async def ollama_async(self, history, verbose=False) -> str:
+        thought = ""
+        async for token in self.ollama_stream(history):
+            if verbose:
+                print(token, end="", flush=True)
+            thought += token
+        return thought
+
+    async def openai_async(self, history, verbose=False) -> str:
+        endpoint = self.openai_compatible_endpoint()
+        client = self.http_pool.async_openai_client(endpoint["api_key"], base_url=endpoint["base_url"])
+        response = await client.chat.completions.create(
+            model=endpoint["model"],
+            messages=history,
+            **endpoint["params"]
+        )
+        if response is None or len(response.choices) == 0:
+            raise Exception(f"{self.provider_name} response is empty.")
+        thought = response.choices[0].message.content or ""
+        if verbose:
+            print(thought)
         return thought
 
     def is_ip_online(self, address: str, timeout: int = 10) -> bool:
         """
         Check if an address is online by sending a ping request.
+        Blocking, not used by the requests anymore: they read the cached state of the HealthChecker.
         """
         if not address:
             return False
@@ -144,42 +422,84 @@ class Provider:
     def server_fn(self, history, verbose=False):
         """
         Use a remote server with LLM to generate text.
+        The answer is read from the /stream endpoint of the server while it is generated.
         """
-        thought = ""
-        route_setup = f"{self.server_ip}/setup"
-        route_gen = f"{self.server_ip}/generate"
-
-        if not self.is_ip_online(self.server_ip):
-            pretty_print(f"Server is offline at {self.server_ip}", color="failure")
+        session = self.http_pool.requests_session(self.server_ip)
+        timeout = self.http_pool.request_timeout()
+        try:
+            session.post(f"{self.server_ip}/setup", json={"model": self.model}, timeout=timeout)
+            session.post(f"{self.server_ip}/generate", json={"messages": history}, timeout=timeout)
+            with session.get(f"{self.server_ip}/stream", stream=True, timeout=timeout) as response:
+                if response.status_code == 404:
+                    return self.server_poll(session, timeout)
+                thought = ""
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    thought, is_complete = self.read_server_update(json.loads(line), thought, verbose)
+                    if is_complete:
+                        break
+                return thought
+        except requests.exceptions.ConnectionError as e:
+            raise Exception(f"Connection refused by server at {self.server_ip}. Is it running ?") from e
+        except KeyError as e:
+            raise Exception(
+                f"{str(e)}\nError occured with server route. Are you using the correct address for the config.ini provider?") from e
 
+    def server_poll(self, session, timeout) -> str:
+        """
+        Poll the generation status, for servers without the /stream endpoint.
+        """
+        self.logger.warning(f"Server at {self.server_ip} has no /stream endpoint, polling.")
+        while True:
+            response = session.get(f"{self.server_ip}/get_updated_sentence", timeout=timeout).json()
+            if "error" in response:
+                pretty_print(response["error"], color="failure")
+                return response.get("sentence", "")
+            if response["is_complete"]:
+                return response["sentence"]
+            time.sleep(0.5)
+
+    def read_server_update(self, update: dict, thought: str, verbose=False) -> Tuple[str, bool]:
+        """
+        Add a line of the server stream to the answer.
+        returns:
+            Tuple[str, bool]: The answer so far and whether the generation is complete.
+        """
+        if verbose:
+            print(update["delta"], end="", flush=True)
+        thought += update["delta"]
+        if "error" in update:
+            pretty_print(update["error"], color="failure")
+        if update["is_complete"]:
+            return update.get("sentence", thought), True
+        return thought, False
+
+    async def server_async(self, history, verbose=False) -> str:
+        """
+        Use a remote server with LLM to generate text, without blocking the event loop.
+        """
+        client = self.http_pool.async_httpx_client(self.server_ip)
+        thought = ""
         try:
-            requests.post(route_setup, json={"model": self.model})
-            requests.post(route_gen, json={"messages": history})
-            is_complete = False
-            while not is_complete:
-                try:
-                    response = requests.get(f"{self.server_ip}/get_updated_sentence")
-                    if "error" in response.json():
-                        pretty_print(response.json()["error"], color="failure")
+            await client.post(f"{self.server_ip}/setup", json={"model": self.model})
+            await client.post(f"{self.server_ip}/generate", json={"messages": history})
+            async with client.stream("GET", f"{self.server_ip}/stream") as response:
+                if response.status_code == 404:
+                    session = self.http_pool.requests_session(self.server_ip)
+                    return await asyncio.to_thread(self.server_poll, session, self.http_pool.request_timeout())
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    thought, is_complete = self.read_server_update(json.loads(line), thought, verbose)
+                    if is_complete:
                         break
-                    thought = response.json()["sentence"]
-                    is_complete = bool(response.json()["is_complete"])
-                    time.sleep(2)
-                except requests.exceptions.RequestException as e:
-                    pretty_print(f"HTTP request failed: {str(e)}", color="failure")
-                    break
-                except ValueError as e:
-                    pretty_print(f"Failed to parse JSON response: {str(e)}", color="failure")
-                    break
-                except Exception as e:
-                    pretty_print(f"An error occurred: {str(e)}", color="failure")
-                    break
+            return thought
+        except httpx.ConnectError as e:
+            raise Exception(f"Connection refused by server at {self.server_ip}. Is it running ?") from e
         except KeyError as e:
             raise Exception(
                 f"{str(e)}\nError occured with server route. Are you using the correct address for the config.ini provider?") from e
-        except Exception as e:
-            raise e
-        return thought
 
     def ollama_fn(self, history, verbose=False):
         """
@@ -187,7 +507,7 @@ class Provider:
         """
         thought = ""
         host = "http://localhost:11434" if self.is_local else f"http://{self.server_address}"
-        client = OllamaClient(host=host)
+        client = self.http_pool.ollama_client(host)
 
         try:
             stream = client.chat(
@@ -207,7 +527,7 @@ class Provider:
             if hasattr(e, 'status_code') and e.status_code == 404:
                 animate_thinking(f"Downloading {self.model}...")
                 client.pull(self.model)
-                self.ollama_fn(history, verbose)
+                return self.ollama_fn(history, verbose)
             if "refused" in str(e).lower():
                 raise Exception(
                     f"Ollama connection refused at {host}. Is the server running?"
@@ -220,10 +540,7 @@ class Provider:
         """
         Use huggingface to generate text.
         """
-        from huggingface_hub import InferenceClient
-        client = InferenceClient(
-            api_key=self.get_api_key("huggingface")
-        )
+        client = self.http_pool.huggingface_client(self.get_api_key("huggingface"))
         completion = client.chat.completions.create(
             model=self.model,
             messages=history,
@@ -238,9 +555,9 @@ class Provider:
         """
         base_url = self.server_ip
         if self.is_local:
-            client = OpenAI(api_key=self.api_key, base_url=f"http://{base_url}")
+            client = self.http_pool.openai_client(self.api_key, base_url=f"http://{base_url}")
         else:
-            client = OpenAI(api_key=self.api_key)
+            client = self.http_pool.openai_client(self.api_key)
 
         try:
             response = client.chat.completions.create(
@@ -264,7 +581,7 @@ class Provider:
         if self.is_local:
             raise Exception("Google Gemini is not available for local use. Change config.ini")
 
-        client = OpenAI(api_key=self.api_key, base_url="https://generativelanguage.googleapis.com/v1beta/openai/")
+        client = self.http_pool.openai_client(self.api_key, base_url="https://generativelanguage.googleapis.com/v1beta/openai/")
         try:
             response = client.chat.completions.create(
                 model=self.model,
@@ -284,7 +601,8 @@ class Provider:
         Use together AI for completion
         """
         from together import Together
-        client = Together(api_key=self.api_key)
+        client = self.http_pool.get(("together", "api.together.xyz", self.api_key),
+                                    lambda: Together(api_key=self.api_key))
         if self.is_local:
             raise Exception("Together AI is not available for local use. Change config.ini")
 
@@ -306,7 +624,7 @@ class Provider:
         """
         Use deepseek api to generate text.
         """
-        client = OpenAI(api_key=self.api_key, base_url="https://api.deepseek.com")
+        client = self.http_pool.openai_client(self.api_key, base_url="https://api.deepseek.com")
         if self.is_local:
             raise Exception("Deepseek (API) is not available for local use. Change config.ini")
         try:
@@ -336,7 +654,8 @@ class Provider:
             "model": self.model
         }
         try:
-            response = requests.post(route_start, json=payload)
+            session = self.http_pool.requests_session(self.server_ip)
+            response = session.post(route_start, json=payload, timeout=self.http_pool.request_timeout())
             result = response.json()
             if verbose:
                 print("Response from LM Studio:", result)
@@ -351,7 +670,7 @@ class Provider:
         """
         Use OpenRouter API to generate text.
         """
-        client = OpenAI(api_key=self.api_key, base_url="https://openrouter.ai/api/v1")
+        client = self.http_pool.openai_client(self.api_key, base_url="https://openrouter.ai/api/v1")
         if self.is_local:
             # This case should ideally not be reached if unsafe_providers is set correctly
             # and is_local is False in config for openrouter
@@ -406,25 +725,61 @@ class Provider:
             raise APIError(f"API error occurred: {str(e)}") from e
         return None
 
+    def foundry_messages(self, history) -> list:
+        """Convert the history to the Foundry format."""
+        messages = []
+        for msg in history:
+            if isinstance(msg, dict):
+                messages.append(msg)
+            elif isinstance(msg, list) and len(msg) == 2:
+                role, content = msg
+                messages.append({"role": role, "content": content})
+            else:
+                # Handle other formats
+                messages.append({"role": "user", "content": str(msg)})
+        return messages
+
+    def foundry_worker(self) -> FoundryWorker | None:
+        """Get the long-lived Foundry Local worker, None if disabled with FOUNDRY_WORKER=false."""
+        if os.getenv("FOUNDRY_WORKER", "true").lower() in ["false", "0", "no"]:
+            return None
+        return get_foundry_worker(self.model)
+
     def foundry_fn(self, history, verbose=False):
         """
         Use Microsoft Foundry Local to generate text.
-        This provider interfaces with the Foundry Local CLI.
+        The Foundry Local service is started and the model loaded once, then every call goes to its
+        OpenAI-compatible endpoint. Falls back to the Foundry Local CLI if the service is unavailable.
+        """
+        worker = self.foundry_worker()
+        if worker is None or worker.start() is None:
+            return self.foundry_cli_fn(history, verbose)
+        client = self.http_pool.openai_client("foundry-local", base_url=worker.base_url)
+        try:
+            response = client.chat.completions.create(
+                model=worker.model_id,
+                messages=self.foundry_messages(history),
+            )
+            if response is None:
+                raise Exception("Foundry Local response is empty.")
+            thought = response.choices[0].message.content
+            if verbose:
+                print(thought)
+            return thought
+        except Exception as e:
+            if "connect" in str(e).lower():
+                worker.reset() # the service stopped, start it again on the next call
+            raise Exception(f"Foundry Local provider failed: {str(e)}") from e
+
+    def foundry_cli_fn(self, history, verbose=False):
+        """
+        Use Microsoft Foundry Local to generate text with one `foundry chat` process per call.
+        The model is loaded at every call, used when the Foundry Local service is unavailable.
         """
         import json
         
         try:
-            # Convert history to Foundry format
-            messages = []
-            for msg in history:
-                if isinstance(msg, dict):
-                    messages.append(msg)
-                elif isinstance(msg, list) and len(msg) == 2:
-                    role, content = msg
-                    messages.append({"role": role, "content": content})
-                else:
-                    # Handle other formats
-                    messages.append({"role": "user", "content": str(msg)})
+            messages = self.foundry_messages(history)
             
             # Create a temporary file with the messages
             import tempfile
@@ -438,13 +793,7 @@ class Provider:
             try:
                 # Set environment variables to work around CUDA issues
                 env = os.environ.copy()
-                env.update({
-                    "FOUNDRY_EXECUTION_PROVIDER": "CPUExecutionProvider",
-                    "CUDA_VISIBLE_DEVICES": "-1",
-                    "FOUNDRY_SKIP_CUDA_CHECK": "1",
-                    "FOUNDRY_CUDA_VERSION_OVERRIDE": "12.0.0",
-                    "CUDA_VERSION": "12.0.0"
-                })
+                env.update(FOUNDRY_CPU_ENV)
                 
                 # Run foundry command with CPU-only mode
                 result = subprocess.run([
@@ -4,12 +4,39 @@ import uuid
 import os
 import sys
 import json
+import hashlib
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import List, Tuple, Type, Dict
 import torch
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
 
 from sources.utility import timer_decorator, pretty_print, animate_thinking
 from sources.logger import Logger
+from sources.token_counter import TokenCounter, get_token_counter
+from sources.cache import DiskLRUCache
+from sources.session_journal import SessionJournal, write_latest_session, read_latest_session
+from sources.conversation_store import get_conversation_store
+from sources.retrieval_memory import RetrievalMemory
+from sources.summarizers import Summarizer, get_summarizer
+
+MESSAGE_TOKEN_OVERHEAD = 4 # role and separators added by the chat template
+COMPRESSION_THRESHOLD = 1024 # messages longer than this (in characters) are summarized
+PENDING_TRUNCATION_TOKENS = 256 # size of a message while its summary is being generated
+MIN_MESSAGE_TOKENS = 64 # a message is never truncated below this size to fit the token budget
+SUMMARY_CACHE_PATH = ".summary_cache/summaries.db"
+
+# single worker shared by all memories: the summarization model is shared and runs one generation at a time
+compression_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="memory-compression")
+summary_cache = None
+summary_cache_lock = threading.Lock()
+
+def get_summary_cache() -> DiskLRUCache:
+    """Get the on-disk summary cache shared by all memories, opened on first use."""
+    global summary_cache
+    with summary_cache_lock:
+        if summary_cache is None:
+            summary_cache = DiskLRUCache(SUMMARY_CACHE_PATH, max_bytes=32 * 1024 * 1024)
+        return summary_cache
 
 class Memory():
     """
@@ -19,7 +46,32 @@ class Memory():
     def __init__(self, system_prompt: str,
                  recover_last_session: bool = False,
                  memory_compression: bool = True,
-                 model_provider: str = "deepseek-r1:14b"):
+                 model_provider: str = "deepseek-r1:14b",
+                 token_budget: int | None = None,
+                 tokenizer: str | TokenCounter | None = None,
+                 async_compression: bool = True,
+                 storage: str = "sqlite",
+                 long_term_memory: RetrievalMemory | None = None,
+                 index_turns: bool = True,
+                 recent_turns: int = 6,
+                 recall_k: int = 4,
+                 summarizer_engine: str | None = None):
+        """
+        Args:
+            system_prompt (str): The system prompt, first message of the memory.
+            recover_last_session (bool): Load the last saved session.
+            memory_compression (bool): Summarize long messages with the summarization model.
+            model_provider (str): Name of the model the memory is sent to.
+            token_budget (int | None): Maximum number of tokens of the memory, None or 0 for no limit (see set_token_budget).
+            tokenizer (str | TokenCounter | None): Token counter or its spec ("chars", "tiktoken", "hf:<model>"), see get_token_counter.
+            async_compression (bool): Summarize in a background worker, a truncated message is used until the summary is ready.
+            storage (str): Where sessions are saved, "sqlite" (conversation database) or "journal" (one JSONL file per session).
+            long_term_memory (RetrievalMemory | None): If set, the prompt only has the recent turns plus the recalled relevant snippets.
+            index_turns (bool): Add every pushed message to the long-term memory.
+            recent_turns (int): Number of recent messages kept in the prompt with a long-term memory.
+            recall_k (int): Number of snippets recalled from the long-term memory.
+            summarizer_engine (str | None): "beam", "greedy", "quantized" or "textrank", see sources/summarizers.py. From the MEMORY_SUMMARIZER environment variable if None, "beam" by default.
+        """
         self.memory = [{'role': 'system', 'content': system_prompt}]
         
         self.logger = Logger("memory.log")
@@ -27,22 +79,39 @@ class Memory():
         self.session_id = str(uuid.uuid4())
         self.conversation_folder = f"conversations/"
         self.session_recovered = False
-        if recover_last_session:
-            self.load_memory()
-            self.session_recovered = True
+        if storage not in ["sqlite", "journal"]:
+            raise ValueError(f"Unknown memory storage {storage}, expected sqlite or journal.")
+        self.storage = storage
+        self.journals = {} # agent type -> journal of the session
+        self.long_term_memory = long_term_memory
+        self.index_turns = index_turns
+        self.recent_turns = recent_turns
+        self.recall_k = recall_k
+        self.recall_query = None # text used to recall from the long-term memory, the last user message if None
         # memory compression system
-        self.model = None
-        self.tokenizer = None
         self.device = self.get_cuda_device()
         self.memory_compression = memory_compression
+        self.async_compression = async_compression
+        self.pending_compressions = {} # id of the message -> (message, original content)
+        self.lock = threading.Lock()
         self.model_provider = model_provider
+        self.summarizer_engine = summarizer_engine or os.getenv("MEMORY_SUMMARIZER", "beam")
+        self.summarizer = None
+        # token accounting, counts are cached by message content so a message is tokenized once
+        self.token_counter = tokenizer if isinstance(tokenizer, TokenCounter) else get_token_counter(tokenizer)
+        self.token_counts = {}
+        self.token_budget = 0
+        self.set_token_budget(token_budget)
         if self.memory_compression:
             self.download_model()
+        if recover_last_session:
+            self.load_memory()
+            self.session_recovered = True
 
     def get_ideal_ctx(self, model_name: str) -> int | None:
         """
         Estimate context size based on the model name.
-        EXPERIMENTAL for memory compression
+        Used to limit the memory and page texts when no token budget is set.
         """
         import re
         import math
@@ -63,33 +132,74 @@ class Memory():
         return context_size
     
     def download_model(self):
-        """Download the model if not already downloaded."""
-        animate_thinking("Loading memory compression model...", color="status")
-        self.tokenizer = AutoTokenizer.from_pretrained("pszemraj/led-base-book-summary")
-        self.model = AutoModelForSeq2SeqLM.from_pretrained("pszemraj/led-base-book-summary")
-        self.logger.info("Memory compression system initialized.")
+        """Get the summarization engine, its model (if any) is downloaded and loaded on first use."""
+        self.summarizer = get_summarizer(self.summarizer_engine)
+        self.logger.info(f"Memory compression with the {self.summarizer.name} summarizer.")
     
     def get_filename(self) -> str:
         """Get the filename for the save file."""
         return f"memory_{self.session_time.strftime('%Y-%m-%d_%H-%M-%S')}.txt"
     
+    def get_db_path(self) -> str:
+        return os.path.join(self.conversation_folder, "conversations.db")
+
     def save_memory(self, agent_type: str = "casual_agent") -> None:
-        """Save the session memory to a file."""
+        """
+        Save the session memory, in the conversation database or in a journal file.
+        Only the messages changed since the last save are written.
+        """
+        self.save_long_term_memory()
+        if self.storage == "sqlite":
+            store = get_conversation_store(self.get_db_path())
+            store.save_session(self.session_id, agent_type, self.session_time.timestamp(), self.memory)
+            self.logger.info(f"Saved session {self.session_id} of {agent_type} in {store.path}")
+            return
+        self.save_journal(agent_type)
+
+    def save_long_term_memory(self) -> None:
+        if self.long_term_memory is None:
+            return
+        try:
+            self.long_term_memory.save()
+        except Exception as e:
+            self.logger.warning(f"Failed to save long-term memory: {str(e)}")
+
+    def save_journal(self, agent_type: str) -> None:
+        """
+        Save the session memory to its journal file.
+        Only the messages changed since the last save are appended to the journal.
+        """
         if not os.path.exists(self.conversation_folder):
             self.logger.info(f"Created folder {self.conversation_folder}.")
             os.makedirs(self.conversation_folder)
         save_path = os.path.join(self.conversation_folder, agent_type)
         if not os.path.exists(save_path):
             os.makedirs(save_path)
-        filename = self.get_filename()
-        path = os.path.join(save_path, filename)
-        json_memory = json.dumps(self.memory)
-        with open(path, 'w') as f:
-            self.logger.info(f"Saved memory json at {path}")
-            f.write(json_memory)
+        journal = self.journals.get(agent_type)
+        if journal is None:
+            filename = self.get_filename()
+            journal = SessionJournal(os.path.join(save_path, filename))
+            journal.sync(self.memory)
+            write_latest_session(save_path, filename)
+            self.journals[agent_type] = journal
+            self.logger.info(f"Started session journal at {journal.path}")
+            return
+        journal.sync(self.memory)
+
+    def close_journals(self) -> None:
+        """Flush the pending journal writes to disk."""
+        for journal in self.journals.values():
+            journal.close()
     
     def find_last_session_path(self, path) -> str:
-        """Find the last session path."""
+        """
+        Find the last session path.
+        Read from the latest session marker, the folder is only scanned for sessions saved without marker.
+        """
+        filename = read_latest_session(path)
+        if filename is not None:
+            self.logger.info(f"Last session found at {filename}")
+            return filename
         saved_sessions = []
         for filename in os.listdir(path):
             if filename.startswith('memory_'):
@@ -127,37 +237,142 @@ class Memory():
             return {}
         return json_memory
 
-    def load_memory(self, agent_type: str = "casual_agent") -> None:
-        """Load the memory from the last session."""
-        if self.session_recovered == True:
-            return
-        pretty_print(f"Loading {agent_type} past memories... ", color="status")
+    def load_last_session(self, agent_type: str) -> List[dict] | None:
+        """
+        Get the messages of the last session of an agent type.
+        The conversation database is looked up first, then the journal files (sessions saved before the database).
+        Returns:
+            List[dict] | None: The messages, None if no session was found.
+        """
+        if self.storage == "sqlite" and os.path.exists(self.get_db_path()):
+            store = get_conversation_store(self.get_db_path())
+            session_id = store.last_session(agent_type)
+            if session_id is not None:
+                self.logger.info(f"Last session found in database: {session_id}")
+                return store.load_messages(session_id)
         save_path = os.path.join(self.conversation_folder, agent_type)
         if not os.path.exists(save_path):
             pretty_print("No memory to load.", color="success")
-            return
+            return None
         filename = self.find_last_session_path(save_path)
         if filename is None:
             pretty_print("Last session memory not found.", color="warning")
-            return
+            return None
         path = os.path.join(save_path, filename)
-        self.memory = self.load_json_file(path) 
+        try:
+            return SessionJournal.replay(path)
+        except Exception as e:
+            self.logger.warning(f"Error loading session journal {path}: {e}")
+            pretty_print("Last session memory could not be read.", color="warning")
+            return None
+
+    def load_memory(self, agent_type: str = "casual_agent") -> None:
+        """Load the memory from the last session."""
+        if self.session_recovered == True:
+            return
+        pretty_print(f"Loading {agent_type} past memories... ", color="status")
+        memory = self.load_last_session(agent_type)
+        if memory is None:
+            return
+        if len(memory) == 0:
+            pretty_print("Last session memory is empty.", color="warning")
+            return
+        self.memory = memory
         if self.memory[-1]['role'] == 'user':
             self.memory.pop()
         self.compress()
+        self.fit_to_budget()
         pretty_print("Session recovered successfully", color="success")
     
     def reset(self, memory: list = []) -> None:
         self.logger.info("Memory reset performed.")
         self.memory = memory
     
+    def count_tokens(self, content: str) -> int:
+        """Get the number of tokens of a message content, tokenized only the first time it is seen."""
+        count = self.token_counts.get(content)
+        if count is None:
+            count = self.token_counter.count(content) + MESSAGE_TOKEN_OVERHEAD
+            self.token_counts[content] = count
+        return count
+
+    @property
+    def total_tokens(self) -> int:
+        """Number of tokens of the memory as sent to the model."""
+        return sum(self.count_tokens(message['content']) for message in self.get_current())
+
+    def prune_token_counts(self) -> None:
+        """Forget the token counts of messages no longer in memory."""
+        if len(self.token_counts) > 2 * len(self.memory) + 64:
+            contents = {message['content'] for message in self.memory}
+            self.token_counts = {content: count for content, count in self.token_counts.items() if content in contents}
+
+    def set_token_budget(self, token_budget: int | None) -> None:
+        """
+        Set the maximum number of tokens of the memory, None or 0 for no limit.
+        A budget too small for the system prompt plus a message is not applied.
+        """
+        token_budget = token_budget or 0
+        system_tokens = self.system_tokens()
+        if token_budget and system_tokens + MESSAGE_TOKEN_OVERHEAD + MIN_MESSAGE_TOKENS > token_budget:
+            self.logger.warning(f"System prompt uses {system_tokens} tokens, over the {token_budget} tokens budget. No budget applied.")
+            pretty_print(f"Warning: memory token budget {token_budget} is too small for the system prompt, ignoring it.", color="warning")
+            token_budget = 0
+        self.token_budget = token_budget
+
+    def system_tokens(self) -> int:
+        return sum(self.count_tokens(m['content']) for m in self.memory if m['role'] == 'system')
+
+    def fit_to_budget(self, incoming_tokens: int = 0) -> None:
+        """
+        Make room for incoming tokens within the token budget.
+        The oldest non-system messages are summarized first (if memory compression is enabled), then evicted.
+        Args:
+            incoming_tokens (int): Number of tokens about to be added.
+        """
+        if not self.token_budget:
+            return
+        total = self.total_tokens
+        if total + incoming_tokens <= self.token_budget:
+            return
+        if self.memory_compression:
+            for message in self.memory:
+                if total + incoming_tokens <= self.token_budget:
+                    break
+                if message['role'] == 'system' or self.count_tokens(message['content']) < PENDING_TRUNCATION_TOKENS:
+                    continue
+                self.compress_message(message)
+                total = self.total_tokens
+        while total + incoming_tokens > self.token_budget:
+            idx = next((i for i, message in enumerate(self.memory) if message['role'] != 'system'), None)
+            if idx is None:
+                break
+            self.memory.pop(idx)
+            total = self.total_tokens
+            self.logger.info(f"Evicted oldest message to fit the {self.token_budget} tokens budget.")
+        self.prune_token_counts()
+
     def push(self, role: str, content: str) -> int:
-        """Push a message to the memory."""
-        ideal_ctx = self.get_ideal_ctx(self.model_provider)
-        if ideal_ctx is not None:
-            if self.memory_compression and len(content) > ideal_ctx * 1.5:
+        """
+        Push a message to the memory.
+        If the memory goes over the token budget, the oldest non-system messages are summarized or evicted,
+        which shifts the index of the messages pushed before.
+        Returns:
+            int: Index of the previous last message.
+        """
+        if self.token_budget:
+            room = max(self.token_budget - self.system_tokens() - MESSAGE_TOKEN_OVERHEAD, MIN_MESSAGE_TOKENS)
+            if self.count_tokens(content) > room + MESSAGE_TOKEN_OVERHEAD:
+                self.logger.warning(f"Message over the {self.token_budget} tokens budget, truncating it.")
+                content = self.token_counter.truncate(content, room)
+            self.fit_to_budget(self.count_tokens(content))
+        else:
+            ideal_ctx = self.get_ideal_ctx(self.model_provider)
+            if ideal_ctx is not None and self.memory_compression and len(content) > ideal_ctx * 1.5:
                 self.logger.info(f"Compressing memory: Content {len(content)} > {ideal_ctx} model context.")
                 self.compress()
+        if self.long_term_memory is not None and self.index_turns and role != 'system':
+            self.long_term_memory.add(content, source="turn", role=role)
         curr_idx = len(self.memory)
         if self.memory[curr_idx-1]['content'] == content:
             pretty_print("Warning: same message have been pushed twice to memory", color="error")
@@ -169,6 +384,7 @@ class Memory():
         """Clear all memory except system prompt"""
         self.logger.info("Memory clear performed.")
         self.memory = self.memory[:1]
+        self.prune_token_counts()
     
     def clear_section(self, start: int, end: int) -> None:
         """
@@ -182,8 +398,54 @@ class Memory():
         end = min(end, len(self.memory)-1) + 2
         self.memory = self.memory[:start] + self.memory[end:]
     
+    def remember(self, text: str, source: str = "note") -> None:
+        """Add a text (eg: a browser note) to the long-term memory, if any."""
+        if self.long_term_memory is not None:
+            self.long_term_memory.add(text, source=source)
+
     def get(self) -> list:
-        return self.memory
+        """
+        Get the memory to send to the model.
+        With a long-term memory, only the recent turns are sent, with the relevant past snippets in the system prompt.
+        """
+        memory = self.get_current()
+        if self.long_term_memory is None:
+            return memory
+        try:
+            return self.recall(memory)
+        except Exception as e:
+            self.logger.warning(f"Long-term memory disabled, recall failed: {str(e)}")
+            self.long_term_memory = None
+            return memory
+
+    def recall(self, memory: list) -> list:
+        """
+        Keep the system prompt and recent turns, and add the snippets of the long-term memory relevant to the recall query.
+        """
+        system = [message for message in memory if message['role'] == 'system']
+        turns = [message for message in memory if message['role'] != 'system']
+        recent = turns[-self.recent_turns:] if self.recent_turns > 0 else []
+        query = self.recall_query or next((message['content'] for message in reversed(recent) if message['role'] == 'user'), None)
+        if query is None or len(system) == 0:
+            return memory
+        snippets = self.long_term_memory.search(query, k=self.recall_k, exclude={message['content'] for message in recent})
+        if len(snippets) > 0:
+            recalled = "\n".join(f"- ({snippet['time']}) {snippet['text']}" for snippet in snippets)
+            self.logger.info(f"Recalled {len(snippets)} snippets from long-term memory.")
+            system[0] = dict(system[0], content=system[0]['content'] + f"\n\nRelevant memories from earlier conversations:\n{recalled}")
+        return system + recent
+
+    def get_current(self) -> list:
+        """
+        Get the messages of the memory.
+        Messages still being summarized in the background are truncated.
+        """
+        with self.lock:
+            if len(self.pending_compressions) == 0:
+                return self.memory
+            return [dict(message, content=self.token_counter.truncate(message['content'], PENDING_TRUNCATION_TOKENS))
+                    if id(message) in self.pending_compressions else message
+                    for message in self.memory]
 
     def get_cuda_device(self) -> str:
         if torch.backends.mps.is_available():
@@ -195,71 +457,129 @@ class Memory():
 
     def summarize(self, text: str, min_length: int = 64) -> str:
         """
-        Summarize the text using the AI model.
+        Summarize the text with the summarization engine of the memory.
+        Summaries are cached on disk by hash of the text, model and generation parameters,
+        so a text already summarized in a previous session is not summarized again.
         Args:
             text (str): The text to summarize
             min_length (int, optional): The minimum length of the summary. Defaults to 64.
         Returns:
             str: The summarized text
         """
-        if self.tokenizer is None or self.model is None:
+        if not self.memory_compression:
             self.logger.warning("No tokenizer or model to perform summarization.")
             return text
         if len(text) < min_length*1.5:
             return text
-        max_length = len(text) // 2 if len(text) > min_length*2 else min_length*2
-        input_text = "summarize: " + text
-        inputs = self.tokenizer(input_text, return_tensors="pt", max_length=512, truncation=True)
-        summary_ids = self.model.generate(
-            inputs['input_ids'],
-            max_length=max_length,
-            min_length=min_length,
-            length_penalty=1.0,
-            num_beams=4,
-            early_stopping=True
-        )
-        summary = self.tokenizer.decode(summary_ids[0], skip_special_tokens=True)
-        summary.replace('summary:', '')
-        self.logger.info(f"Memory summarized from len {len(text)} to {len(summary)}.")
+        params = self.summarizer.params(text, min_length)
+        key = self.summary_key(text, params)
+        cached = get_summary_cache().get(key)
+        if cached is not None:
+            self.logger.info(f"Summary cache hit for text of len {len(text)}.")
+            return cached["summary"]
+        summary = self.summarizer.summarize(text, min_length)
+        self.logger.info(f"Memory summarized by {self.summarizer.name} from len {len(text)} to {len(summary)}.")
         self.logger.info(f"Summarized text:\n{summary}")
+        get_summary_cache().put(key, {"summary": summary, "params": params})
         return summary
+
+    def summary_key(self, text: str, params: dict) -> str:
+        """Get the summary cache key of a text: hash of the content and summarization parameters (engine, model, ...)."""
+        payload = json.dumps({"params": params, "text": text}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
     
     #@timer_decorator
     def compress(self) -> str:
         """
-        Compress (summarize) the memory using the model.
+        Compress (summarize) the long messages of the memory using the model.
+        With async compression, summaries are generated off the request path and swapped in when ready.
         """
-        if self.tokenizer is None or self.model is None:
+        if not self.memory_compression:
             self.logger.warning("No tokenizer or model to perform memory compression.")
             return
-        for i in range(len(self.memory)):
-            if self.memory[i]['role'] == 'system':
+        for message in self.memory:
+            if message['role'] == 'system':
                 continue
-            if len(self.memory[i]['content']) > 1024:
-                self.memory[i]['content'] = self.summarize(self.memory[i]['content'])
+            if len(message['content']) > COMPRESSION_THRESHOLD:
+                self.compress_message(message)
+
+    def compress_message(self, message: dict) -> None:
+        """Summarize a message, in the background if async compression is enabled."""
+        if not self.async_compression:
+            message['content'] = self.summarize(message['content'])
+            return
+        with self.lock:
+            if id(message) in self.pending_compressions:
+                return
+            content = message['content']
+            self.pending_compressions[id(message)] = (message, content)
+        future = compression_executor.submit(self.summarize, content)
+        future.add_done_callback(lambda future: self.swap_summary(message, content, future))
+
+    def swap_summary(self, message: dict, content: str, future: Future) -> None:
+        """
+        Replace a message by its summary once generated.
+        The summary is dropped if the message was changed or removed from memory meanwhile.
+        """
+        with self.lock:
+            self.pending_compressions.pop(id(message), None)
+            if future.exception() is not None:
+                self.logger.warning(f"Background memory compression failed: {str(future.exception())}")
+                return
+            if message['content'] == content and any(m is message for m in self.memory):
+                message['content'] = future.result()
+                self.logger.info("Swapped in background memory summary.")
+
+    def wait_for_compression(self, timeout: float | None = None) -> bool:
+        """
+        Wait for the background summaries of this memory.
+        Returns:
+            bool: True if all summaries were swapped in before the timeout.
+        """
+        start_time = time.time()
+        while len(self.pending_compressions) > 0:
+            if timeout is not None and time.time() - start_time > timeout:
+                return False
+            time.sleep(0.05)
+        return True
     
+    def remaining_tokens(self) -> int | None:
+        """Number of tokens left in the budget, at least a quarter of the budget. None if there is no budget."""
+        if not self.token_budget:
+            return None
+        return max(self.token_budget - self.total_tokens, self.token_budget // 4)
+
     def trim_text_to_max_ctx(self, text: str) -> str:
         """
-        Truncate a text to fit within the maximum context size of the model.
+        Truncate a text to fit within the tokens left in the budget.
+        Without a budget, the text is cut to the estimated context size of the model (in characters).
         """
-        ideal_ctx = self.get_ideal_ctx(self.model_provider)
-        return text[:ideal_ctx] if ideal_ctx is not None else text
+        max_tokens = self.remaining_tokens()
+        if max_tokens is None:
+            ideal_ctx = self.get_ideal_ctx(self.model_provider)
+            return text[:ideal_ctx] if ideal_ctx is not None else text
+        return self.token_counter.truncate(text, max(max_tokens - MESSAGE_TOKEN_OVERHEAD, MIN_MESSAGE_TOKENS))
     
     #@timer_decorator
     def compress_text_to_max_ctx(self, text) -> str:
         """
         Compress a text to fit within the maximum context size of the model.
         """
-        if self.tokenizer is None or self.model is None:
+        if not self.memory_compression:
             self.logger.warning("No tokenizer or model to perform memory compression.")
             return text
-        ideal_ctx = self.get_ideal_ctx(self.model_provider)
-        if ideal_ctx is None:
-            self.logger.warning("No ideal context size found.")
+        max_tokens = self.remaining_tokens()
+        if max_tokens is None:
+            self.logger.warning("No token budget, text not compressed.")
             return text
-        while len(text) > ideal_ctx:
-            self.logger.info(f"Compressing text: {len(text)} > {ideal_ctx} model context.")
-            text = self.summarize(text)
+        tokens = self.token_counter.count(text)
+        while tokens > max_tokens:
+            self.logger.info(f"Compressing text: {tokens} > {max_tokens} tokens left.")
+            summary = self.summarize(text)
+            summary_tokens = self.token_counter.count(summary)
+            if summary_tokens >= tokens:
+                return self.token_counter.truncate(summary, max_tokens)
+            text, tokens = summary, summary_tokens
         return text
 
 if __name__ == "__main__":
@@ -291,6 +611,7 @@ Ensure the file exists in the specified location.
     
     print("\n---\nmemory before:", memory.get())
     memory.compress()
+    memory.wait_for_compression()
     print("\n---\nmemory after:", memory.get())
     #memory.save_memory()
     
\ No newline at end of file
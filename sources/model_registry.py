@@ -0,0 +1,118 @@
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+from sources.logger import Logger
+
+class ModelRegistry:
+    """
+    ModelRegistry keeps track of the models used by agenticSeek (routing, translation, summarization...).
+    Models are registered with a loader function and only loaded on first use, so startup stays fast.
+    Models can also be warmed up ahead of time in a background thread.
+    """
+    def __init__(self):
+        self.loaders = {}
+        self.configs = {}
+        self.models = {}
+        self.load_times = {}
+        self.locks = {}
+        self.registry_lock = threading.Lock()
+        self.logger = Logger("model_registry.log")
+
+    def register(self, name: str, loader: Callable[[], Any], config: Any = None) -> None:
+        """
+        Register a model loader. Registering an already known name is a no-op,
+        so objects sharing the same model (eg: each agent memory) load it a single time.
+        A warning is logged if the name was registered with another configuration, as the first one is kept.
+        Args:
+            name (str): Unique name of the model.
+            loader (Callable): Function without arguments returning the loaded model.
+            config (Any): Settings the loaded model depends on (eg: backend, model name), compared on re-registration.
+        """
+        with self.registry_lock:
+            if name in self.loaders:
+                known_config = self.configs[name]
+                if known_config != config:
+                    self.logger.warning(f"Model {name} is already registered with {known_config}, ignoring {config}")
+                return
+            self.loaders[name] = loader
+            self.configs[name] = config
+            self.locks[name] = threading.Lock()
+        self.logger.info(f"Registered model {name}")
+
+    def is_registered(self, name: str) -> bool:
+        return name in self.loaders
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self.models
+
+    def get(self, name: str) -> Any:
+        """
+        Get a model, loading it if it is the first use.
+        Args:
+            name (str): Name of the model.
+        Returns:
+            The loaded model.
+        exceptions:
+            KeyError: If no loader was registered for the name.
+        """
+        if name in self.models:
+            return self.models[name]
+        if name not in self.loaders:
+            raise KeyError(f"Model {name} is not registered.")
+        with self.locks[name]:
+            if name not in self.models:
+                start_time = time.time()
+                model = self.loaders[name]()
+                self.load_times[name] = time.time() - start_time
+                self.models[name] = model
+                self.logger.info(f"Loaded model {name} in {self.load_times[name]:.2f} seconds")
+        return self.models[name]
+
+    def unload(self, name: str) -> None:
+        """Drop a loaded model, it will be loaded again on next use."""
+        with self.locks.get(name, self.registry_lock):
+            self.models.pop(name, None)
+            self.load_times.pop(name, None)
+
+    def warm(self, names: List[str] | None = None, background: bool = True) -> threading.Thread | None:
+        """
+        Preload models so the first queries do not pay for loading.
+        Args:
+            names (List[str] | None): Models to load, all registered models if None.
+            background (bool): Load in a daemon thread instead of blocking.
+        Returns:
+            threading.Thread | None: The warming thread if background is True.
+        """
+        names = list(self.loaders.keys()) if names is None else names
+
+        def _warm():
+            for name in names:
+                try:
+                    self.get(name)
+                except Exception as e:
+                    self.logger.error(f"Failed to warm model {name}: {str(e)}")
+            self.logger.info(f"Warmed models: {self.report()}")
+
+        if not background:
+            _warm()
+            return None
+        thread = threading.Thread(target=_warm, name="model-warmer", daemon=True)
+        thread.start()
+        return thread
+
+    def report(self) -> Dict[str, dict]:
+        """
+        Get the loading state of every registered model.
+        Returns:
+            Dict[str, dict]: For each model, whether it is loaded and its load time in seconds.
+        """
+        return {
+            name: {
+                "loaded": name in self.models,
+                "load_time": round(self.load_times[name], 3) if name in self.load_times else None
+            }
+            for name in self.loaders
+        }
+
+model_registry = ModelRegistry()
@@ -0,0 +1,139 @@
+import asyncio
+import threading
+import time
+from functools import lru_cache
+from urllib.parse import urlparse
+
+from sources.logger import Logger
+
+class HealthChecker:
+    """
+    Reachability of the provider servers, without blocking the requests.
+    Servers are probed with an async TCP connect (or HTTP GET when a path is given) with a short timeout.
+    Results are cached with a time-to-live and refreshed by a background thread,
+    so a request only reads the cached state instead of paying for a DNS lookup and a probe.
+    """
+    def __init__(self, ttl: float = 30.0, timeout: float = 2.0, refresh_interval: float = 10.0):
+        """
+        Args:
+            ttl (float): Time in seconds a probe result stays valid.
+            timeout (float): Timeout in seconds of a probe.
+            refresh_interval (float): Time in seconds between two background probes of the watched servers.
+        """
+        self.ttl = ttl
+        self.timeout = timeout
+        self.refresh_interval = refresh_interval
+        self.logger = Logger("provider.log")
+        self.lock = threading.Lock()
+        self.states = {} # address -> (online, timestamp)
+        self.watched = {} # address -> http path or None
+        self.refresher = None
+        self.stop_event = threading.Event()
+
+    @staticmethod
+    def parse_address(address: str) -> tuple:
+        """Get the (host, port) of an address like "host:port", "http://host:port/path" or "host"."""
+        parsed = urlparse(address if address.startswith(('http://', 'https://')) else f'http://{address}')
+        port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        return parsed.hostname or address, port
+
+    async def probe(self, address: str, path: str | None = None) -> bool:
+        """
+        Check if a server accepts connections (or answers an HTTP GET on path).
+        Args:
+            address (str): The server address.
+            path (str | None): HTTP path to request, None for a TCP connect only.
+        Returns:
+            bool: True if the server is reachable.
+        """
+        host, port = self.parse_address(address)
+        try:
+            if path is None:
+                _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout=self.timeout)
+                writer.close()
+                await writer.wait_closed()
+                online = True
+            else:
+                import httpx
+                base = address if address.startswith(('http://', 'https://')) else f"http://{address}"
+                async with httpx.AsyncClient(timeout=self.timeout) as client:
+                    response = await client.get(base.rstrip("/") + path)
+                online = response.status_code < 500
+        except Exception:
+            online = False
+        self.report(address, online)
+        return online
+
+    def report(self, address: str, online: bool) -> None:
+        """Record the state of a server, from a probe or the outcome of a request."""
+        with self.lock:
+            previous = self.states.get(address)
+            self.states[address] = (online, time.time())
+        if previous is None or previous[0] != online:
+            self.logger.info(f"Server {address} is {'online' if online else 'offline'}")
+
+    def is_online(self, address: str) -> bool | None:
+        """
+        Get the cached state of a server, never blocks.
+        Returns:
+            bool | None: The last known state, None if unknown or expired.
+        """
+        with self.lock:
+            state = self.states.get(address)
+        if state is None or time.time() - state[1] > self.ttl:
+            return None
+        return state[0]
+
+    async def check(self, address: str, path: str | None = None) -> bool:
+        """Get the state of a server, probed only if the cached state is unknown or expired."""
+        online = self.is_online(address)
+        if online is None:
+            online = await self.probe(address, path)
+        return online
+
+    def watch(self, address: str, path: str | None = None) -> None:
+        """Keep the state of a server fresh with background probes."""
+        with self.lock:
+            self.watched[address] = path
+            if self.refresher is None or not self.refresher.is_alive():
+                self.stop_event.clear()
+                self.refresher = threading.Thread(target=self.run_refresher, name="provider-health", daemon=True)
+                self.refresher.start()
+
+    def unwatch(self, address: str) -> None:
+        with self.lock:
+            self.watched.pop(address, None)
+
+    def run_refresher(self) -> None:
+        loop = asyncio.new_event_loop()
+        try:
+            while not self.stop_event.is_set():
+                loop.run_until_complete(self.probe_watched())
+                self.stop_event.wait(self.refresh_interval)
+        finally:
+            loop.close()
+
+    async def probe_watched(self) -> None:
+        """Probe all the watched servers concurrently."""
+        with self.lock:
+            watched = list(self.watched.items())
+        await asyncio.gather(*(self.probe(address, path) for address, path in watched))
+
+    def stop(self) -> None:
+        """Stop the background refresher."""
+        self.stop_event.set()
+        if self.refresher is not None:
+            self.refresher.join(timeout=self.timeout + 1)
+            self.refresher = None
+
+    def get_states(self) -> dict:
+        """Get the last known state of every server."""
+        now = time.time()
+        with self.lock:
+            return {address: {"online": online, "age": round(now - timestamp, 1)}
+                    for address, (online, timestamp) in self.states.items()}
+
+@lru_cache(maxsize=None)
+def get_health_checker() -> HealthChecker:
+    """Get the health checker shared by all providers."""
+    return HealthChecker()
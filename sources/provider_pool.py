@@ -0,0 +1,231 @@
+import threading
+import time
+from typing import AsyncIterator
+
+from sources.logger import Logger
+from sources.llm_provider import Provider
+from sources.utility import pretty_print
+
+BALANCING_STRATEGIES = ["least_outstanding", "ewma"]
+
+class PoolNode:
+    """
+    A backend of a provider pool and its load statistics.
+    """
+    def __init__(self, provider: Provider):
+        self.provider = provider
+        self.outstanding = 0
+        self.ewma_latency = None # seconds, None until the first answer
+        self.requests = 0
+        self.failures = 0
+        self.ejected_until = 0.0
+
+    @property
+    def address(self) -> str:
+        return self.provider.server_address
+
+    def is_ejected(self, now: float) -> bool:
+        return now < self.ejected_until or self.provider.known_offline()
+
+class ProviderPool:
+    """
+    Spread the requests of the agents across several servers of the same provider (eg: multiple Ollama hosts).
+    A backend is chosen by least outstanding requests or by EWMA latency (weighted by its outstanding requests).
+    A backend answering that it is offline or overloaded is ejected for a while and the request is retried on another one.
+    Has the same interface as Provider, so the agents can use either.
+    """
+    def __init__(self, providers: list, strategy: str = "least_outstanding",
+                 eject_time: float = 30.0, ewma_decay: float = 0.3):
+        """
+        Args:
+            providers (list): The Provider of each backend.
+            strategy (str): "least_outstanding" or "ewma".
+            eject_time (float): Time in seconds a failing backend is left out.
+            ewma_decay (float): Weight of the last latency in the moving average.
+        """
+        if not providers:
+            raise ValueError("A provider pool needs at least one provider.")
+        if strategy not in BALANCING_STRATEGIES:
+            raise ValueError(f"Unknown balancing strategy: {strategy}. Choose from {BALANCING_STRATEGIES}")
+        self.nodes = [PoolNode(provider) for provider in providers]
+        self.strategy = strategy
+        self.eject_time = eject_time
+        self.ewma_decay = ewma_decay
+        self.lock = threading.Lock()
+        self.next_index = 0
+        self.logger = Logger("provider.log")
+
+    @property
+    def provider_name(self) -> str:
+        return self.nodes[0].provider.provider_name
+
+    @property
+    def model(self) -> str:
+        return self.nodes[0].provider.model
+
+    @property
+    def server_ip(self) -> str:
+        return ",".join(node.address for node in self.nodes)
+
+    @property
+    def response_cache(self):
+        return self.nodes[0].provider.response_cache
+
+    def get_model_name(self) -> str:
+        return self.model
+
+    def score(self, node: PoolNode) -> float:
+        """Lower is better."""
+        if self.strategy == "ewma":
+            return (node.ewma_latency or 0.0) * (node.outstanding + 1)
+        return node.outstanding
+
+    def acquire(self, excluded: list) -> PoolNode | None:
+        """
+        Choose a backend for a request and count the request as outstanding.
+        Args:
+            excluded (list): The backends already tried for this request.
+        Returns:
+            PoolNode | None: The backend, None if all were tried.
+        """
+        now = time.time()
+        with self.lock:
+            candidates = [node for node in self.nodes if node not in excluded]
+            if not candidates:
+                return None
+            healthy = [node for node in candidates if not node.is_ejected(now)]
+            if healthy:
+                candidates = healthy
+            # rotate the candidates so ties go round-robin
+            start = self.next_index % len(self.nodes)
+            self.next_index += 1
+            candidates.sort(key=lambda node: (self.score(node), (self.nodes.index(node) - start) % len(self.nodes)))
+            node = candidates[0]
+            node.outstanding += 1
+            node.requests += 1
+        return node
+
+    def release(self, node: PoolNode, started: float, answer: str) -> bool:
+        """
+        Record the outcome of a request on a backend.
+        Returns:
+            bool: True if the backend could answer, False if it was ejected.
+        """
+        with self.lock:
+            node.outstanding -= 1
+            if node.provider.is_unavailable_answer(answer):
+                node.failures += 1
+                node.ejected_until = time.time() + self.eject_time
+                available = False
+            else:
+                latency = time.time() - started
+                node.ewma_latency = latency if node.ewma_latency is None else \
+                    self.ewma_decay * latency + (1 - self.ewma_decay) * node.ewma_latency
+                available = True
+        if not available:
+            self.logger.warning(f"Backend {node.address} unavailable, ejected for {self.eject_time}s")
+        return available
+
+    def abandon(self, node: PoolNode) -> None:
+        """Stop counting a request that raised or was cancelled."""
+        with self.lock:
+            node.outstanding -= 1
+
+    def respond(self, history, verbose=True, use_cache=True, priority="interactive"):
+        """
+        Generate text on the best backend, retrying on the others if it is offline or overloaded.
+        """
+        tried = []
+        answer = None
+        while (node := self.acquire(tried)) is not None:
+            tried.append(node)
+            started = time.time()
+            try:
+                answer = node.provider.respond(history, verbose, use_cache, priority)
+            except BaseException:
+                self.abandon(node)
+                raise
+            if self.release(node, started, answer):
+                return answer
+        return answer
+
+    async def respond_async(self, history, verbose=True, use_cache=True, priority="interactive") -> str:
+        """
+        Generate text on the best backend, awaiting the LLM I/O on the event loop.
+        """
+        tried = []
+        answer = None
+        while (node := self.acquire(tried)) is not None:
+            tried.append(node)
+            started = time.time()
+            try:
+                answer = await node.provider.respond_async(history, verbose, use_cache, priority)
+            except BaseException:
+                self.abandon(node)
+                raise
+            if self.release(node, started, answer):
+                return answer
+        return answer
+
+    async def respond_stream(self, history, verbose=False, use_cache=True, priority="interactive") -> AsyncIterator[str]:
+        """
+        Generate text on the best backend, token by token.
+        A backend is only retried on another one before its first token.
+        """
+        tried = []
+        answer = None
+        while (node := self.acquire(tried)) is not None:
+            tried.append(node)
+            started = time.time()
+            answer = ""
+            stream = node.provider.respond_stream(history, verbose, use_cache, priority)
+            try:
+                async for token in stream:
+                    if not answer and node.provider.is_unavailable_answer(token):
+                        answer = token
+                        break
+                    answer += token
+                    yield token
+            except BaseException:
+                self.abandon(node)
+                raise
+            finally:
+                await stream.aclose()
+            if self.release(node, started, answer):
+                return
+        if answer:
+            yield answer
+
+    def stats(self) -> dict:
+        """Get the load statistics of each backend."""
+        now = time.time()
+        with self.lock:
+            return {node.address: {
+                        "outstanding": node.outstanding,
+                        "requests": node.requests,
+                        "failures": node.failures,
+                        "ewma_latency": node.ewma_latency,
+                        "ejected": node.is_ejected(now),
+                        "scheduler": node.provider.scheduler.stats() if node.provider.scheduler is not None else None
+                    } for node in self.nodes}
+
+def create_provider(provider_name, model, server_address="127.0.0.1:5000", is_local=False,
+                    strategy="least_outstanding", **kwargs) -> Provider | ProviderPool:
+    """
+    Create a provider, or a pool of providers if server_address lists several comma-separated servers.
+    Args:
+        provider_name (str): Name of the provider.
+        model (str): Name of the model.
+        server_address (str): Address of the server, or comma-separated addresses of several servers.
+        is_local (bool): The provider runs locally (or on servers of the user).
+        strategy (str): Balancing strategy of a pool, see BALANCING_STRATEGIES.
+        **kwargs: Other arguments of Provider.
+    """
+    addresses = [address.strip() for address in server_address.split(",") if address.strip()]
+    if len(addresses) <= 1:
+        return Provider(provider_name, model, server_address.strip(), is_local, **kwargs)
+    # a local Ollama provider always runs on localhost, the servers of a pool are given by their address
+    node_is_local = is_local and provider_name.lower() != "ollama"
+    providers = [Provider(provider_name, model, address, node_is_local, **kwargs) for address in addresses]
+    pretty_print(f"Balancing {provider_name} requests across {len(providers)} servers ({strategy})", color="status")
+    return ProviderPool(providers, strategy=strategy)
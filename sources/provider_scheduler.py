@@ -0,0 +1,135 @@
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager, asynccontextmanager
+
+# lower is served first
+PRIORITIES = {"interactive": 0, "planning": 1, "summarization": 2}
+
+class ProviderScheduler:
+    """
+    Bound the requests in flight on a backend and serve the waiting ones by priority.
+    Interactive requests (answers to the user) go before planning (make_plan/update_plan),
+    which go before summarization. Requests of the same priority are served in arrival order.
+    Works for threads (respond) and event loops (respond_async, respond_stream) alike.
+    """
+    def __init__(self, max_concurrency: int = 4, ewma_decay: float = 0.3):
+        """
+        Args:
+            max_concurrency (int): Maximum number of requests in flight.
+            ewma_decay (float): Weight of the last request duration in the moving average.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+        self.max_concurrency = max_concurrency
+        self.ewma_decay = ewma_decay
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.waiters = [] # heap of [priority level, arrival order, grant function]
+        self.order = itertools.count()
+        self.mean_duration = None
+        self.requests = {name: 0 for name in PRIORITIES}
+
+    def level(self, priority: str) -> int:
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority: {priority}. Choose from {list(PRIORITIES.keys())}")
+        return PRIORITIES[priority]
+
+    def try_acquire(self) -> bool:
+        """Take a free slot if nobody is waiting, must be called with the lock."""
+        if self.in_flight < self.max_concurrency and not self.waiters:
+            self.in_flight += 1
+            return True
+        return False
+
+    def acquire(self, priority: str = "interactive") -> None:
+        """Wait for a slot, blocking the thread."""
+        level = self.level(priority)
+        event = threading.Event()
+        with self.lock:
+            self.requests[priority] += 1
+            if self.try_acquire():
+                return
+            heapq.heappush(self.waiters, [level, next(self.order), event.set])
+        event.wait()
+
+    async def acquire_async(self, priority: str = "interactive") -> None:
+        """Wait for a slot without blocking the event loop."""
+        level = self.level(priority)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def grant():
+            if future.cancelled():
+                self.release() # the waiter left, hand the slot to the next one
+            else:
+                future.set_result(None)
+
+        entry = [level, next(self.order), lambda: loop.call_soon_threadsafe(grant)]
+        with self.lock:
+            self.requests[priority] += 1
+            if self.try_acquire():
+                return
+            heapq.heappush(self.waiters, entry)
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self.lock:
+                if entry in self.waiters:
+                    self.waiters.remove(entry)
+                    heapq.heapify(self.waiters)
+                    entry = None
+            if entry is not None and future.done() and not future.cancelled():
+                self.release() # granted but cancelled before resuming
+            raise
+
+    def release(self, duration: float | None = None) -> None:
+        """
+        Give back a slot, to the waiter with the highest priority if any.
+        Args:
+            duration (float | None): Duration of the request, averaged in the stats.
+        """
+        with self.lock:
+            if duration is not None:
+                self.mean_duration = duration if self.mean_duration is None else \
+                    self.ewma_decay * duration + (1 - self.ewma_decay) * self.mean_duration
+            if self.waiters:
+                grant = heapq.heappop(self.waiters)[2] # the slot goes to the waiter, in_flight is unchanged
+            else:
+                self.in_flight -= 1
+                grant = None
+        if grant is not None:
+            grant()
+
+    @contextmanager
+    def slot(self, priority: str = "interactive"):
+        self.acquire(priority)
+        started = time.time()
+        try:
+            yield
+        finally:
+            self.release(time.time() - started)
+
+    @asynccontextmanager
+    async def async_slot(self, priority: str = "interactive"):
+        await self.acquire_async(priority)
+        started = time.time()
+        try:
+            yield
+        finally:
+            self.release(time.time() - started)
+
+    def stats(self) -> dict:
+        with self.lock:
+            queued = {name: 0 for name in PRIORITIES}
+            for level, _, _ in self.waiters:
+                queued[next(name for name, value in PRIORITIES.items() if value == level)] += 1
+            return {
+                "max_concurrency": self.max_concurrency,
+                "in_flight": self.in_flight,
+                "queued": queued,
+                "requests": dict(self.requests),
+                "mean_duration": self.mean_duration
+            }
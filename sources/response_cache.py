@@ -0,0 +1,109 @@
+import json
+import hashlib
+import threading
+import time
+from functools import lru_cache
+
+from sources.cache import LRUCache, DiskLRUCache
+from sources.logger import Logger
+
+RESPONSE_CACHE_PATH = ".response_cache/responses.db"
+
+class ResponseCache:
+    """
+    Opt-in cache of LLM answers, keyed by provider, model, hash of the messages and sampling parameters.
+    Identical requests (planner retries, repeated test runs...) are answered without calling the LLM.
+    Two tiers: a small in-memory LRU in front of a size-bounded LRU on disk, both with the same time-to-live.
+    Sampled requests (temperature > 0 or left to the provider default, several choices) bypass the cache.
+    """
+    def __init__(self, path: str | None = RESPONSE_CACHE_PATH,
+                 max_entries: int = 256,
+                 max_bytes: int = 64 * 1024 * 1024,
+                 ttl: float | None = 24 * 3600):
+        """
+        Args:
+            path (str | None): Path of the on-disk cache, None to only cache in memory.
+            max_entries (int): Maximum number of answers in memory.
+            max_bytes (int): Maximum size of the answers on disk.
+            ttl (float | None): Time-to-live of an answer in seconds, None for no expiry.
+        """
+        self.ttl = ttl
+        self.memory = LRUCache(max_size=max_entries)
+        self.disk = DiskLRUCache(path, max_bytes=max_bytes, ttl=ttl) if path else None
+        self.logger = Logger("provider.log")
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+
+    def key(self, provider: str, model: str, messages: list, params: dict) -> str:
+        """Get the cache key of a request."""
+        payload = json.dumps({"provider": provider, "model": model, "messages": messages, "params": params},
+                             sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def is_sampled(self, params: dict) -> bool:
+        """
+        A sampled request should get a new answer every time.
+        Without a temperature the provider default applies, which samples for most providers (eg: 0.8 for Ollama).
+        """
+        temperature = params.get("temperature")
+        return temperature is None or temperature > 0 or (params.get("n") or 1) > 1
+
+    def bypass(self) -> None:
+        with self.lock:
+            self.bypassed += 1
+
+    def get(self, key: str) -> str | None:
+        """
+        Get the cached answer of a request.
+        Args:
+            key (str): The request key.
+        Returns:
+            str | None: The answer, None on a miss.
+        """
+        entry = self.memory.get(key)
+        if entry is not None and self.ttl is not None and time.time() - entry["created"] > self.ttl:
+            entry = None
+        if entry is None and self.disk is not None:
+            entry = self.disk.get(key)
+            if entry is not None:
+                self.memory.put(key, entry)
+        with self.lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        self.logger.info(f"Response cache hit for {key[:12]}")
+        return entry["answer"]
+
+    def put(self, key: str, answer: str) -> None:
+        """Cache the answer of a request."""
+        entry = {"answer": answer, "created": time.time()}
+        self.memory.put(key, entry)
+        if self.disk is not None:
+            self.disk.put(key, entry)
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self) -> dict:
+        """Get the hit/miss/bypass counters of the cache and the state of each tier."""
+        with self.lock:
+            total = self.hits + self.misses
+            stats = {
+                "hits": self.hits,
+                "misses": self.misses,
+                "bypassed": self.bypassed,
+                "hit_rate": self.hits / total if total > 0 else 0.0
+            }
+        stats["memory"] = self.memory.stats()
+        stats["disk"] = self.disk.stats() if self.disk is not None else None
+        return stats
+
+@lru_cache(maxsize=None)
+def get_response_cache(path: str | None = RESPONSE_CACHE_PATH, ttl: float | None = 24 * 3600) -> ResponseCache:
+    """Get the response cache of a path, shared by all providers."""
+    return ResponseCache(path, ttl=ttl)
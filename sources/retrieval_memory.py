@@ -0,0 +1,174 @@
+import os
+import json
+import base64
+import hashlib
+import datetime
+import threading
+from typing import List
+
+import numpy as np
+
+from sources.embeddings import DEFAULT_ENCODER, get_sentence_encoder, register_sentence_encoder
+from sources.vector_index import VectorIndex
+from sources.logger import Logger
+
+class RetrievalMemory:
+    """
+    Long-term memory of an agent: past turns and notes are embedded into a local vector index,
+    so only the snippets relevant to the current request are put back in the prompt.
+    The index is persisted in an append-only file, one snippet and its vector per line,
+    and shared across sessions of the same agent type.
+    """
+    def __init__(self, name: str,
+                 folder: str = ".memory_index",
+                 encoder_name: str = DEFAULT_ENCODER,
+                 chunk_chars: int = 800,
+                 min_similarity: float = 0.3):
+        """
+        Args:
+            name (str): Name of the index, usually the agent type.
+            folder (str): Folder of the index files.
+            encoder_name (str): Sentence encoder used for the embeddings.
+            chunk_chars (int): Long texts are split in snippets of this many characters.
+            min_similarity (float): Snippets less similar than this to the query are not recalled.
+        """
+        self.name = name
+        self.folder = folder
+        self.encoder_name = encoder_name
+        self.chunk_chars = chunk_chars
+        self.min_similarity = min_similarity
+        self.path = os.path.join(folder, f"{name}.jsonl")
+        self.logger = Logger("memory.log")
+        self.lock = threading.Lock()
+        self.index = None
+        self.seen = set()
+        self.seen_loaded = False
+        self.pending = [] # snippets not embedded yet
+        self.unsaved = [] # (vector, snippet) embedded but not written to disk
+        register_sentence_encoder(encoder_name) # loaded on first search, or by model_registry.warm()
+
+    def chunk(self, text: str) -> List[str]:
+        text = text.strip()
+        return [text[i:i+self.chunk_chars] for i in range(0, len(text), self.chunk_chars)]
+
+    def add(self, text: str, source: str = "turn", role: str | None = None) -> None:
+        """
+        Add a text to the long-term memory. It is embedded lazily, on the next search or save.
+        Args:
+            text (str): The text to remember.
+            source (str): Where the text comes from (eg: "turn", "browser_note").
+            role (str | None): Role of the message for conversation turns.
+        """
+        time_str = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self.lock:
+            if not self.seen_loaded:
+                self.load_seen() # the snippets on disk must be known to skip them
+            for chunk in self.chunk(text):
+                digest = hashlib.sha1(chunk.encode("utf-8")).hexdigest()
+                if len(chunk) < 16 or digest in self.seen:
+                    continue
+                self.seen.add(digest)
+                self.pending.append({"text": chunk, "source": source, "role": role, "time": time_str})
+
+    def load_seen(self) -> None:
+        """Get the digests of the snippets on disk, without loading the encoder."""
+        self.seen_loaded = True
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'rb') as f:
+                for line in f:
+                    try:
+                        text = json.loads(line)["text"]
+                    except (ValueError, KeyError):
+                        break
+                    if not line.endswith(b"\n"):
+                        break # partially written, dropped by load_index
+                    self.seen.add(hashlib.sha1(text.encode("utf-8")).hexdigest())
+        except Exception as e:
+            self.logger.warning(f"Failed to read long-term memory {self.name}: {str(e)}")
+
+    def load_index(self) -> VectorIndex:
+        """Load the index from disk, truncating a partially written tail so the next save appends after a whole record."""
+        encoder = get_sentence_encoder(self.encoder_name)
+        index = VectorIndex(encoder.dim)
+        if not os.path.exists(self.path):
+            return index
+        try:
+            vectors, snippets = [], []
+            valid_size = 0
+            with open(self.path, 'rb') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        vector = np.frombuffer(base64.b64decode(record.pop("vector")), dtype=np.float32)
+                    except (ValueError, KeyError):
+                        break
+                    if not line.endswith(b"\n") or len(vector) != encoder.dim:
+                        break
+                    vectors.append(vector)
+                    snippets.append(record)
+                    valid_size += len(line)
+            if valid_size < os.path.getsize(self.path):
+                self.logger.warning(f"Dropping the partially written tail of long-term memory {self.name}")
+                os.truncate(self.path, valid_size)
+            if len(snippets) > 0:
+                index.add(np.stack(vectors), snippets)
+            for snippet in snippets:
+                self.seen.add(hashlib.sha1(snippet["text"].encode("utf-8")).hexdigest())
+            self.logger.info(f"Loaded {len(snippets)} long-term memories for {self.name}")
+        except Exception as e:
+            self.logger.warning(f"Failed to load long-term memory {self.name}: {str(e)}")
+        return index
+
+    def flush(self) -> None:
+        """Embed the pending snippets in a single encoder pass."""
+        with self.lock:
+            if self.index is None:
+                self.index = self.load_index()
+            pending, self.pending = self.pending, []
+        if len(pending) == 0:
+            return
+        vectors = get_sentence_encoder(self.encoder_name).encode([snippet["text"] for snippet in pending])
+        self.index.add(vectors, pending)
+        with self.lock:
+            self.unsaved.extend(zip(vectors, pending))
+
+    def save(self) -> None:
+        """Append the new snippets with their vectors to the index file, one record per line."""
+        self.flush()
+        with self.lock:
+            unsaved, self.unsaved = self.unsaved, []
+            if len(unsaved) == 0:
+                return
+            os.makedirs(self.folder, exist_ok=True)
+            lines = []
+            for vector, snippet in unsaved:
+                encoded = base64.b64encode(np.asarray(vector, dtype=np.float32).tobytes()).decode("ascii")
+                lines.append(json.dumps(dict(snippet, vector=encoded), ensure_ascii=False) + "\n")
+            with open(self.path, 'a', encoding="utf-8") as f:
+                f.write("".join(lines))
+
+    def search(self, query: str, k: int = 4, exclude: set | None = None) -> List[dict]:
+        """
+        Get the snippets most relevant to a query.
+        Args:
+            query (str): The query, usually the last user message.
+            k (int): Maximum number of snippets.
+            exclude (set | None): Texts already in the prompt, not returned again.
+        Returns:
+            List[dict]: The snippets with their "text", "source", "time" and "score".
+        """
+        self.flush()
+        if len(self.index) == 0:
+            return []
+        exclude = exclude or set()
+        vector = get_sentence_encoder(self.encoder_name).encode([query])
+        results = []
+        for score, snippet in self.index.search(vector, k=k + len(exclude))[0]:
+            if score < self.min_similarity or any(snippet["text"] in text for text in exclude):
+                continue
+            results.append(dict(snippet, score=score))
+            if len(results) == k:
+                break
+        return results
@@ -1,5 +1,7 @@
 import os
+import re
 import sys
+import time
 import torch
 import random
 from typing import List, Tuple, Type, Dict
@@ -13,35 +15,157 @@ from sources.agents.casual_agent import CasualAgent
 from sources.agents.planner_agent import FileAgent
 from sources.agents.browser_agent import BrowserAgent
 from sources.language import LanguageUtility
+from sources.router_backends import load_zero_shot_pipeline
+from sources.router_examples import FEW_SHOTS_COMPLEXITY, FEW_SHOTS_TASKS
+from sources.router_heuristics import HeuristicRouter, LABEL_ALIASES
+from sources.embeddings import DEFAULT_ENCODER, MULTILINGUAL_ENCODER, SentenceEncoder, get_sentence_encoder
+from sources.vector_index import VectorIndex
+from sources.router_state import router_state_key, share_backbone, save_router_heads, load_router_heads
+from sources.cache import LRUCache
+from sources.batcher import MicroBatcher
 from sources.utility import pretty_print, animate_thinking, timer_decorator
 from sources.logger import Logger
+from sources.model_registry import model_registry
 
 class AgentRouter:
     """
     AgentRouter is a class that selects the appropriate agent based on the user query.
     """
-    def __init__(self, agents: list, supported_language: List[str] = ["en", "fr", "zh"]):
+    def __init__(self, agents: list,
+                 supported_language: List[str] = ["en", "fr", "zh"],
+                 cache_size: int = 512,
+                 batch_size: int = 8,
+                 batch_wait: float = 0.01,
+                 backend: str = "torch",
+                 cache_dir: str = ".router_cache",
+                 heuristic_threshold: float = 0.9,
+                 encoder_name: str | None = None,
+                 knn_k: int = 7,
+                 knn_lists: int = 0,
+                 multilingual: bool = False):
+        """
+        Args:
+            agents (list): The agents to route queries to.
+            supported_language (List[str]): Languages supported for detection and translation.
+            cache_size (int): Number of routing decisions kept in the LRU cache, 0 to disable.
+            batch_size (int): Maximum number of concurrent queries routed in one forward pass.
+            batch_wait (float): Time in seconds to wait for concurrent queries before routing a batch.
+            backend (str): Zero-shot backend, "torch" (fp32), "quantized" (int8) or "onnx" (ONNX Runtime).
+                "knn" replaces the zero-shot vote by a k-NN vote over sentence embeddings of the routing examples.
+            cache_dir (str): Folder for the precompiled router heads and exported models.
+            heuristic_threshold (float): Confidence of the heuristic tier above which the neural vote is skipped.
+            encoder_name (str | None): Sentence encoder of the knn backend, a default (multilingual) encoder if None.
+            knn_k (int): Number of neighbors of the knn vote.
+            knn_lists (int): Number of IVF clusters of the knn index, 0 for exhaustive search.
+            multilingual (bool): Route the original text with a multilingual encoder instead of translating it.
+                Both the agent role and the complexity are then k-NN votes, this requires the knn backend.
+        """
+        if multilingual and backend != "knn":
+            raise ValueError(f"Multilingual routing requires the knn router backend, got {backend}.")
         self.agents = agents
         self.logger = Logger("router.log")
         self.lang_analysis = LanguageUtility(supported_language=supported_language)
-        self.pipelines = self.load_pipelines()
-        self.talk_classifier = self.load_llm_router()
-        self.complexity_classifier = self.load_llm_router()
-        self.learn_few_shots_tasks()
-        self.learn_few_shots_complexity()
+        self.backend = backend
+        self.cache_dir = cache_dir
+        self.multilingual = multilingual
+        if encoder_name is None:
+            encoder_name = MULTILINGUAL_ENCODER if multilingual else DEFAULT_ENCODER
+        self.encoder_name = encoder_name
+        self.knn_k = knn_k
+        self.knn_lists = knn_lists
+        # routers with other settings get their own models
+        self.knn_index_name = f"router-knn-index-{encoder_name}-{knn_lists}"
+        self.knn_complexity_name = f"router-knn-complexity-{encoder_name}-{knn_lists}"
+        self.zero_shot_name = f"router-zero-shot-{backend}-{cache_dir}"
+        self.heads_name = f"router-heads-{cache_dir}"
+        if self.backend == "knn":
+            model_registry.register(self.knn_index_name, self.load_knn_index, config=(encoder_name, knn_lists))
+        else:
+            model_registry.register(self.zero_shot_name, self.load_pipelines, config=(backend, cache_dir))
+        if self.multilingual:
+            model_registry.register(self.knn_complexity_name, self.load_knn_complexity_index, config=(encoder_name, knn_lists))
+        else:
+            model_registry.register(self.heads_name, self.load_router_heads, config=cache_dir)
+        self.heuristics = HeuristicRouter(FEW_SHOTS_TASKS, threshold=heuristic_threshold)
         self.asked_clarify = False
+        self.decision_cache = LRUCache(max_size=cache_size)
+        self.batcher = MicroBatcher(self.route_batch, max_batch_size=batch_size, max_wait=batch_wait, name="router-batcher")
     
+    @property
+    def pipelines(self) -> Dict[str, Type[pipeline]]:
+        return model_registry.get(self.zero_shot_name)
+
+    @property
+    def knn_index(self) -> VectorIndex:
+        return model_registry.get(self.knn_index_name)
+
+    @property
+    def knn_complexity_index(self) -> VectorIndex:
+        return model_registry.get(self.knn_complexity_name)
+
+    @property
+    def encoder(self) -> SentenceEncoder:
+        return get_sentence_encoder(self.encoder_name)
+
+    @property
+    def talk_classifier(self) -> AdaptiveClassifier:
+        return model_registry.get(self.heads_name)["talk"]
+
+    @property
+    def complexity_classifier(self) -> AdaptiveClassifier:
+        return model_registry.get(self.heads_name)["complexity"]
+
     def load_pipelines(self) -> Dict[str, Type[pipeline]]:
         """
         Load the pipelines for the text classification used for routing.
         returns:
             Dict[str, Type[pipeline]]: The loaded pipelines
         """
-        animate_thinking("Loading zero-shot pipeline...", color="status")
+        animate_thinking(f"Loading zero-shot pipeline ({self.backend})...", color="status")
         return {
-            "bart": pipeline("zero-shot-classification", model="facebook/bart-large-mnli")
+            "bart": load_zero_shot_pipeline(self.backend, cache_dir=self.cache_dir)
         }
 
+    def build_knn_index(self, examples: List[Tuple[str, str]]) -> VectorIndex:
+        """
+        Build a vector index over the embeddings of labeled examples.
+        Args:
+            examples: The (text, label) examples
+        returns:
+            VectorIndex: The index, with the label of each example as payload
+        """
+        encoder = self.encoder
+        animate_thinking("Indexing routing examples...", color="status")
+        index = VectorIndex(encoder.dim, n_lists=self.knn_lists)
+        texts = [text for text, _ in examples]
+        labels = [LABEL_ALIASES.get(label, label) for _, label in examples]
+        index.add(encoder.encode(texts), labels)
+        return index
+
+    def load_knn_index(self) -> VectorIndex:
+        return self.build_knn_index(FEW_SHOTS_TASKS)
+
+    def load_knn_complexity_index(self) -> VectorIndex:
+        return self.build_knn_index(FEW_SHOTS_COMPLEXITY)
+
+    def add_routing_examples(self, texts: List[str], labels: List[str]) -> None:
+        """
+        Add labeled routing examples at runtime, without any retraining.
+        Only available with the knn backend.
+        Args:
+            texts (List[str]): The example queries (in english)
+            labels (List[str]): The agent role of each query
+        """
+        if self.backend != "knn":
+            raise ValueError(f"Routing examples can only be added with the knn backend, not {self.backend}.")
+        labels = [LABEL_ALIASES.get(label, label) for label in labels]
+        self.knn_index.add(self.encoder.encode(texts), labels)
+        self.decision_cache.clear()
+        self.logger.info(f"Added {len(texts)} routing examples, index size: {len(self.knn_index)}")
+
+    def get_llm_router_path(self) -> str:
+        return "../llm_router" if __name__ == "__main__" else "./llm_router"
+
     def load_llm_router(self) -> AdaptiveClassifier:
         """
         Load the LLM router model.
@@ -50,7 +174,7 @@ class AgentRouter:
         exceptions:
             Exception: If the safetensors fails to load
         """
-        path = "../llm_router" if __name__ == "__main__" else "./llm_router"
+        path = self.get_llm_router_path()
         try:
             animate_thinking("Loading LLM router model...", color="status")
             talk_classifier = AdaptiveClassifier.from_pretrained(path)
@@ -58,6 +182,36 @@ class AgentRouter:
             raise Exception("Failed to load the routing model. Please run the dl_safetensors.sh script inside llm_router/ directory to download the model.")
         return talk_classifier
 
+    def load_router_heads(self) -> Dict[str, AdaptiveClassifier]:
+        """
+        Load the talk and complexity classifiers on top of a single shared LLM router backbone.
+        The few-shot examples are learned once, then the learned heads are saved to a precompiled
+        artifact keyed by a hash of the examples, which is memory-mapped on the next startups.
+        returns:
+            Dict[str, AdaptiveClassifier]: The "talk" and "complexity" classifiers
+        """
+        base = self.load_llm_router()
+        examples = {"talk": FEW_SHOTS_TASKS, "complexity": FEW_SHOTS_COMPLEXITY}
+        key = router_state_key(self.get_llm_router_path(), examples)
+        artifact_path = os.path.join(self.cache_dir, f"router_heads_{key}.pt")
+        if os.path.exists(artifact_path):
+            try:
+                heads = load_router_heads(artifact_path, base)
+                self.logger.info(f"Loaded precompiled router heads from {artifact_path}")
+                return heads
+            except Exception as e:
+                self.logger.warning(f"Failed to load router heads {artifact_path}, learning again: {str(e)}")
+        animate_thinking("Learning few-shot routing examples...", color="status")
+        heads = {"talk": share_backbone(base), "complexity": base}
+        self.learn_few_shots_tasks(heads["talk"])
+        self.learn_few_shots_complexity(heads["complexity"])
+        try:
+            save_router_heads(artifact_path, heads)
+            self.logger.info(f"Saved precompiled router heads at {artifact_path}")
+        except Exception as e:
+            self.logger.warning(f"Failed to save router heads at {artifact_path}: {str(e)}")
+        return heads
+
     def get_device(self) -> str:
         if torch.backends.mps.is_available():
             return "mps"
@@ -66,295 +220,31 @@ class AgentRouter:
         else:
             return "cpu"
     
-    def learn_few_shots_complexity(self) -> None:
+    def learn_few_shots_complexity(self, classifier: AdaptiveClassifier) -> None:
         """
         Few shot learning for complexity estimation.
         Use the build in add_examples method of the Adaptive_classifier.
+        Args:
+            classifier: The complexity classifier to teach
         """
-        few_shots = [
-            ("hi", "LOW"),
-            ("How it's going ?", "LOW"),
-            ("What’s the weather like today?", "LOW"),
-            ("Can you find a file named ‘notes.txt’ in my Documents folder?", "LOW"),
-            ("Write a Python script to generate a random password", "LOW"),
-            ("Debug this JavaScript code that’s not running properly", "LOW"),
-            ("Search the web for the cheapest laptop under $500", "LOW"),
-            ("Locate a file called ‘report_2024.pdf’ on my drive", "LOW"),
-            ("Check if a folder named ‘Backups’ exists on my system", "LOW"),
-            ("Can you find ‘family_vacation.mp4’ in my Videos folder?", "LOW"),
-            ("Search my drive for a file named ‘todo_list.xlsx’", "LOW"),
-            ("Write a Python function to check if a string is a palindrome", "LOW"),
-            ("Can you search the web for startups in Berlin?", "LOW"),
-            ("Find recent articles on blockchain technology online", "LOW"),
-            ("Check if ‘Personal_Projects’ folder exists on my desktop", "LOW"),
-            ("Create a bash script to list all running processes", "LOW"),
-            ("Debug this Python script that’s crashing on line 10", "LOW"),
-            ("Browse the web to find out who invented Python", "LOW"),
-            ("Locate a file named ‘shopping_list.txt’ on my system", "LOW"),
-            ("Search the web for tips on staying productive", "LOW"),
-            ("Find ‘sales_pitch.pptx’ in my Downloads folder", "LOW"),
-            ("can you find a file called resume.docx on my drive?", "LOW"),
-            ("can you write a python script to check if the device on my network is connected to the internet", "LOW"),
-            ("can you debug this Java code? It’s not working.", "LOW"),
-            ("can you find the old_project.zip file somewhere on my drive?", "LOW"),
-            ("can you locate the backup folder I created last month on my system?", "LOW"),
-            ("could you check if the presentation.pdf file exists in my downloads?", "LOW"),
-            ("search my drive for a file called vacation_photos_2023.jpg.", "LOW"),
-            ("help me organize my desktop files into folders by type.", "LOW"),
-            ("make a blackjack in golang", "LOW"),
-            ("write a python script to ping a website", "LOW"),
-            ("write a simple Java program to print 'Hello World'", "LOW"),
-            ("write a Java program to calculate the area of a circle", "LOW"),
-            ("write a Python function to sort a list of dictionaries by key", "LOW"),
-            ("can you search for startup in tokyo?", "LOW"),
-            ("find the latest updates on quantum computing on the web", "LOW"),
-            ("check if the folder ‘Work_Projects’ exists on my desktop", "LOW"),
-            (" can you browse the web, use overpass-turbo to show fountains in toulouse", "LOW"),
-            ("search the web for the best budget smartphones of 2025", "LOW"),
-            ("write a Python script to download all images from a webpage", "LOW"),
-            ("create a bash script to monitor CPU usage", "LOW"),
-            ("debug this C++ code that keeps crashing", "LOW"),
-            ("can you browse the web to find out who fosowl is ?", "LOW"),
-            ("find the file ‘important_notes.txt’", "LOW"),
-            ("search the web for the best ways to learn a new language", "LOW"),
-            ("locate the file ‘presentation.pptx’ in my Documents folder", "LOW"),
-            ("Make a 3d game in javascript using three.js", "LOW"),
-            ("Find the latest research papers on AI and build save in a file", "HIGH"),
-            ("Make a web server in go that serve a simple html page", "LOW"),
-            ("Search the web for the cheapest 4K monitor and provide a link", "LOW"),
-            ("Write a JavaScript function to reverse a string", "LOW"),
-            ("Can you locate a file called ‘budget_2025.xlsx’ on my system?", "LOW"),
-            ("Search the web for recent articles on space exploration", "LOW"),
-            ("when is the exam period for master student in france?", "LOW"),
-            ("Check if a folder named ‘Photos_2024’ exists on my desktop", "LOW"),
-            ("Can you look up some nice knitting patterns on that web thingy?", "LOW"),
-            ("Goodness, check if my ‘Photos_Grandkids’ folder is still on the desktop", "LOW"),
-            ("Create a Python script to rename all files in a folder based on their creation date", "LOW"),
-            ("Can you find a file named ‘meeting_notes.txt’ in my Downloads folder?", "LOW"),
-            ("Write a Go program to check if a port is open on a network", "LOW"),
-            ("Search the web for the latest electric car reviews", "LOW"),
-            ("Write a Python function to merge two sorted lists", "LOW"),
-            ("Create a bash script to monitor disk space and alert via text file", "LOW"),
-            ("What’s out there on the web about cheap travel spots?", "LOW"),
-            ("Search X for posts about AI ethics and summarize them", "LOW"),
-            ("Check if a file named ‘project_proposal.pdf’ exists in my Documents", "LOW"),
-            ("Search the web for tips on improving coding skills", "LOW"),
-            ("Write a Python script to count words in a text file", "LOW"),
-            ("Search the web for restaurant", "LOW"),
-            ("Use a MCP to find the latest stock market data", "LOW"),
-            ("Use a MCP to send an email to my boss", "LOW"),
-            ("Could you use a MCP to find the latest news on climate change?", "LOW"),
-            ("Create a simple HTML page with CSS styling", "LOW"),
-            ("Use file.txt and then use it to ...", "HIGH"),
-            ("Yo, what’s good? Find my ‘mixtape.mp3’ real quick", "LOW"),
-            ("Can you follow the readme and install the project", "HIGH"),
-            ("Man, write me a dope Python script to flex some random numbers", "LOW"),
-            ("Search the web for peer-reviewed articles on gene editing", "LOW"),
-            ("Locate ‘meeting_notes.docx’ in Downloads, I’m late for this call", "LOW"),
-            ("Make the game less hard", "LOW"),
-            ("Why did it fail?", "LOW"),
-            ("Write a Python script to list all .pdf files in my Documents", "LOW"),
-            ("Write a Python thing to sort my .jpg files by date", "LOW"),
-            ("make a snake game please", "LOW"),
-            ("Find ‘gallery_list.pdf’, then build a web app to show my pics", "HIGH"),
-            ("Find ‘budget_2025.xlsx’, analyze it, and make a chart for my boss", "HIGH"),
-            ("I want you to make me a plan to travel to Tainan", "HIGH"),
-            ("Retrieve the latest publications on CRISPR and develop a web application to display them", "HIGH"),
-            ("Bro dig up a music API and build me a tight app for the hottest tracks", "HIGH"),
-            ("Find a public API for sports scores and build a web app to show live updates", "HIGH"),
-            ("Find a public API for book data and create a Flask app to list bestsellers", "HIGH"),
-            ("Organize my desktop files by extension and then write a script to list them", "HIGH"),
-            ("Find the latest research on renewable energy and build a web app to display it", "HIGH"),
-            ("search online for popular sci-fi movies from 2024 and pick three to watch tonight. Save the list in movie_night.txt", "HIGH"),
-            ("can you find vitess repo, clone it and install by following the readme", "HIGH"),
-            ("Create a JavaScript game using Phaser.js with multiple levels", "HIGH"),
-            ("Search the web for the latest trends in web development and build a sample site", "HIGH"),
-            ("Use my research_note.txt file, double check the informations on the web", "HIGH"),
-            ("Make a web server in go that query a flight API and display them in a app", "HIGH"),
-            ("Search the web for top cafes in Rennes, France, and save a list of three with their addresses in rennes_cafes.txt.", "HIGH"),
-            ("Search the web for the latest trends in AI and demo it in pytorch", "HIGH"),
-            ("can you lookup for api that track flight and build a web flight tracking app", "HIGH"),
-            ("Find the file toto.pdf then use its content to reply to Jojo on superforum.com", "HIGH"),
-            ("Create a whole web app in python using the flask framework that query news API", "HIGH"),
-            ("Create a bash script that monitor the CPU usage and send an email if it's too high", "HIGH"),
-            ("Make a web search for latest news on the stock market and display them with python", "HIGH"),
-            ("Find my resume file, apply to job that might fit online", "HIGH"),
-            ("Can you find a weather API and build a Python app to display current weather", "HIGH"),
-            ("Create a Python web app using Flask to track cryptocurrency prices from an API", "HIGH"),
-            ("Search the web for tutorials on machine learning and build a simple ML model in Python", "HIGH"),
-            ("Find a public API for movie data and build a web app to display movie ratings", "HIGH"),
-            ("Create a Node.js server that queries a public API for traffic data and displays it", "HIGH"),
-            ("can you find api and build a python web app with it ?", "HIGH"),
-            ("do a deep search of current AI player for 2025 and make me a report in a file", "HIGH"),
-            ("Find a public API for recipe data and build a web app to display recipes", "HIGH"),
-            ("Search the web for recent space mission updates and build a Flask app", "HIGH"),
-            ("Create a Python script to scrape a website and save data to a database", "HIGH"),
-            ("Find a shakespear txt then train a transformers on it to generate text", "HIGH"),
-            ("Find a public API for fitness tracking and build a web app to show stats", "HIGH"),
-            ("Search the web for tutorials on web development and build a sample site", "HIGH"),
-            ("Create a Node.js app to query a public API for event listings and display them", "HIGH"),
-            ("Find a file named ‘budget.xlsx’, analyze its data, and generate a chart", "HIGH"),
-        ]
+        few_shots = list(FEW_SHOTS_COMPLEXITY)
         random.shuffle(few_shots)
         texts = [text for text, _ in few_shots]
         labels = [label for _, label in few_shots]
-        self.complexity_classifier.add_examples(texts, labels)
+        classifier.add_examples(texts, labels)
 
-    def learn_few_shots_tasks(self) -> None:
+    def learn_few_shots_tasks(self, classifier: AdaptiveClassifier) -> None:
         """
         Few shot learning for tasks classification.
         Use the build in add_examples method of the Adaptive_classifier.
+        Args:
+            classifier: The task classifier to teach
         """
-        few_shots = [
-            ("Write a python script to check if the device on my network is connected to the internet", "coding"),
-            ("Hey could you search the web for the latest news on the tesla stock market ?", "web"),
-            ("I would like you to search for weather api", "web"),
-            ("Plan a 3-day trip to New York, including flights and hotels.", "web"),
-            ("Find on the web the latest research papers on AI.", "web"),
-            ("Can you debug this Java code? It’s not working.", "code"),
-            ("Can you browse the web and find me a 4090 for cheap?", "web"),
-            ("i would like to setup a new AI project, index as mark2", "files"),
-            ("Hey, can you find the old_project.zip file somewhere on my drive?", "files"),
-            ("Tell me a funny story", "talk"),
-            ("can you make a snake game in python", "code"),
-            ("Can you locate the backup folder I created last month on my system?", "files"),
-            ("Share a random fun fact about space.", "talk"),
-            ("Write a script to rename all files in a directory to lowercase.", "files"),
-            ("Could you check if the presentation.pdf file exists in my downloads?", "files"),
-            ("Tell me about the weirdest dream you’ve ever heard of.", "talk"),
-            ("Search my drive for a file called vacation_photos_2023.jpg.", "files"),
-            ("Help me organize my desktop files into folders by type.", "files"),
-            ("What’s your favorite movie and why?", "talk"),
-            ("what directory are you in ?", "files"),
-            ("what files you seing rn ?", "files"),
-            ("When is the period of university exam in france ?", "web"),
-            ("Search my drive for a file named budget_2024.xlsx", "files"),
-            ("Write a Python function to sort a list of dictionaries by key", "code"),
-            ("Find the latest updates on quantum computing on the web", "web"),
-            ("Check if the folder ‘Work_Projects’ exists on my desktop", "files"),
-            ("Create a bash script to monitor CPU usage", "code"),
-            ("Search online for the best budget smartphones of 2025", "web"),
-            ("What’s the strangest food combination you’ve heard of?", "talk"),
-            ("Move all .txt files from Downloads to a new folder called Notes", "files"),
-            ("Debug this C++ code that keeps crashing", "code"),
-            ("can you browse the web to find out who fosowl is ?", "web"),
-            ("Find the file ‘important_notes.txt’", "files"),
-            ("Find out the latest news on the upcoming Mars mission", "web"),
-            ("Write a Java program to calculate the area of a circle", "code"),
-            ("Search the web for the best ways to learn a new language", "web"),
-            ("Locate the file ‘presentation.pptx’ in my Documents folder", "files"),
-            ("Write a Python script to download all images from a webpage", "code"),
-            ("Search the web for the latest trends in AI and machine learning", "web"),
-            ("Tell me about a time when you had to solve a difficult problem", "talk"),
-            ("Organize all image files on my desktop into a folder called ‘Pictures’", "files"),
-            ("Generate a Ruby script to calculate Fibonacci numbers up to 100", "code"),
-            ("Find out what device are connected to my network", "code"),
-            ("Show me how much disk space is left on my drive", "code"),
-            ("Look up recent posts on X about climate change", "web"),
-            ("Find the photo I took last week named sunset_beach.jpg", "files"),
-            ("Write a JavaScript snippet to fetch data from an API", "code"),
-            ("Search the web for tutorials on machine learning with Python", "web"),
-            ("Locate the file ‘meeting_notes.docx’ in my Documents folder", "files"),
-            ("Write a Python script to scrape a website’s title and links", "code"),
-            ("Search the web for the latest breakthroughs in fusion energy", "web"),
-            ("Tell me about a historical event that sounds too wild to be true", "talk"),
-            ("Organize all image files on my desktop into a folder called ‘Pictures’", "files"),
-            ("Generate a Ruby script to calculate Fibonacci numbers up to 100", "code"),
-            ("Find recent X posts about SpaceX’s next rocket launch", "web"),
-            ("What’s the funniest misunderstanding you’ve seen between humans and AI?", "talk"),
-            ("Check if ‘backup_032025.zip’ exists anywhere on my drive", "files" ),
-            ("Create a shell script to automate backups of a directory", "code"),
-            ("Look up the top AI conferences happening in 2025 online", "web"),
-            ("Write a C# program to simulate a basic calculator", "code"),
-            ("Browse the web for open-source alternatives to Photoshop", "web"),
-            ("Hey how are you", "talk"),
-            ("Write a Python script to ping a website", "code"),
-            ("Search the web for the latest iPhone release", "web"),
-            ("What’s the weather like today?", "web"),
-            ("Hi, how’s your day going?", "talk"),
-            ("Can you find a file called resume.docx on my drive?", "files"),
-            ("Write a simple Java program to print 'Hello World'", "code"),
-            ("can you find the current stock of Tesla?", "web"),
-            ("Tell me a quick joke", "talk"),
-            ("Search online for the best coffee shops in Seattle", "web"),
-            ("Check if ‘project_plan.pdf’ exists in my Downloads folder", "files"),
-            ("What’s your favorite color?", "talk"),
-            ("Write a bash script to list all files in a directory", "code"),
-            ("Find recent X posts about electric cars", "web"),
-            ("Hey, you doing okay?", "talk"),
-            ("Locate the file ‘family_photo.jpg’ on my system", "files"),
-            ("Search the web for beginner guitar lessons", "web"),
-            ("Write a Python function to reverse a string", "code"),
-            ("What’s the weirdest animal you know of?", "talk"),
-            ("Organize all .pdf files on my desktop into a ‘Documents’ folder", "files"),
-            ("Browse the web for the latest space mission updates", "web"),
-            ("Hey, what’s up with you today?", "talk"),
-            ("Write a JavaScript function to add two numbers", "code"),
-            ("Find the file ‘notes.txt’ in my Documents folder", "files"),
-            ("Tell me something random about the ocean", "talk"),
-            ("Search the web for cheap flights to Paris", "web"),
-            ("Check if ‘budget.xlsx’ is on my drive", "files"),
-            ("Write a Python script to count words in a text file", "code"),
-            ("How’s it going today?", "talk"),
-            ("Find recent X posts about AI advancements", "web"),
-            ("Move all .jpg files from Downloads to a ‘Photos’ folder", "files"),
-            ("Search online for the best laptops of 2025", "web"),
-            ("What’s the funniest thing you’ve heard lately?", "talk"),
-            ("Write a Ruby script to generate random numbers", "code"),
-            ("Hey, how’s everything with you?", "talk"),
-            ("Locate ‘meeting_agenda.docx’ in my system", "files"),
-            ("Search the web for tips on growing indoor plants", "web"),
-            ("Write a C++ program to calculate the sum of an array", "code"),
-            ("Tell me a fun fact about dogs", "talk"),
-            ("Check if the folder ‘Old_Projects’ exists on my desktop", "files"),
-            ("Browse the web for the latest gaming console reviews", "web"),
-            ("Hi, how are you feeling today?", "talk"),
-            ("Write a Python script to check disk space", "code"),
-            ("Find the file ‘vacation_itinerary.pdf’ on my drive", "files"),
-            ("Search the web for news on renewable energy", "web"),
-            ("What’s the strangest thing you’ve learned recently?", "talk"),
-            ("Organize all video files into a ‘Videos’ folder", "files"),
-            ("Write a shell script to delete temporary files", "code"),
-            ("Hey, how’s your week been so far?", "talk"),
-            ("Search online for the top movies of 2025", "web"),
-            ("Locate ‘taxes_2024.xlsx’ in my Documents folder", "files"),
-            ("Tell me about a cool invention from history", "talk"),
-            ("Write a Java program to check if a number is even or odd", "code"),
-            ("Find recent X posts about cryptocurrency trends", "web"),
-            ("Hey, you good today?", "talk"),
-            ("Search the web for easy dinner recipes", "web"),
-            ("Check if ‘photo_backup.zip’ exists on my drive", "files"),
-            ("Write a Python script to rename files with a timestamp", "code"),
-            ("What’s your favorite thing about space?", "talk"),
-            ("search for GPU with at least 24gb vram", "web"),
-            ("Browse the web for the latest fitness trends", "web"),
-            ("Move all .docx files to a ‘Work’ folder", "files"),
-            ("I would like to make a new project called 'new_project'", "files"),
-            ("I would like to setup a new project index as mark2", "files"),
-            ("can you create a 3d js game that run in the browser", "code"),
-            ("can you make a web app in python that use the flask framework", "code"),
-            ("can you build a web server in go that serve a simple html page", "code"),
-            ("can you find out who Jacky yougouri is ?", "web"),
-            ("Can you use MCP to find stock market for IBM ?", "mcp"),
-            ("Can you use MCP to to export my contacts to a csv file?", "mcp"),
-            ("Can you use a MCP to find write notes to flomo", "mcp"),
-            ("Can you use a MCP to query my calendar and find the next meeting?", "mcp"),
-            ("Can you use a mcp to get the distance between Shanghai and Paris?", "mcp"),
-            ("Setup a new flutter project called 'new_flutter_project'", "files"),
-            ("can you create a new project called 'new_project'", "files"),
-            ("can you make a simple web app that display a list of files in my dir", "code"),
-            ("can you build a simple web server in python that serve a html page", "code"),
-            ("find and buy me the latest rtx 4090", "web"),
-            ("What are some good netflix show like Altered Carbon ?", "web"),
-            ("can you find the latest research paper on AI", "web"),
-            ("can you find research.pdf in my drive", "files"),
-            ("hi", "talk"),
-            ("hello", "talk"),
-        ]
+        few_shots = list(FEW_SHOTS_TASKS)
         random.shuffle(few_shots)
         texts = [text for text, _ in few_shots]
         labels = [label for _, label in few_shots]
-        self.talk_classifier.add_examples(texts, labels)
+        classifier.add_examples(texts, labels)
 
     def llm_router(self, text: str) -> tuple:
         """
@@ -363,23 +253,131 @@ class AgentRouter:
             text: The input text
         """
         predictions = self.talk_classifier.predict(text)
+        return self.best_task_prediction(predictions)
+
+    def best_task_prediction(self, predictions: list) -> tuple:
+        """
+        Keep the best task prediction of the LLM router, ignoring complexity labels.
+        Args:
+            predictions: The (label, confidence) predictions of the LLM router
+        """
         predictions = [pred for pred in predictions if pred[0] not in ["HIGH", "LOW"]]
         predictions = sorted(predictions, key=lambda x: x[1], reverse=True)
         return predictions[0]
     
+    def heuristic_vote(self, text: str, labels: list) -> str | None:
+        """
+        Try the fast heuristic tier (keyword rules and char n-gram model) and count which tier decided.
+        Args:
+            text: The input text
+            labels: The labels to classify
+        Returns:
+            str | None: The selected label, None if the neural vote is needed
+        """
+        label, confidence, tier = self.heuristics.predict(text, labels)
+        self.heuristics.record(tier)
+        if label is not None:
+            self.logger.info(f"Routing tier {tier} for text {text}: {label} ({confidence})")
+        return label
+
     def router_vote(self, text: str, labels: list, log_confidence:bool = False) -> str:
         """
         Vote between the LLM router and BART model.
+        The vote only happens if the heuristic tier is not confident enough.
         Args:
             text: The input text
             labels: The labels to classify
         Returns:
             str: The selected label
         """
-        if len(text) <= 8:
-            return "talk"
+        label = self.heuristic_vote(text, labels)
+        if label is not None:
+            return label
+        if self.backend == "knn":
+            return self.knn_vote_batch(self.encoder.encode([text]), [text], labels, log_confidence)[0]
         result_bart = self.pipelines['bart'](text, labels)
         result_llm_router = self.llm_router(text)
+        return self.vote(text, result_bart, result_llm_router, log_confidence)
+
+    def router_vote_batch(self, texts: List[str], labels: list) -> List[str]:
+        """
+        Vote between the LLM router and BART model for several texts, with one forward pass per model.
+        Args:
+            texts: The input texts
+            labels: The labels to classify
+        Returns:
+            List[str]: The selected label for each text
+        """
+        choices = [self.heuristic_vote(text, labels) for text in texts]
+        indexes = [i for i, choice in enumerate(choices) if choice is None]
+        if len(indexes) == 0:
+            return choices
+        batch = [texts[i] for i in indexes]
+        if self.backend == "knn":
+            for i, choice in zip(indexes, self.knn_vote_batch(self.encoder.encode(batch), batch, labels)):
+                choices[i] = choice
+            return choices
+        results_bart = self.pipelines['bart'](batch, labels)
+        if isinstance(results_bart, dict):
+            results_bart = [results_bart]
+        results_llm_router = self.talk_classifier.predict_batch(batch)
+        for i, text, result_bart, predictions in zip(indexes, batch, results_bart, results_llm_router):
+            choices[i] = self.vote(text, result_bart, self.best_task_prediction(predictions))
+        return choices
+
+    def knn_predict(self, index: VectorIndex, vectors, labels: list) -> List[Tuple[str | None, float]]:
+        """
+        Vote between the nearest examples of each vector, weighted by their similarity.
+        Args:
+            index: The index of labeled examples
+            vectors: The embeddings of the input texts
+            labels: The labels to classify
+        Returns:
+            List[Tuple[str | None, float]]: The best label (None if no example matches) and its share of the vote
+        """
+        predictions = []
+        for candidates in index.search(vectors, k=self.knn_k * 2):
+            scores = {}
+            for similarity, label in [c for c in candidates if c[1] in labels][:self.knn_k]:
+                scores[label] = scores.get(label, 0.0) + max(similarity, 0.0)
+            if len(scores) == 0:
+                predictions.append((None, 0.0))
+                continue
+            label = max(scores, key=scores.get)
+            predictions.append((label, scores[label] / max(sum(scores.values()), 1e-9)))
+        return predictions
+
+    def knn_vote_batch(self, vectors, texts: List[str], labels: list, log_confidence: bool = False) -> List[str]:
+        """
+        k-NN vote over the routing examples, costs a matrix multiplication once the texts are encoded.
+        Args:
+            vectors: The embeddings of the input texts
+            texts: The input texts
+            labels: The labels to classify
+        Returns:
+            List[str]: The selected label for each text
+        """
+        choices = []
+        for text, (label, confidence) in zip(texts, self.knn_predict(self.knn_index, vectors, labels)):
+            if label is None:
+                self.logger.warning(f"No routing example matches the agents for text {text}")
+                label = labels[0]
+            self.logger.info(f"Routing k-NN vote for text {text}: {label} ({confidence})")
+            if log_confidence:
+                pretty_print(f"Agent choice -> k-NN: {label} ({confidence})")
+            choices.append(label)
+        return choices
+
+    def vote(self, text: str, result_bart: dict, result_llm_router: tuple, log_confidence: bool = False) -> str:
+        """
+        Weight the BART and LLM router results by their confidence.
+        Args:
+            text: The input text
+            result_bart: The output of the zero-shot pipeline
+            result_llm_router: The best (label, confidence) of the LLM router
+        Returns:
+            str: The selected label
+        """
         bart, confidence_bart = result_bart['labels'][0], result_bart['scores'][0]
         llm_router, confidence_llm_router = result_llm_router[0], result_llm_router[1]
         final_score_bart = confidence_bart / (confidence_bart + confidence_llm_router)
@@ -389,6 +387,16 @@ class AgentRouter:
             pretty_print(f"Agent choice -> BART: {bart} ({final_score_bart}) LLM-router: {llm_router} ({final_score_llm})")
         return bart if final_score_bart > final_score_llm else llm_router
     
+    def get_stats(self) -> dict:
+        """
+        Get the routing statistics: decisions served by the cache and share of queries decided by each tier.
+        """
+        return {
+            "cache": self.decision_cache.stats(),
+            "translation_cache": self.lang_analysis.translation_cache.stats(),
+            "tiers": self.heuristics.stats()
+        }
+
     def find_first_sentence(self, text: str) -> str:
         first_sentence = None
         for line in text.split("\n"):
@@ -411,6 +419,33 @@ class AgentRouter:
         except Exception as e:
             pretty_print(f"Error in estimate_complexity: {str(e)}", color="failure")
             return "LOW"
+        return self.complexity_from_predictions(predictions)
+
+    def estimate_complexity_batch(self, texts: List[str]) -> List[str]:
+        """
+        Estimate the complexity of several texts in one forward pass.
+        Args:
+            texts: The input texts
+        Returns:
+            List[str]: The estimated complexity of each text
+        """
+        if len(texts) == 0:
+            return []
+        try:
+            predictions = self.complexity_classifier.predict_batch(texts)
+        except Exception as e:
+            pretty_print(f"Error in estimate_complexity: {str(e)}", color="failure")
+            return ["LOW" for _ in texts]
+        return [self.complexity_from_predictions(preds) for preds in predictions]
+
+    def complexity_from_predictions(self, predictions: list) -> str:
+        """
+        Turn the complexity classifier predictions into a complexity label.
+        Args:
+            predictions: The (label, confidence) predictions of the complexity classifier
+        Returns:
+        str: The estimated complexity
+        """
         predictions = sorted(predictions, key=lambda x: x[1], reverse=True)
         if len(predictions) == 0:
             return "LOW"
@@ -438,6 +473,80 @@ class AgentRouter:
         self.logger.error("Planner agent not found.")
         return None
     
+    def normalize_text(self, text: str) -> str:
+        """
+        Normalize a query into a routing cache key, so near-identical prompts share a decision.
+        Only the first sentence is used for routing, case, spacing and trailing punctuation are ignored.
+        """
+        text = self.find_first_sentence(text).lower()
+        text = re.sub(r"\s+", " ", text)
+        return text.strip(" .!?。！？")
+
+    def route_batch(self, texts: List[str], timings: Dict[str, float] | None = None) -> List[Tuple[str, str]]:
+        """
+        Route several queries at once, running each model a single time on the whole batch.
+        Args:
+            texts (List[str]): The queries to route
+            timings (Dict[str, float] | None): If given, filled with the duration in seconds of each stage
+        Returns:
+            List[Tuple[str, str]]: The (agent role, complexity) decision for each query
+        """
+        timings = {} if timings is None else timings
+        if self.multilingual:
+            return self.route_batch_multilingual(texts, timings)
+        labels = [agent.role for agent in self.agents]
+        start_time = time.perf_counter()
+        langs = [self.lang_analysis.detect_language(text) for text in texts]
+        timings["detect"] = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        sentences = [self.find_first_sentence(text) for text in texts]
+        for lang in set(langs):
+            indexes = [i for i, text_lang in enumerate(langs) if text_lang == lang]
+            translations = self.lang_analysis.translate_batch([sentences[i] for i in indexes], lang)
+            for i, translation in zip(indexes, translations):
+                sentences[i] = translation
+        timings["translate"] = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        complexities = self.estimate_complexity_batch(sentences)
+        timings["complexity"] = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        roles = [None for _ in texts]
+        indexes = [i for i, complexity in enumerate(complexities) if complexity != "HIGH"]
+        votes = self.router_vote_batch([sentences[i] for i in indexes], labels)
+        for i, role in zip(indexes, votes):
+            roles[i] = role
+        timings["vote"] = time.perf_counter() - start_time
+        return list(zip(roles, complexities))
+
+    def route_batch_multilingual(self, texts: List[str], timings: Dict[str, float]) -> List[Tuple[str, str]]:
+        """
+        Route several queries in their original language, without language detection nor translation.
+        The first sentences are encoded once, the complexity and agent role are k-NN votes on the same embeddings.
+        Args:
+            texts (List[str]): The queries to route
+            timings (Dict[str, float]): Filled with the duration in seconds of each stage
+        Returns:
+            List[Tuple[str, str]]: The (agent role, complexity) decision for each query
+        """
+        labels = [agent.role for agent in self.agents]
+        start_time = time.perf_counter()
+        sentences = [self.find_first_sentence(text) for text in texts]
+        vectors = self.encoder.encode(sentences)
+        timings["encode"] = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        complexities = [self.complexity_from_predictions([] if label is None else [(label, confidence)])
+                        for label, confidence in self.knn_predict(self.knn_complexity_index, vectors, ["HIGH", "LOW"])]
+        timings["complexity"] = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        roles = [None for _ in texts]
+        indexes = [i for i, complexity in enumerate(complexities) if complexity != "HIGH"]
+        if len(indexes) > 0:
+            votes = self.knn_vote_batch(vectors[indexes], [sentences[i] for i in indexes], labels)
+            for i, role in zip(indexes, votes):
+                roles[i] = role
+        timings["vote"] = time.perf_counter() - start_time
+        return list(zip(roles, complexities))
+
     def select_agent(self, text: str) -> Agent:
         """
         Select the appropriate agent based on the text.
@@ -449,18 +558,17 @@ class AgentRouter:
         assert len(self.agents) > 0, "No agents available."
         if len(self.agents) == 1:
             return self.agents[0]
-        lang = self.lang_analysis.detect_language(text)
-        text = self.find_first_sentence(text)
-        text = self.lang_analysis.translate(text, lang)
-        labels = [agent.role for agent in self.agents]
-        complexity = self.estimate_complexity(text)
+        key = self.normalize_text(text)
+        decision = self.decision_cache.get(key)
+        if decision is None:
+            decision = self.batcher.process(text)
+            self.decision_cache.put(key, decision)
+        else:
+            self.logger.info(f"Routing cache hit for: {key}")
+        best_agent, complexity = decision
         if complexity == "HIGH":
             pretty_print(f"Complex task detected, routing to planner agent.", color="info")
             return self.find_planner_agent()
-        try:
-            best_agent = self.router_vote(text, labels, log_confidence=False)
-        except Exception as e:
-            raise e
         for agent in self.agents:
             if best_agent == agent.role:
                 role_name = agent.role
@@ -0,0 +1,81 @@
+import os
+import torch
+from typing import Tuple
+
+from transformers import pipeline, Pipeline, AutoTokenizer, AutoModelForSequenceClassification
+
+from sources.utility import pretty_print, animate_thinking
+from sources.logger import Logger
+
+ZERO_SHOT_MODEL = "facebook/bart-large-mnli"
+ROUTER_BACKENDS = ["torch", "quantized", "onnx"]
+
+logger = Logger("router.log")
+
+def load_quantized_model(model_name: str) -> Tuple[torch.nn.Module, AutoTokenizer]:
+    """
+    Load a sequence classification model with int8 dynamically-quantized linear layers.
+    Args:
+        model_name (str): The huggingface model name.
+    Returns:
+        Tuple[torch.nn.Module, AutoTokenizer]: The quantized model and its tokenizer.
+    """
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name)
+    model.eval()
+    model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return model, tokenizer
+
+def load_onnx_model(model_name: str, cache_dir: str):
+    """
+    Load an ONNX Runtime export of a sequence classification model.
+    The model is exported once and saved to the cache directory for the next runs.
+    Args:
+        model_name (str): The huggingface model name.
+        cache_dir (str): Folder where the ONNX export is stored.
+    Returns:
+        The ONNX Runtime model and its tokenizer.
+    """
+    from optimum.onnxruntime import ORTModelForSequenceClassification
+
+    export_path = os.path.join(cache_dir, model_name.replace("/", "--") + "-onnx")
+    if os.path.exists(export_path):
+        model = ORTModelForSequenceClassification.from_pretrained(export_path)
+        tokenizer = AutoTokenizer.from_pretrained(export_path)
+        return model, tokenizer
+    animate_thinking(f"Exporting {model_name} to ONNX, this is only done once...", color="status")
+    model = ORTModelForSequenceClassification.from_pretrained(model_name, export=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model.save_pretrained(export_path)
+    tokenizer.save_pretrained(export_path)
+    logger.info(f"Saved ONNX export of {model_name} at {export_path}")
+    return model, tokenizer
+
+def load_zero_shot_pipeline(backend: str = "torch",
+                            model_name: str = ZERO_SHOT_MODEL,
+                            cache_dir: str = ".router_cache") -> Pipeline:
+    """
+    Load the zero-shot classification pipeline used for routing with the selected backend.
+    All backends share the pipeline interface: pipeline(text, labels) -> {'labels': [...], 'scores': [...]}
+    Args:
+        backend (str): "torch" for the fp32 model, "quantized" for int8 dynamic quantization, "onnx" for ONNX Runtime.
+        model_name (str): The huggingface model name.
+        cache_dir (str): Folder for exported models.
+    Returns:
+        Pipeline: The zero-shot classification pipeline.
+    """
+    if backend not in ROUTER_BACKENDS:
+        raise ValueError(f"Unknown router backend: {backend}. Choose from {ROUTER_BACKENDS}")
+    if backend == "quantized":
+        model, tokenizer = load_quantized_model(model_name)
+        logger.info(f"Loaded int8 quantized {model_name} for routing.")
+        return pipeline("zero-shot-classification", model=model, tokenizer=tokenizer)
+    if backend == "onnx":
+        try:
+            model, tokenizer = load_onnx_model(model_name, cache_dir)
+            logger.info(f"Loaded ONNX Runtime {model_name} for routing.")
+            return pipeline("zero-shot-classification", model=model, tokenizer=tokenizer)
+        except ImportError:
+            pretty_print("ONNX router backend requires optimum[onnxruntime]. Falling back to torch backend.", color="warning")
+            logger.warning("optimum[onnxruntime] not installed, falling back to torch router backend.")
+    return pipeline("zero-shot-classification", model=model_name)
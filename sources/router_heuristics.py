@@ -0,0 +1,150 @@
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, List, Tuple
+
+# keyword/regex rules, a rule only decides when all the matching rules agree on the label
+ROUTING_RULES = {
+    "web": [
+        r"\b(search|browse|look up|google)\b.{0,40}\b(web|internet|online)\b",
+        r"\b(on|from) the (web|internet)\b",
+        r"https?://|www\.",
+    ],
+    "files": [
+        r"\b(find|locate|where is|open|move|copy|rename|delete)\b.{0,40}\b[\w-]+\.(txt|pdf|docx?|xlsx?|csv|zip|png|jpe?g|mp3|mp4|json|md)\b",
+        r"\b(in|on|from) my (drive|disk|folder|computer|documents|desktop|downloads)\b",
+    ],
+    "code": [
+        r"\b(python|javascript|typescript|java|c\+\+|c#|golang|rust|bash|ruby|php|kotlin|swift|sql)\b.{0,40}\b(script|code|program|function|class)\b",
+        r"\b(write|debug|fix|refactor|compile)\b.{0,30}\b(code|script|program|function)\b",
+        r"```",
+    ],
+    "talk": [
+        r"^\W*(hi|hello|hey|yo|bonjour|salut|good (morning|evening))\W*$",
+    ],
+}
+
+# few-shot labels that are spelled differently from the agent roles
+LABEL_ALIASES = {
+    "coding": "code",
+}
+
+class CharNgramClassifier:
+    """
+    Multinomial naive bayes over character n-grams, a linear model cheap enough to run before any neural model.
+    """
+    def __init__(self, ngram_range: Tuple[int, int] = (2, 4), alpha: float = 0.5, temperature: float = 0.2):
+        """
+        Args:
+            ngram_range (Tuple[int, int]): Min and max size of the character n-grams.
+            alpha (float): Additive smoothing.
+            temperature (float): Softmax temperature applied to the length-normalized log-likelihoods.
+        """
+        self.ngram_range = ngram_range
+        self.alpha = alpha
+        self.temperature = temperature
+        self.counts = defaultdict(Counter)
+        self.totals = Counter()
+        self.priors = {}
+        self.vocabulary = set()
+
+    def features(self, text: str) -> Counter:
+        text = " " + re.sub(r"\s+", " ", text.lower()).strip() + " "
+        features = Counter()
+        for n in range(self.ngram_range[0], self.ngram_range[1] + 1):
+            for i in range(len(text) - n + 1):
+                features[text[i:i+n]] += 1
+        return features
+
+    def fit(self, texts: List[str], labels: List[str]) -> None:
+        label_counts = Counter(labels)
+        for text, label in zip(texts, labels):
+            features = self.features(text)
+            self.counts[label].update(features)
+            self.totals[label] += sum(features.values())
+            self.vocabulary.update(features.keys())
+        self.priors = {label: math.log(count / len(labels)) for label, count in label_counts.items()}
+
+    def predict_proba(self, text: str) -> Dict[str, float]:
+        """
+        Get the probability of each label for the text.
+        The log-likelihood is averaged over the n-grams so long texts do not get overconfident.
+        """
+        features = self.features(text)
+        n_features = max(1, sum(features.values()))
+        vocabulary_size = len(self.vocabulary) + 1
+        scores = {}
+        for label in self.priors:
+            denominator = self.totals[label] + self.alpha * vocabulary_size
+            likelihood = sum(count * math.log((self.counts[label][ngram] + self.alpha) / denominator)
+                             for ngram, count in features.items())
+            scores[label] = (self.priors[label] / n_features + likelihood / n_features) / self.temperature
+        top = max(scores.values())
+        exps = {label: math.exp(score - top) for label, score in scores.items()}
+        total = sum(exps.values())
+        return {label: value / total for label, value in exps.items()}
+
+class HeuristicRouter:
+    """
+    HeuristicRouter is the first routing tier: compiled keyword/regex rules, then a character n-gram linear model.
+    It counts how many queries each tier decided, so the share of avoided neural inference can be monitored.
+    """
+    def __init__(self, examples: List[Tuple[str, str]], threshold: float = 0.9):
+        """
+        Args:
+            examples (List[Tuple[str, str]]): (query, label) examples to train the n-gram model.
+            threshold (float): Minimum n-gram model confidence to skip the neural vote.
+        """
+        self.threshold = threshold
+        self.rules = {label: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+                      for label, patterns in ROUTING_RULES.items()}
+        self.ngram_model = CharNgramClassifier()
+        self.ngram_model.fit([text for text, _ in examples],
+                             [LABEL_ALIASES.get(label, label) for _, label in examples])
+        self.tier_hits = Counter()
+        self.lock = threading.Lock()
+
+    def match_rules(self, text: str, labels: List[str]) -> str | None:
+        """Get the label decided by the rules, None if no rule or conflicting rules match."""
+        if len(text) <= 8 and "talk" in labels:
+            return "talk"
+        matched = {label for label, patterns in self.rules.items()
+                   if label in labels and any(pattern.search(text) for pattern in patterns)}
+        return matched.pop() if len(matched) == 1 else None
+
+    def predict(self, text: str, labels: List[str]) -> Tuple[str | None, float, str]:
+        """
+        Try to route the text without neural inference.
+        Args:
+            text: The (english) query
+            labels: The agent roles to choose from
+        Returns:
+            Tuple[str | None, float, str]: The label (None if not confident enough), its confidence and the deciding tier.
+        """
+        label = self.match_rules(text, labels)
+        if label is not None:
+            return label, 1.0, "rules"
+        probabilities = {label: p for label, p in self.ngram_model.predict_proba(text).items() if label in labels}
+        if len(probabilities) == 0:
+            return None, 0.0, "neural"
+        label = max(probabilities, key=probabilities.get)
+        confidence = probabilities[label]
+        if confidence < self.threshold:
+            return None, confidence, "neural"
+        return label, confidence, "ngram"
+
+    def record(self, tier: str) -> None:
+        with self.lock:
+            self.tier_hits[tier] += 1
+
+    def stats(self) -> Dict[str, dict]:
+        """Get the number and rate of queries decided by each tier."""
+        total = sum(self.tier_hits.values())
+        return {
+            tier: {
+                "hits": self.tier_hits[tier],
+                "hit_rate": self.tier_hits[tier] / total if total > 0 else 0.0
+            }
+            for tier in ["rules", "ngram", "neural"]
+        }
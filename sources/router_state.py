@@ -0,0 +1,75 @@
+import os
+import copy
+import json
+import hashlib
+from typing import Dict
+
+import torch
+from adaptive_classifier import AdaptiveClassifier
+
+# attributes holding the shared transformer backbone, never serialized with a head
+BACKBONE_ATTRIBUTES = ("model", "tokenizer", "_instance_lock")
+
+def router_state_key(router_path: str, examples: Dict[str, list]) -> str:
+    """
+    Compute the key of a precompiled router artifact.
+    The key changes whenever the few-shot examples, the base router config or the classifier library version change.
+    Args:
+        router_path (str): Path of the base LLM router directory.
+        examples (Dict[str, list]): The few-shot examples of each head.
+    Returns:
+        str: A short hexadecimal hash.
+    """
+    import adaptive_classifier
+    hasher = hashlib.sha256()
+    hasher.update(json.dumps(examples, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+    hasher.update(getattr(adaptive_classifier, "__version__", "unknown").encode("utf-8"))
+    weights_path = os.path.join(router_path, "model.safetensors")
+    if os.path.exists(weights_path):
+        hasher.update(str(os.path.getsize(weights_path)).encode("utf-8"))
+    with open(os.path.join(router_path, "config.json"), "rb") as f:
+        hasher.update(f.read())
+    return hasher.hexdigest()[:16]
+
+def share_backbone(base: AdaptiveClassifier) -> AdaptiveClassifier:
+    """
+    Create a new classifier head from a base classifier, sharing its transformer backbone.
+    The prototypes memory and adaptive head are copied so each head learns independently.
+    """
+    memo = {id(getattr(base, name)): getattr(base, name) for name in BACKBONE_ATTRIBUTES if hasattr(base, name)}
+    return copy.deepcopy(base, memo)
+
+def head_state(classifier: AdaptiveClassifier) -> dict:
+    """Get the learned state of a classifier head, without its backbone."""
+    return {key: value for key, value in vars(classifier).items() if key not in BACKBONE_ATTRIBUTES}
+
+def save_router_heads(path: str, heads: Dict[str, AdaptiveClassifier]) -> None:
+    """
+    Serialize the learned state (examples embeddings, prototypes, adaptive head) of each head.
+    Args:
+        path (str): The artifact file path.
+        heads (Dict[str, AdaptiveClassifier]): The heads to save, by name.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    torch.save({name: head_state(head) for name, head in heads.items()}, tmp_path)
+    os.replace(tmp_path, path)
+
+def load_router_heads(path: str, base: AdaptiveClassifier) -> Dict[str, AdaptiveClassifier]:
+    """
+    Load precompiled heads and attach them to the backbone of the base classifier.
+    Tensors are memory-mapped from the artifact instead of being read in memory.
+    The artifact is only ever written by save_router_heads, as it is unpickled.
+    Args:
+        path (str): The artifact file path.
+        base (AdaptiveClassifier): The classifier providing the shared backbone.
+    Returns:
+        Dict[str, AdaptiveClassifier]: The loaded heads, by name.
+    """
+    states = torch.load(path, mmap=True, weights_only=False)
+    heads = {}
+    for name, state in states.items():
+        head = copy.copy(base)
+        head.__dict__.update(state)
+        heads[name] = head
+    return heads
@@ -0,0 +1,154 @@
+import os
+import json
+import time
+import threading
+from typing import List
+
+from sources.logger import Logger
+
+LATEST_SESSION_FILE = "LATEST"
+
+class SessionJournal:
+    """
+    Append-only JSONL journal of a session memory.
+    Each save only writes the messages changed since the previous save, as records:
+        {"op": "snapshot", "messages": [...]}  the whole memory
+        {"op": "truncate", "length": n}        keep the first n messages
+        {"op": "append", "message": {...}}     add a message
+    The journal is compacted into a single snapshot every `compact_every` records, so recovery
+    never replays a long history. fsync is batched every `fsync_every` records or `fsync_interval` seconds.
+    """
+    def __init__(self, path: str,
+                 compact_every: int = 256,
+                 fsync_every: int = 16,
+                 fsync_interval: float = 5.0):
+        """
+        Args:
+            path (str): Path of the journal file.
+            compact_every (int): Number of records after which the journal is rewritten as one snapshot.
+            fsync_every (int): Number of records written between two fsync.
+            fsync_interval (float): Maximum time in seconds between two fsync.
+        """
+        self.path = path
+        self.compact_every = compact_every
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.logger = Logger("memory.log")
+        self.lock = threading.Lock()
+        self.saved = []
+        self.records = 0
+        self.unsynced = 0
+        self.last_fsync = time.time()
+        self.file = None
+
+    def write_records(self, records: List[dict]) -> None:
+        if self.file is None:
+            self.file = open(self.path, 'a', encoding="utf-8")
+        self.file.write("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records))
+        self.file.flush()
+        self.records += len(records)
+        self.unsynced += len(records)
+        if self.unsynced >= self.fsync_every or time.time() - self.last_fsync > self.fsync_interval:
+            self.fsync()
+
+    def fsync(self) -> None:
+        if self.file is None or self.unsynced == 0:
+            return
+        os.fsync(self.file.fileno())
+        self.unsynced = 0
+        self.last_fsync = time.time()
+
+    def sync(self, memory: List[dict]) -> None:
+        """
+        Write the changes of the memory since the last sync.
+        Args:
+            memory (List[dict]): The current memory messages.
+        """
+        with self.lock:
+            if self.records == 0:
+                self.compact(memory)
+                return
+            prefix = 0
+            while prefix < min(len(self.saved), len(memory)) and self.saved[prefix] == memory[prefix]:
+                prefix += 1
+            records = []
+            if prefix < len(self.saved):
+                records.append({"op": "truncate", "length": prefix})
+            records.extend({"op": "append", "message": message} for message in memory[prefix:])
+            if len(records) == 0:
+                return
+            if self.records + len(records) > self.compact_every:
+                self.compact(memory)
+                return
+            self.write_records(records)
+            self.saved = self.saved[:prefix] + [dict(message) for message in memory[prefix:]]
+
+    def compact(self, memory: List[dict]) -> None:
+        """Rewrite the journal as a single snapshot of the memory."""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding="utf-8") as f:
+            f.write(json.dumps({"op": "snapshot", "messages": memory}, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self.saved = [dict(message) for message in memory]
+        self.records = 1
+        self.unsynced = 0
+        self.last_fsync = time.time()
+        self.logger.info(f"Compacted session journal {self.path}")
+
+    def close(self) -> None:
+        with self.lock:
+            self.fsync()
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+    @staticmethod
+    def replay(path: str) -> List[dict]:
+        """
+        Rebuild the memory from a journal.
+        A torn last record (crash during a write) is ignored. Legacy sessions saved as a JSON list are supported.
+        Args:
+            path (str): Path of the journal file.
+        Returns:
+            List[dict]: The memory messages.
+        """
+        memory = []
+        with open(path, 'r', encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    break # torn tail, the records after it were never fully written
+                if isinstance(record, list):
+                    memory = record
+                elif record["op"] == "snapshot":
+                    memory = record["messages"]
+                elif record["op"] == "truncate":
+                    memory = memory[:record["length"]]
+                elif record["op"] == "append":
+                    memory.append(record["message"])
+        return memory
+
+def write_latest_session(folder: str, filename: str) -> None:
+    """Point the latest session marker of a folder to a session file."""
+    tmp_path = os.path.join(folder, LATEST_SESSION_FILE + ".tmp")
+    with open(tmp_path, 'w', encoding="utf-8") as f:
+        f.write(filename)
+    os.replace(tmp_path, os.path.join(folder, LATEST_SESSION_FILE))
+
+def read_latest_session(folder: str) -> str | None:
+    """Get the latest session file of a folder from its marker, None if there is no valid marker."""
+    try:
+        with open(os.path.join(folder, LATEST_SESSION_FILE), 'r', encoding="utf-8") as f:
+            filename = f.read().strip()
+    except OSError:
+        return None
+    return filename if filename and os.path.exists(os.path.join(folder, filename)) else None
@@ -0,0 +1,209 @@
+import re
+import threading
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from sources.utility import animate_thinking
+from sources.model_registry import model_registry
+
+LED_MODEL = "pszemraj/led-base-book-summary"
+SUMMARIZER_ENGINES = ["beam", "greedy", "quantized", "textrank"]
+
+def load_led() -> tuple:
+    """Load the LED summarization model (fp32)."""
+    from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+    animate_thinking("Loading memory compression model...", color="status")
+    tokenizer = AutoTokenizer.from_pretrained(LED_MODEL)
+    model = AutoModelForSeq2SeqLM.from_pretrained(LED_MODEL)
+    model.eval()
+    return tokenizer, model
+
+def load_led_int8() -> tuple:
+    """Load the LED summarization model with int8 dynamic quantization of its linear layers, for CPU inference."""
+    import torch
+    from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+    animate_thinking("Loading quantized memory compression model...", color="status")
+    tokenizer = AutoTokenizer.from_pretrained(LED_MODEL)
+    model = AutoModelForSeq2SeqLM.from_pretrained(LED_MODEL)
+    model.eval()
+    model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return tokenizer, model
+
+class Summarizer:
+    """
+    Base class of the memory summarization engines.
+    Every call is timed and its compression ratio (summary length / text length) recorded.
+    """
+    name = "base"
+    model_name = None
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.total_latency = 0.0
+        self.total_ratio = 0.0
+
+    def params(self, text: str, min_length: int) -> dict:
+        """Parameters of the summary of a text, they are part of the summary cache key."""
+        return {"engine": self.name, "model": self.model_name, "min_length": min_length}
+
+    def generate(self, text: str, params: dict) -> str:
+        raise NotImplementedError
+
+    def summarize(self, text: str, min_length: int = 64) -> str:
+        """
+        Summarize a text and record the latency and compression ratio.
+        Args:
+            text (str): The text to summarize.
+            min_length (int): The minimum length of the summary.
+        Returns:
+            str: The summary.
+        """
+        start_time = time.perf_counter()
+        summary = self.generate(text, self.params(text, min_length))
+        latency = time.perf_counter() - start_time
+        with self.lock:
+            self.calls += 1
+            self.total_latency += latency
+            self.total_ratio += len(summary) / max(1, len(text))
+        return summary
+
+    def report(self) -> dict:
+        """Get the number of calls, mean latency (seconds) and mean compression ratio of the engine."""
+        with self.lock:
+            return {
+                "calls": self.calls,
+                "mean_latency": round(self.total_latency / self.calls, 4) if self.calls > 0 else None,
+                "mean_compression_ratio": round(self.total_ratio / self.calls, 4) if self.calls > 0 else None
+            }
+
+class LEDSummarizer(Summarizer):
+    """
+    Abstractive summarization with LED.
+    "beam" is the original 4-beam search, "greedy" decodes with a single beam, "quantized" is greedy on the int8 model.
+    """
+    model_name = LED_MODEL
+
+    def __init__(self, name: str = "beam", num_beams: int = 4, registry_name: str = "memory-summarizer", loader=load_led):
+        super().__init__()
+        self.name = name
+        self.num_beams = num_beams
+        self.registry_name = registry_name
+        model_registry.register(registry_name, loader, config=loader.__name__)
+
+    def params(self, text: str, min_length: int) -> dict:
+        max_length = len(text) // 2 if len(text) > min_length*2 else min_length*2
+        return {**super().params(text, min_length), "max_length": max_length, "max_input_tokens": 512,
+                "length_penalty": 1.0, "num_beams": self.num_beams}
+
+    def generate(self, text: str, params: dict) -> str:
+        import torch
+        tokenizer, model = model_registry.get(self.registry_name)
+        inputs = tokenizer("summarize: " + text, return_tensors="pt", max_length=params["max_input_tokens"], truncation=True)
+        with torch.no_grad():
+            summary_ids = model.generate(
+                inputs['input_ids'],
+                max_length=params["max_length"],
+                min_length=params["min_length"],
+                length_penalty=params["length_penalty"],
+                num_beams=params["num_beams"],
+                early_stopping=params["num_beams"] > 1
+            )
+        summary = tokenizer.decode(summary_ids[0], skip_special_tokens=True)
+        return summary.replace('summary:', '').strip()
+
+class TextRankSummarizer(Summarizer):
+    """
+    Extractive summarization: sentences are ranked with PageRank over their TF-IDF cosine similarity,
+    the best ones are kept in their original order. No model, a few milliseconds on CPU.
+    """
+    name = "textrank"
+
+    def __init__(self, ratio: float = 0.3, damping: float = 0.85, iterations: int = 50):
+        """
+        Args:
+            ratio (float): Target length of the summary, as a fraction of the text length.
+            damping (float): PageRank damping factor.
+            iterations (int): Maximum number of PageRank iterations.
+        """
+        super().__init__()
+        self.ratio = ratio
+        self.damping = damping
+        self.iterations = iterations
+
+    def params(self, text: str, min_length: int) -> dict:
+        return {**super().params(text, min_length), "ratio": self.ratio, "damping": self.damping}
+
+    def split_sentences(self, text: str) -> List[str]:
+        sentences = re.split(r'(?<=[.!?。！？])\s+|\n+', text)
+        return [sentence.strip() for sentence in sentences if len(sentence.strip()) > 0]
+
+    def rank(self, sentences: List[str]) -> np.ndarray:
+        """Get the TextRank score of each sentence."""
+        words = [re.findall(r'\w+', sentence.lower()) for sentence in sentences]
+        vocabulary = {word: i for i, word in enumerate(sorted({word for sentence in words for word in sentence}))}
+        tf = np.zeros((len(sentences), max(1, len(vocabulary))), dtype=np.float32)
+        for i, sentence in enumerate(words):
+            for word in sentence:
+                tf[i, vocabulary[word]] += 1
+        idf = np.log((1 + len(sentences)) / (1 + (tf > 0).sum(axis=0))) + 1
+        tfidf = tf * idf
+        tfidf /= np.maximum(np.linalg.norm(tfidf, axis=1, keepdims=True), 1e-12)
+        similarity = tfidf @ tfidf.T
+        np.fill_diagonal(similarity, 0.0)
+        degree = similarity.sum(axis=1, keepdims=True)
+        transition = np.where(degree > 0, similarity / np.maximum(degree, 1e-12), 1.0 / len(sentences))
+        scores = np.full(len(sentences), 1.0 / len(sentences))
+        for _ in range(self.iterations):
+            updated = (1 - self.damping) / len(sentences) + self.damping * (transition.T @ scores)
+            if np.abs(updated - scores).sum() < 1e-6:
+                return updated
+            scores = updated
+        return scores
+
+    def generate(self, text: str, params: dict) -> str:
+        sentences = self.split_sentences(text)
+        if len(sentences) <= 2:
+            return text
+        target = max(params["min_length"] * 4, int(len(text) * params["ratio"])) # min_length is in tokens, ~4 chars each
+        scores = self.rank(sentences)
+        selected = []
+        length = 0
+        for i in np.argsort(-scores):
+            if length >= target:
+                break
+            selected.append(i)
+            length += len(sentences[i]) + 1
+        return ' '.join(sentences[i] for i in sorted(selected))
+
+summarizers = {}
+summarizers_lock = threading.Lock()
+
+def get_summarizer(engine: str = "beam") -> Summarizer:
+    """
+    Get a summarization engine, shared by all memories so its statistics are global.
+    Args:
+        engine (str): "beam", "greedy", "quantized" or "textrank".
+    Returns:
+        Summarizer: The engine.
+    """
+    if engine not in SUMMARIZER_ENGINES:
+        raise ValueError(f"Unknown summarizer engine {engine}, expected one of {SUMMARIZER_ENGINES}.")
+    with summarizers_lock:
+        if engine not in summarizers:
+            if engine == "beam":
+                summarizers[engine] = LEDSummarizer("beam", num_beams=4)
+            elif engine == "greedy":
+                summarizers[engine] = LEDSummarizer("greedy", num_beams=1)
+            elif engine == "quantized":
+                summarizers[engine] = LEDSummarizer("quantized", num_beams=1, registry_name="memory-summarizer-int8", loader=load_led_int8)
+            else:
+                summarizers[engine] = TextRankSummarizer()
+        return summarizers[engine]
+
+def summarizers_report() -> Dict[str, dict]:
+    """Get the latency and compression statistics of the engines used so far."""
+    with summarizers_lock:
+        return {engine: summarizer.report() for engine, summarizer in summarizers.items()}
@@ -0,0 +1,103 @@
+import math
+from functools import lru_cache
+from typing import Callable
+
+from sources.logger import Logger
+
+class TokenCounter:
+    """
+    Base class of the tokenizers used to measure the memory in tokens.
+    """
+    name = "base"
+
+    def encode(self, text: str) -> list:
+        raise NotImplementedError
+
+    def decode(self, tokens: list) -> str:
+        raise NotImplementedError
+
+    def count(self, text: str) -> int:
+        return len(self.encode(text))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Cut a text to its first max_tokens tokens."""
+        tokens = self.encode(text)
+        if len(tokens) <= max_tokens:
+            return text
+        return self.decode(tokens[:max(0, max_tokens)])
+
+class CharTokenCounter(TokenCounter):
+    """
+    Approximation without any tokenizer: about 4 characters per token for english text.
+    """
+    name = "chars"
+
+    def __init__(self, chars_per_token: float = 4.0):
+        self.chars_per_token = chars_per_token
+
+    def count(self, text: str) -> int:
+        return math.ceil(len(text) / self.chars_per_token)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        return text[:int(max(0, max_tokens) * self.chars_per_token)]
+
+class TiktokenCounter(TokenCounter):
+    """
+    OpenAI BPE tokenizer, a close estimate for most recent LLM vocabularies. Requires tiktoken.
+    """
+    def __init__(self, encoding: str = "cl100k_base"):
+        import tiktoken
+        self.name = f"tiktoken:{encoding}"
+        self.encoding = tiktoken.get_encoding(encoding)
+
+    def encode(self, text: str) -> list:
+        return self.encoding.encode(text, disallowed_special=())
+
+    def decode(self, tokens: list) -> str:
+        return self.encoding.decode(tokens)
+
+class HFTokenCounter(TokenCounter):
+    """
+    Tokenizer of a huggingface model, exact counts for the model actually used.
+    """
+    def __init__(self, model_name: str):
+        from transformers import AutoTokenizer
+        self.name = f"hf:{model_name}"
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+
+    def encode(self, text: str) -> list:
+        return self.tokenizer.encode(text, add_special_tokens=False)
+
+    def decode(self, tokens: list) -> str:
+        return self.tokenizer.decode(tokens)
+
+TOKEN_COUNTERS: dict[str, Callable[[str], TokenCounter]] = {
+    "chars": lambda arg: CharTokenCounter(float(arg) if arg else 4.0),
+    "tiktoken": lambda arg: TiktokenCounter(arg or "cl100k_base"),
+    "hf": lambda arg: HFTokenCounter(arg),
+}
+
+@lru_cache(maxsize=None)
+def get_token_counter(spec: str | None = None) -> TokenCounter:
+    """
+    Get a token counter from its spec: "chars", "tiktoken[:encoding]" or "hf:<model name>".
+    If spec is None, tiktoken is used when installed, else the character approximation.
+    Counters are stateless and shared between all the memories using the same spec.
+    Args:
+        spec (str | None): The tokenizer spec.
+    Returns:
+        TokenCounter: The token counter.
+    """
+    if spec is None:
+        try:
+            return TiktokenCounter()
+        except Exception:
+            return CharTokenCounter()
+    kind, _, arg = spec.partition(":")
+    if kind not in TOKEN_COUNTERS:
+        raise ValueError(f"Unknown tokenizer {spec}, expected one of {list(TOKEN_COUNTERS.keys())}.")
+    try:
+        return TOKEN_COUNTERS[kind](arg)
+    except Exception as e:
+        Logger("memory.log").warning(f"Failed to load tokenizer {spec}, using character approximation: {str(e)}")
+        return CharTokenCounter()
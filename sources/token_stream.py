@@ -0,0 +1,70 @@
+import asyncio
+import threading
+from typing import AsyncIterator
+
+class TokenStream:
+    """
+    Broadcast of the tokens generated by the agents to the API clients.
+    Each subscriber (eg: a server-sent events connection) gets its own queue of events:
+        {"event": "start", "agent": name}
+        {"event": "token", "agent": name, "content": token}
+        {"event": "end", "agent": name}
+    A slow subscriber loses its oldest events instead of slowing down the generation.
+    """
+    def __init__(self, max_queue: int = 4096):
+        """
+        Args:
+            max_queue (int): Maximum number of events waiting for a subscriber.
+        """
+        self.max_queue = max_queue
+        self.lock = threading.Lock()
+        self.subscribers = [] # (event loop, queue)
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.max_queue)
+        with self.lock:
+            self.subscribers.append((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        with self.lock:
+            self.subscribers = [(loop, q) for loop, q in self.subscribers if q is not queue]
+
+    @property
+    def has_subscribers(self) -> bool:
+        return len(self.subscribers) > 0
+
+    def put(self, queue: asyncio.Queue, event: dict) -> None:
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(event)
+
+    def publish(self, event: dict) -> None:
+        """Send an event to every subscriber, can be called from any thread."""
+        with self.lock:
+            subscribers = list(self.subscribers)
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        for loop, queue in subscribers:
+            if loop is running_loop:
+                self.put(queue, event)
+            elif not loop.is_closed():
+                loop.call_soon_threadsafe(self.put, queue, event)
+
+    async def events(self, heartbeat: float | None = None) -> AsyncIterator[dict | None]:
+        """
+        Iterate over the published events until the consumer stops.
+        Args:
+            heartbeat (float | None): Yield None after this many seconds without event, to keep connections alive.
+        """
+        queue = self.subscribe()
+        try:
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            self.unsubscribe(queue)
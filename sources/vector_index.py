@@ -0,0 +1,123 @@
+import threading
+from typing import Any, List, Tuple
+
+import numpy as np
+
+class VectorIndex:
+    """
+    In-memory vector index over normalized embeddings, searched by dot product (cosine similarity).
+    Exhaustive search by default, with an optional IVF (inverted file) partitioning for large sets:
+    vectors are clustered with k-means and only the `n_probe` closest clusters are searched.
+    """
+    def __init__(self, dim: int, n_lists: int = 0, n_probe: int = 4):
+        """
+        Args:
+            dim (int): Dimension of the vectors.
+            n_lists (int): Number of IVF clusters, 0 for exhaustive search.
+            n_probe (int): Number of clusters searched per query when IVF is trained.
+        """
+        self.dim = dim
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.vectors = np.zeros((0, dim), dtype=np.float32)
+        self.payloads = []
+        self.centroids = None
+        self.lists = [] # ids of the vectors of each IVF cluster
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.payloads)
+
+    @staticmethod
+    def normalize(vectors: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim == 1:
+            vectors = vectors[None, :]
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def add(self, vectors: np.ndarray, payloads: List[Any]) -> None:
+        """
+        Add vectors to the index.
+        Args:
+            vectors (np.ndarray): (n, dim) matrix of vectors.
+            payloads (List[Any]): The object attached to each vector (eg: a label), returned by search.
+        """
+        vectors = self.normalize(vectors)
+        if len(vectors) != len(payloads):
+            raise ValueError(f"Got {len(vectors)} vectors for {len(payloads)} payloads.")
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected vectors of dimension {self.dim}, got {vectors.shape[1]}.")
+        with self.lock:
+            start = len(self.payloads)
+            self.vectors = np.concatenate([self.vectors, vectors])
+            self.payloads.extend(payloads)
+            if self.centroids is not None:
+                self.lists = self.extend_lists(self.lists, self.assign(vectors), start)
+        if self.n_lists > 0 and self.centroids is None and len(self) >= self.n_lists * 16:
+            self.train()
+
+    def assign(self, vectors: np.ndarray) -> np.ndarray:
+        return np.argmax(vectors @ self.centroids.T, axis=1)
+
+    def extend_lists(self, lists: list, assignments: np.ndarray, start: int = 0) -> list:
+        """
+        Add vectors to the inverted lists, as new arrays so a search can keep using the old ones.
+        Args:
+            lists (list): The ids of the vectors of each cluster.
+            assignments (np.ndarray): The cluster of each new vector.
+            start (int): The id of the first new vector.
+        """
+        lists = list(lists)
+        for cluster in np.unique(assignments):
+            ids = start + np.flatnonzero(assignments == cluster)
+            lists[cluster] = np.concatenate([lists[cluster], ids])
+        return lists
+
+    def train(self, iterations: int = 10, seed: int = 42) -> None:
+        """Cluster the vectors with spherical k-means to enable IVF search."""
+        with self.lock:
+            if self.n_lists <= 0 or len(self.vectors) < self.n_lists:
+                return
+            rng = np.random.default_rng(seed)
+            centroids = self.vectors[rng.choice(len(self.vectors), self.n_lists, replace=False)]
+            for _ in range(iterations):
+                assignments = np.argmax(self.vectors @ centroids.T, axis=1)
+                for cluster in range(self.n_lists):
+                    members = self.vectors[assignments == cluster]
+                    if len(members) > 0:
+                        centroids[cluster] = members.mean(axis=0)
+                centroids = self.normalize(centroids)
+            self.centroids = centroids
+            empty = [np.zeros(0, dtype=np.int64) for _ in range(self.n_lists)]
+            self.lists = self.extend_lists(empty, self.assign(self.vectors))
+
+    def search(self, queries: np.ndarray, k: int = 5) -> List[List[Tuple[float, Any]]]:
+        """
+        Find the k most similar vectors of each query.
+        Args:
+            queries (np.ndarray): (n, dim) matrix of query vectors.
+            k (int): Number of neighbors.
+        Returns:
+            List[List[Tuple[float, Any]]]: For each query, (similarity, payload) sorted by decreasing similarity.
+        """
+        queries = self.normalize(queries)
+        with self.lock:
+            vectors, payloads = self.vectors, list(self.payloads)
+            centroids, lists = self.centroids, self.lists
+        if len(payloads) == 0:
+            return [[] for _ in queries]
+        if centroids is None:
+            return [self.top_k(row, np.arange(len(payloads)), payloads, k) for row in queries @ vectors.T]
+        probes = np.argsort(-(queries @ centroids.T), axis=1)[:, :self.n_probe]
+        results = []
+        for query, probe in zip(queries, probes):
+            # only the vectors of the probed clusters are scored
+            candidates = np.concatenate([lists[cluster] for cluster in probe])
+            results.append(self.top_k(vectors[candidates] @ query, candidates, payloads, k))
+        return results
+
+    @staticmethod
+    def top_k(scores: np.ndarray, ids: np.ndarray, payloads: List[Any], k: int) -> List[Tuple[float, Any]]:
+        top = np.argsort(-scores)[:k]
+        return [(float(scores[j]), payloads[ids[j]]) for j in top]
@@ -0,0 +1,51 @@
+import unittest
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  # Add project root to Python path
+from sources.batcher import MicroBatcher
+
+class TestMicroBatcher(unittest.TestCase):
+    def setUp(self):
+        self.batches = []
+        self.threads = []
+
+    def double(self, items):
+        self.batches.append(list(items))
+        self.threads.append(threading.current_thread())
+        time.sleep(0.05)
+        return [item * 2 for item in items]
+
+    def test_lone_caller_processed_directly(self):
+        batcher = MicroBatcher(self.double, max_wait=1.0)
+        start_time = time.time()
+        self.assertEqual(batcher.process(2), 4)
+        self.assertLess(time.time() - start_time, 0.5) # no batching window
+        self.assertIs(self.threads[0], threading.current_thread())
+
+    def test_concurrent_callers_batched(self):
+        batcher = MicroBatcher(self.double, max_wait=0.02)
+        results = {}
+
+        def process(item):
+            results[item] = batcher.process(item)
+        callers = [threading.Thread(target=process, args=(i,)) for i in range(5)]
+        for caller in callers:
+            caller.start()
+        for caller in callers:
+            caller.join()
+        self.assertEqual(results, {i: i * 2 for i in range(5)})
+        self.assertLess(len(self.batches), 5)
+        self.assertEqual(sorted(item for batch in self.batches for item in batch), list(range(5)))
+        self.assertEqual(batcher.in_flight, 0)
+
+    def test_error_raised_to_caller(self):
+        batcher = MicroBatcher(lambda items: [])
+        with self.assertRaises(ValueError):
+            batcher.process(1)
+        self.assertEqual(batcher.in_flight, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  # Add project root to Python path
+from sources.cache import LRUCache, DiskLRUCache
+
+class TestLRUCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = LRUCache(max_size=2)
+
+    def test_get_put(self):
+        self.cache.put("hello", ("talk", "LOW"))
+        self.assertEqual(self.cache.get("hello"), ("talk", "LOW"))
+        self.assertIsNone(self.cache.get("missing"))
+        self.assertEqual(self.cache.get("missing", "default"), "default")
+
+    def test_eviction_order(self):
+        self.cache.put("a", 1)
+        self.cache.put("b", 2)
+        self.cache.get("a") # a is now the most recently used
+        self.cache.put("c", 3)
+        self.assertIn("a", self.cache)
+        self.assertNotIn("b", self.cache)
+        self.assertIn("c", self.cache)
+        self.assertEqual(len(self.cache), 2)
+
+    def test_ttl_expiry(self):
+        cache = LRUCache(max_size=2, ttl=0.05)
+        cache.put("a", 1)
+        self.assertEqual(cache.get("a"), 1)
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("a"))
+
+    def test_disabled(self):
+        cache = LRUCache(max_size=0)
+        cache.put("a", 1)
+        self.assertIsNone(cache.get("a"))
+
+    def test_stats(self):
+        self.cache.put("a", 1)
+        self.cache.get("a")
+        self.cache.get("b")
+        stats = self.cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+class TestDiskLRUCache(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, "cache.db")
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_persistence(self):
+        cache = DiskLRUCache(self.path)
+        cache.put("a", {"summary": "short"})
+        cache.connection.close()
+        cache = DiskLRUCache(self.path)
+        self.assertEqual(cache.get("a"), {"summary": "short"})
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats()["hits"], 1)
+        cache.connection.close()
+
+    def test_size_bounded_lru(self):
+        cache = DiskLRUCache(self.path, max_bytes=25)
+        cache.put("a", "x" * 8)
+        time.sleep(0.01)
+        cache.put("b", "y" * 8)
+        time.sleep(0.01)
+        cache.get("a") # a is now the most recently used
+        cache.put("c", "z" * 8)
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertIn("c", cache)
+        self.assertLessEqual(cache.stats()["bytes"], 25)
+        cache.connection.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  # Add project root to Python path
+from sources.conversation_store import ConversationStore
+
+class TestConversationStore(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.store = ConversationStore(os.path.join(self.folder.name, "conversations.db"))
+        self.memory = [
+            {"role": "system", "content": "system"},
+            {"role": "user", "content": "find cheap flights to Tokyo", "time": "2025-01-01 10:00:00"},
+            {"role": "assistant", "content": "Here are some flights", "model_used": "deepseek-r1:14b"},
+        ]
+
+    def tearDown(self):
+        self.store.close()
+        self.folder.cleanup()
+
+    def test_save_and_load(self):
+        self.store.save_session("s1", "casual_agent", 1.0, self.memory)
+        self.assertEqual(self.store.load_messages("s1"), self.memory)
+
+    def test_incremental_save(self):
+        self.store.save_session("s1", "casual_agent", 1.0, self.memory[:2])
+        self.store.save_session("s1", "casual_agent", 1.0, self.memory)
+        self.assertEqual(self.store.load_messages("s1"), self.memory)
+        edited = [self.memory[0], {"role": "user", "content": "summary"}]
+        self.store.save_session("s1", "casual_agent", 1.0, edited)
+        self.assertEqual(self.store.load_messages("s1"), edited)
+        self.assertEqual(self.store.list_sessions()["sessions"][0]["message_count"], 2)
+
+    def test_last_session_by_update_time(self):
+        self.store.save_session("s1", "casual_agent", 1.0, self.memory)
+        self.store.save_session("s2", "casual_agent", 2.0, self.memory)
+        self.store.save_session("s3", "code_agent", 3.0, self.memory)
+        self.store.save_session("s1", "casual_agent", 1.0, self.memory + [{"role": "user", "content": "again"}])
+        self.assertEqual(self.store.last_session("casual_agent"), "s1")
+        self.assertEqual(self.store.last_session("code_agent"), "s3")
+        self.assertIsNone(self.store.last_session("file_agent"))
+
+    def test_list_and_page(self):
+        for i in range(5):
+            self.store.save_session(f"s{i}", "casual_agent", float(i), self.memory)
+        page = self.store.list_sessions(agent_type="casual_agent", limit=2, offset=1)
+        self.assertEqual(page["total"], 5)
+        self.assertEqual([session["id"] for session in page["sessions"]], ["s3", "s2"])
+        self.assertEqual(page["sessions"][0]["title"], "find cheap flights to Tokyo")
+
+    def test_search(self):
+        self.store.save_session("s1", "casual_agent", 1.0, self.memory)
+        self.store.save_session("s2", "code_agent", 2.0, [{"role": "user", "content": "write 100% python"}])
+        self.assertEqual([s["id"] for s in self.store.search_sessions("tokyo")["sessions"]], ["s1"])
+        self.assertEqual([s["id"] for s in self.store.search_sessions("100%")["sessions"]], ["s2"])
+        self.assertEqual(self.store.search_sessions("tokyo", agent_type="code_agent")["total"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
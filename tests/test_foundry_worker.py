@@ -0,0 +1,103 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import os
+import sys
+import json
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  # Add project root to Python path
+from sources.foundry_worker import FoundryWorker, get_foundry_worker
+from sources.llm_provider import Provider
+
+class FoundryServiceHandler(BaseHTTPRequestHandler):
+    """Answers like the OpenAI-compatible endpoint of the Foundry Local service."""
+    protocol_version = "HTTP/1.1"
+    requests = []
+
+    def log_message(self, *args):
+        pass
+
+    def reply(self, payload: dict):
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self.reply({"object": "list", "data": [{"id": "phi-3.5-mini-instruct-generic-cpu", "object": "model"}]})
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        FoundryServiceHandler.requests.append(body)
+        self.reply({"id": "1", "object": "chat.completion", "created": 0, "model": body["model"],
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": "hello"}}]})
+
+class TestFoundryWorker(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), FoundryServiceHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.endpoint = f"http://127.0.0.1:{cls.server.server_address[1]}/v1"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        FoundryServiceHandler.requests = []
+
+    def make_worker(self, model: str) -> FoundryWorker:
+        worker = get_foundry_worker(model)
+        worker.reset()
+        worker.endpoint = self.endpoint
+        return worker
+
+    def test_resolve_model_id(self):
+        worker = FoundryWorker("phi-3.5-mini", endpoint=self.endpoint)
+        with patch.object(worker, "run_cli") as run_cli:
+            self.assertEqual(worker.start(), self.endpoint)
+        run_cli.assert_called_once_with("model", "load", "phi-3.5-mini")
+        self.assertEqual(worker.model_id, "phi-3.5-mini-instruct-generic-cpu")
+
+    def test_service_endpoint_from_status(self):
+        worker = FoundryWorker("phi-3.5-mini")
+        status = MagicMock(stdout="Model management service is running on http://127.0.0.1:5273/openai/status", stderr="")
+        with patch.object(worker, "run_cli", return_value=status):
+            self.assertEqual(worker.service_endpoint(), "http://127.0.0.1:5273/v1")
+
+    def test_provider_reuses_worker(self):
+        worker = self.make_worker("phi-3.5-mini-reuse")
+        provider = Provider("foundry", "phi-3.5-mini-reuse", is_local=True, health_check=False)
+        self.assertIsNone(provider.openai_compatible_endpoint())
+        with patch.object(worker, "run_cli") as run_cli, patch.object(provider, "foundry_cli_fn") as cli_fn:
+            for _ in range(3):
+                self.assertEqual(provider.respond([{"role": "user", "content": "hi"}], verbose=False), "hello")
+        self.assertEqual(run_cli.call_count, 1)
+        cli_fn.assert_not_called()
+        self.assertEqual(len(FoundryServiceHandler.requests), 3)
+        self.assertEqual(provider.openai_compatible_endpoint()["base_url"], self.endpoint)
+
+    def test_cli_fallback(self):
+        worker = self.make_worker("phi-3.5-mini-fallback")
+        worker.endpoint = None
+        provider = Provider("foundry", "phi-3.5-mini-fallback", is_local=True, health_check=False)
+        with patch.object(worker, "run_cli", side_effect=FileNotFoundError("foundry")), \
+             patch.object(provider, "foundry_cli_fn", return_value="from cli") as cli_fn:
+            self.assertEqual(provider.respond([{"role": "user", "content": "hi"}], verbose=False), "from cli")
+        cli_fn.assert_called_once()
+        self.assertTrue(worker.failed)
+
+    def test_worker_disabled(self):
+        provider = Provider("foundry", "phi-3.5-mini-disabled", is_local=True, health_check=False)
+        with patch.dict(os.environ, {"FOUNDRY_WORKER": "false"}), \
+             patch.object(provider, "foundry_cli_fn", return_value="from cli"):
+            self.assertIsNone(provider.foundry_worker())
+            self.assertEqual(provider.respond([{"role": "user", "content": "hi"}], verbose=False), "from cli")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import os
+import sys
+import gc
+import asyncio
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  # Add project root to Python path
+from sources.http_pool import HTTPClientPool, get_http_pool
+from sources.llm_provider import Provider
+
+class TestHTTPClientPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = HTTPClientPool(max_connections=4, timeout=30.0)
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_client_created_once(self):
+        created = []
+        factory = lambda: created.append(1) or object()
+        first = self.pool.get(("test", "a"), factory)
+        self.assertIs(self.pool.get(("test", "a"), factory), first)
+        self.assertIsNot(self.pool.get(("test", "b"), factory), first)
+        self.assertEqual(len(created), 2)
+
+    def test_requests_session_reused(self):
+        session = self.pool.requests_session("http://127.0.0.1:1234")
+        self.assertIs(self.pool.requests_session("http://127.0.0.1:1234"), session)
+        self.assertEqual(self.pool.request_timeout(), (10.0, 30.0))
+
+    def test_ollama_client_reused(self):
+        client = self.pool.ollama_client("http://127.0.0.1:11434")
+        self.assertIs(self.pool.ollama_client("http://127.0.0.1:11434"), client)
+
+    def test_close(self):
+        session = self.pool.requests_session("http://127.0.0.1:1234")
+        self.pool.close()
+        self.assertIsNot(self.pool.requests_session("http://127.0.0.1:1234"), session)
+
+    def test_async_client_per_loop(self):
+        async def get_twice():
+            client = self.pool.async_httpx_client()
+            self.assertIs(self.pool.async_httpx_client(), client)
+            return client
+        first = asyncio.run(get_twice())
+        second = asyncio.run(get_twice())
+        self.assertIsNot(first, second)
+        asyncio.run(first.aclose())
+        asyncio.run(second.aclose())
+
+    def test_closed_loop_clients_dropped(self):
+        async def get_client():
+            return self.pool.async_httpx_client()
+        loop = asyncio.new_event_loop()
+        client = loop.run_until_complete(get_client())
+        loop.close()
+        self.assertEqual(len(self.pool.async_clients), 1)
+        del loop
+        gc.collect()
+        self.assertEqual(len(self.pool.async_clients), 0)
+        asyncio.run(client.aclose())
+
+    def test_aclose_evicts_loop_clients(self):
+        async def get_and_close():
+            self.pool.async_httpx_client()
+            await self.pool.aclose()
+        asyncio.run(get_and_close())
+        self.assertEqual(len(self.pool.async_clients), 0)
+
+    def test_shared_pool(self):
+        self.assertIs(get_http_pool(8, 60.0), get_http_pool(8, 60.0))
+        first = Provider("ollama", "deepseek-r1:32b", http_max_connections=8, http_timeout=60.0)
+        second = Provider("ollama", "deepseek-r1:14b", http_max_connections=8, http_timeout=60.0)
+        self.assertIs(first.http_pool, second.http_pool)
+
+if __name__ == '__main__':
+    unittest.main()
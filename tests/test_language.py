@@ -0,0 +1,52 @@
+import unittest
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  # Add project root to Python path
+from sources.language import LanguageUtility
+from sources.model_registry import model_registry
+
+class FakeTokenizer:
+    def __call__(self, texts, return_tensors=None, padding=False):
+        return {"texts": texts}
+
+    def batch_decode(self, outputs, skip_special_tokens=True):
+        return outputs
+
+class FakeTranslator:
+    def __init__(self):
+        self.calls = []
+
+    def generate(self, texts):
+        self.calls.append(list(texts))
+        return [f"en:{text}" for text in texts]
+
+class TestTranslationCache(unittest.TestCase):
+    def setUp(self):
+        self.translator = FakeTranslator()
+        model_registry.unload("translator-fr-en")
+        model_registry.loaders.pop("translator-fr-en", None)
+        model_registry.register("translator-fr-en", lambda: (FakeTokenizer(), self.translator))
+        self.language = LanguageUtility(supported_language=["en", "fr"])
+
+    def tearDown(self):
+        model_registry.unload("translator-fr-en")
+        model_registry.loaders.pop("translator-fr-en", None)
+
+    def test_only_missing_texts_are_translated(self):
+        self.assertEqual(self.language.translate("bonjour", "fr"), "en:bonjour")
+        result = self.language.translate_batch(["salut", "bonjour", "salut"], "fr")
+        self.assertEqual(result, ["en:salut", "en:bonjour", "en:salut"])
+        self.assertEqual(self.translator.calls, [["bonjour"], ["salut"]])
+
+    def test_english_is_not_translated(self):
+        self.assertEqual(self.language.translate_batch(["hello"], "en"), ["hello"])
+        self.assertEqual(self.translator.calls, [])
+
+    def test_cache_keyed_by_language(self):
+        self.language.translate("chat", "fr")
+        self.assertIn(("fr", "chat"), self.language.translation_cache)
+        self.assertNotIn(("en", "chat"), self.language.translation_cache)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,9 +3,16 @@ import os
 import sys
 import json
 import datetime
+import threading
+import tempfile
+from unittest.mock import patch
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  # Add project root to Python path
-from sources.memory import Memory
+import sources.memory
+from sources.memory import Memory, MESSAGE_TOKEN_OVERHEAD, MIN_MESSAGE_TOKENS
+from sources.cache import DiskLRUCache
+from sources.conversation_store import get_conversation_store
+from sources.token_counter import CharTokenCounter
 
 class TestMemory(unittest.TestCase):
     def setUp(self):
@@ -40,9 +47,17 @@ class TestMemory(unittest.TestCase):
 
     def test_save_memory(self):
         self.memory.save_memory()
-        save_path = os.path.join(self.memory.conversation_folder, "casual_agent")
+        self.assertTrue(os.path.exists(self.memory.get_db_path()))
+        store = get_conversation_store(self.memory.get_db_path())
+        self.assertEqual(store.last_session("casual_agent"), self.memory.session_id)
+        self.assertEqual(store.load_messages(self.memory.session_id), self.memory.memory)
+
+    def test_save_memory_journal(self):
+        memory = Memory(self.system_prompt, memory_compression=False, storage="journal")
+        memory.save_memory()
+        save_path = os.path.join(memory.conversation_folder, "casual_agent")
         self.assertTrue(os.path.exists(save_path))
-        filename = self.memory.get_filename()
+        filename = memory.get_filename()
         self.assertTrue(os.path.exists(os.path.join(save_path, filename)))
 
     def test_push(self):
@@ -89,5 +104,149 @@ class TestMemory(unittest.TestCase):
         self.assertEqual(len(new_memory.memory), 3)  # System + messages
         self.assertEqual(new_memory.memory[1]['content'], "Hello")
 
+class TestMemoryTokenBudget(unittest.TestCase):
+    def setUp(self):
+        self.memory = Memory(
+            system_prompt="x" * 40,
+            recover_last_session=False,
+            memory_compression=False,
+            token_budget=100,
+            tokenizer=CharTokenCounter(chars_per_token=4)
+        )
+
+    def test_token_count_cached(self):
+        self.memory.push("user", "y" * 40)
+        self.assertEqual(self.memory.total_tokens, 2 * (10 + MESSAGE_TOKEN_OVERHEAD))
+        self.assertIn("y" * 40, self.memory.token_counts)
+
+    def test_oldest_turns_evicted(self):
+        for i in range(10):
+            self.memory.push("user", f"{i}" * 40)
+        self.assertLessEqual(self.memory.total_tokens, 100)
+        self.assertEqual(self.memory.memory[0]['role'], "system")
+        self.assertEqual(self.memory.memory[-1]['content'], "9" * 40)
+        self.assertNotIn("0" * 40, [message['content'] for message in self.memory.memory])
+
+    def test_oversized_message_truncated(self):
+        self.memory.push("user", "z" * 1000)
+        self.assertLessEqual(self.memory.total_tokens, 100)
+        self.assertTrue(self.memory.memory[-1]['content'].startswith("zzz"))
+
+    def test_trim_text_to_max_ctx(self):
+        text = self.memory.trim_text_to_max_ctx("w" * 1000)
+        self.assertLessEqual(self.memory.token_counter.count(text) + MESSAGE_TOKEN_OVERHEAD, 100)
+
+    def test_no_default_budget(self):
+        memory = Memory("system", memory_compression=False, model_provider="llama3.2:1b")
+        self.assertEqual(memory.token_budget, 0)
+        memory.push("user", "Plan a trip to Tokyo")
+        self.assertEqual(memory.memory[-1]['content'], "Plan a trip to Tokyo")
+        # page texts are still cut to the estimated context of the model
+        self.assertEqual(len(memory.trim_text_to_max_ctx("w" * 1000)), memory.get_ideal_ctx("llama3.2:1b"))
+
+    def test_budget_smaller_than_system_prompt(self):
+        memory = Memory("x" * 400, memory_compression=False, token_budget=50,
+                        tokenizer=CharTokenCounter(chars_per_token=4))
+        self.assertEqual(memory.token_budget, 0)
+        memory.push("user", "Plan a trip to Tokyo")
+        self.assertEqual(memory.memory[-1]['content'], "Plan a trip to Tokyo")
+
+    def test_message_never_truncated_below_minimum(self):
+        self.memory.memory[0]['content'] = "x" * 400 # eg: a recovered session with a longer system prompt
+        self.memory.push("user", "z" * 1000)
+        self.assertGreaterEqual(self.memory.token_counter.count(self.memory.memory[-1]['content']), MIN_MESSAGE_TOKENS)
+
+    def test_no_budget(self):
+        memory = Memory("system", memory_compression=False, token_budget=0)
+        memory.push("user", "z" * 100000)
+        self.assertEqual(len(memory.memory[-1]['content']), 100000)
+        self.assertEqual(memory.trim_text_to_max_ctx("abc"), "abc")
+
+    def test_no_budget_compresses_long_message(self):
+        memory = SlowSummaryMemory("system", model_provider="llama3.2:1b")
+        with patch.object(memory, "compress") as compress:
+            memory.push("user", "short")
+            compress.assert_not_called()
+            memory.push("user", "z" * 1000)
+            compress.assert_called_once()
+
+    def test_no_budget_unknown_model_size(self):
+        memory = Memory("system", memory_compression=False, model_provider="gpt-4o")
+        self.assertEqual(memory.trim_text_to_max_ctx("w" * 100000), "w" * 100000)
+
+class SlowSummaryMemory(Memory):
+    def __init__(self, *args, **kwargs):
+        self.release = threading.Event()
+        super().__init__(*args, **kwargs)
+
+    def download_model(self):
+        pass
+
+    def summarize(self, text: str, min_length: int = 64) -> str:
+        self.release.wait(5)
+        return "summary"
+
+class TestMemoryAsyncCompression(unittest.TestCase):
+    def setUp(self):
+        self.memory = SlowSummaryMemory(
+            system_prompt="system",
+            memory_compression=True,
+            token_budget=0,
+            tokenizer=CharTokenCounter(chars_per_token=4)
+        )
+
+    def test_truncated_until_summary_ready(self):
+        self.memory.push("user", "a" * 5000)
+        self.memory.compress()
+        self.assertEqual(len(self.memory.get()[1]['content']), 1024)
+        self.assertEqual(len(self.memory.memory[1]['content']), 5000)
+        self.memory.release.set()
+        self.assertTrue(self.memory.wait_for_compression(timeout=5))
+        self.assertEqual(self.memory.get()[1]['content'], "summary")
+
+    def test_summary_dropped_if_message_removed(self):
+        self.memory.push("user", "b" * 5000)
+        self.memory.compress()
+        self.memory.clear()
+        self.memory.push("user", "hello")
+        self.memory.release.set()
+        self.assertTrue(self.memory.wait_for_compression(timeout=5))
+        self.assertEqual(self.memory.get()[1]['content'], "hello")
+
+    def test_sync_compression(self):
+        self.memory.async_compression = False
+        self.memory.release.set()
+        self.memory.push("user", "c" * 5000)
+        self.memory.compress()
+        self.assertEqual(self.memory.memory[1]['content'], "summary")
+
+class TestSummaryCache(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.previous_cache = sources.memory.summary_cache
+        sources.memory.summary_cache = DiskLRUCache(os.path.join(self.folder.name, "summaries.db"))
+        self.memory = Memory("system", memory_compression=True)
+
+    def tearDown(self):
+        sources.memory.summary_cache.connection.close()
+        sources.memory.summary_cache = self.previous_cache
+        self.folder.cleanup()
+
+    def test_cached_summary_skips_model(self):
+        text = "long text " * 200
+        params = self.memory.summarizer.params(text, 64)
+        sources.memory.summary_cache.put(self.memory.summary_key(text, params), {"summary": "cached"})
+        self.assertEqual(self.memory.summarize(text), "cached")
+
+    def test_key_depends_on_params(self):
+        self.assertNotEqual(self.memory.summary_key("text", {"num_beams": 4}),
+                            self.memory.summary_key("text", {"num_beams": 1}))
+
+    def test_key_depends_on_engine(self):
+        textrank = Memory("system", memory_compression=True, summarizer_engine="textrank")
+        text = "long text " * 200
+        self.assertNotEqual(self.memory.summary_key(text, self.memory.summarizer.params(text, 64)),
+                            textrank.summary_key(text, textrank.summarizer.params(text, 64)))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
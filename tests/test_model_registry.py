@@ -0,0 +1,52 @@
+import unittest
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  # Add project root to Python path
+from sources.model_registry import ModelRegistry
+
+class TestModelRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = ModelRegistry()
+        self.loads = 0
+
+    def loader(self):
+        self.loads += 1
+        return "model"
+
+    def test_lazy_loading(self):
+        self.registry.register("summarizer", self.loader)
+        self.assertEqual(self.loads, 0)
+        self.assertFalse(self.registry.is_loaded("summarizer"))
+        self.assertEqual(self.registry.get("summarizer"), "model")
+        self.assertEqual(self.registry.get("summarizer"), "model")
+        self.assertEqual(self.loads, 1)
+
+    def test_register_twice(self):
+        self.registry.register("summarizer", self.loader)
+        self.registry.register("summarizer", lambda: "other model")
+        self.assertEqual(self.registry.get("summarizer"), "model")
+
+    def test_register_twice_other_config(self):
+        self.registry.register("router", self.loader, config=("onnx", ".router_cache"))
+        with self.assertLogs(self.registry.logger.logger, level="WARNING") as logs:
+            self.registry.register("router", lambda: "other model", config=("torch", ".router_cache"))
+        self.assertIn("already registered", logs.output[0])
+        self.assertEqual(self.registry.get("router"), "model")
+
+    def test_unknown_model(self):
+        with self.assertRaises(KeyError):
+            self.registry.get("unknown")
+
+    def test_warm_and_report(self):
+        self.registry.register("summarizer", self.loader)
+        self.registry.register("broken", lambda: 1 / 0)
+        thread = self.registry.warm()
+        thread.join()
+        report = self.registry.report()
+        self.assertTrue(report["summarizer"]["loaded"])
+        self.assertIsNotNone(report["summarizer"]["load_time"])
+        self.assertFalse(report["broken"]["loaded"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+import os
+import sys
+import asyncio
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  # Add project root to Python path
+from sources.agents.planner_agent import PlannerAgent
+from sources.tools.tools import Tools
+from sources.logger import Logger
+
+VALID_PLAN = """<think>ok</think>## Task 1: search the web
+```json
+{"plan": [{"agent": "Web", "id": "1", "need": [], "task": "Search the web"}]}
+```"""
+UNKNOWN_AGENT_PLAN = """<think>ok</think>## Task 1: fly
+```json
+{"plan": [{"agent": "Pilot", "id": "1", "need": [], "task": "Fly"}]}
+```"""
+
+class PlanMemory:
+    """Conversation of the planner, only what make_plan uses."""
+    def __init__(self):
+        self.messages = []
+
+    def push(self, role, content):
+        self.messages.append({"role": role, "content": content})
+        return len(self.messages) - 1
+
+    def get(self):
+        return list(self.messages)
+
+class PlanProvider:
+    """Answers each concurrent request after its own delay, records the cancelled ones."""
+    def __init__(self, answers):
+        self.answers = list(answers) # (delay, answer) per request
+        self.calls = []
+        self.cancelled = 0
+
+    async def respond_async(self, history, verbose=True, use_cache=True, priority="interactive"):
+        delay, answer = self.answers[len(self.calls) % len(self.answers)]
+        self.calls.append({"use_cache": use_cache, "priority": priority})
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+def make_planner(provider, plan_samples):
+    planner = PlannerAgent.__new__(PlannerAgent)
+    planner.agent_name = "Planner"
+    planner.llm = provider
+    planner.llm_priority = "planning"
+    planner.plan_samples = plan_samples
+    planner.memory = PlanMemory()
+    planner.verbose = False
+    planner.token_stream = None
+    planner.status_message = ""
+    planner.tools = {"json": Tools()}
+    planner.tools["json"].tag = "json"
+    planner.agents = {"coder": None, "file": None, "web": None, "casual": None}
+    planner.logger = Logger("planner_agent.log")
+    return planner
+
+class TestSpeculativePlanning(unittest.TestCase):
+    def test_first_valid_plan_wins(self):
+        provider = PlanProvider([(0.05, UNKNOWN_AGENT_PLAN), (0.1, VALID_PLAN), (5.0, VALID_PLAN)])
+        planner = make_planner(provider, plan_samples=3)
+        plan = asyncio.run(asyncio.wait_for(planner.make_plan("Search the web"), timeout=2))
+        self.assertEqual(plan[0][1]["agent"], "Web")
+        self.assertEqual(provider.cancelled, 1)
+        self.assertEqual([call["use_cache"] for call in provider.calls], [True, False, False])
+        self.assertTrue(all(call["priority"] == "planning" for call in provider.calls))
+        self.assertEqual(planner.memory.get()[-1]["role"], "assistant")
+
+    def test_failed_sample_ignored(self):
+        provider = PlanProvider([(0.01, Exception("Provider server failed")), (0.05, VALID_PLAN)])
+        planner = make_planner(provider, plan_samples=2)
+        plan = asyncio.run(planner.make_plan("Search the web"))
+        self.assertEqual(len(plan), 1)
+
+    def test_retry_when_no_sample_is_valid(self):
+        provider = PlanProvider([(0.01, UNKNOWN_AGENT_PLAN), (0.01, UNKNOWN_AGENT_PLAN),
+                                 (0.01, VALID_PLAN), (0.01, VALID_PLAN)])
+        planner = make_planner(provider, plan_samples=2)
+        plan = asyncio.run(planner.make_plan("Search the web"))
+        self.assertEqual(len(plan), 1)
+        self.assertEqual(len(provider.calls), 4)
+
+    def test_no_update(self):
+        provider = PlanProvider([(0.01, "<think>ok</think> NO_UPDATE")])
+        planner = make_planner(provider, plan_samples=2)
+        self.assertEqual(asyncio.run(planner.make_plan("Update the plan")), [])
+
+    def test_all_samples_fail(self):
+        provider = PlanProvider([(0.01, Exception("Provider server failed"))])
+        planner = make_planner(provider, plan_samples=2)
+        with self.assertRaises(Exception):
+            asyncio.run(planner.make_plan("Search the web"))
+
+if __name__ == '__main__':
+    unittest.main()
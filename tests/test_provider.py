@@ -5,6 +5,10 @@ import socket
 import subprocess
 from urllib.parse import urlparse
 import platform
+import asyncio
+import json
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  # Add project root to Python path
 
@@ -66,5 +70,74 @@ class TestIsIpOnline(unittest.TestCase):
             result = self.checker.is_ip_online(address)
             self.assertTrue(result)
 
+class TestRespondAsync(unittest.TestCase):
+    def test_sync_provider_runs_in_thread(self):
+        provider = Provider("test", "test-model")
+        answer = asyncio.run(provider.respond_async([{"role": "user", "content": "hi"}], verbose=False))
+        self.assertEqual(answer, provider.respond([{"role": "user", "content": "hi"}], verbose=False))
+
+    def test_read_server_update(self):
+        provider = Provider("server", "deepseek-r1:32b", "http://127.0.0.1:1")
+        thought, is_complete = provider.read_server_update({"delta": "Hel", "is_complete": False}, "")
+        self.assertEqual((thought, is_complete), ("Hel", False))
+        thought, is_complete = provider.read_server_update({"delta": "lo", "is_complete": True, "sentence": "Hello"}, thought)
+        self.assertEqual((thought, is_complete), ("Hello", True))
+
+    def test_offline_server_answer(self):
+        provider = Provider("ollama", "deepseek-r1:32b", "127.0.0.1:1")
+        self.assertEqual(provider.error_answer(Exception("Connection refused")),
+                         "Server 127.0.0.1:1 seem offline. Unable to answer.")
+        with self.assertRaises(Exception):
+            provider.error_answer(Exception("invalid model"))
+
+class OllamaHandler(BaseHTTPRequestHandler):
+    """Answers like an Ollama server without the model until it is pulled."""
+    protocol_version = "HTTP/1.1"
+    pulled = []
+
+    def log_message(self, *args):
+        pass
+
+    def reply(self, status, payload):
+        body = (json.dumps(payload) + "\n").encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        if self.path == "/api/pull":
+            OllamaHandler.pulled.append(body["model"])
+            self.reply(200, {"status": "success"})
+        elif body["model"] not in OllamaHandler.pulled:
+            self.reply(404, {"error": f"model '{body['model']}' not found"})
+        else:
+            self.reply(200, {"model": body["model"], "created_at": "2024-01-01T00:00:00Z",
+                             "message": {"role": "assistant", "content": "hello"}, "done": True})
+
+class TestOllamaPull(unittest.TestCase):
+    def setUp(self):
+        OllamaHandler.pulled = []
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), OllamaHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.provider = Provider("ollama", "tinyllama", f"127.0.0.1:{self.server.server_address[1]}", health_check=False)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_missing_model_pulled_async(self):
+        answer = asyncio.run(self.provider.respond_async([{"role": "user", "content": "hi"}], verbose=False))
+        self.assertEqual(answer, "hello")
+        self.assertEqual(OllamaHandler.pulled, ["tinyllama"])
+
+    def test_missing_model_pulled_stream(self):
+        async def run():
+            return [token async for token in self.provider.respond_stream([{"role": "user", "content": "hi"}])]
+        self.assertEqual(asyncio.run(run()), ["hello"])
+        self.assertEqual(OllamaHandler.pulled, ["tinyllama"])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
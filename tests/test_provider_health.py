@@ -0,0 +1,65 @@
+import unittest
+import os
+import sys
+import socket
+import asyncio
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  # Add project root to Python path
+from sources.provider_health import HealthChecker
+from sources.llm_provider import Provider
+
+class TestHealthChecker(unittest.TestCase):
+    def setUp(self):
+        self.checker = HealthChecker(ttl=30.0, timeout=1.0, refresh_interval=0.05)
+        self.server = socket.socket()
+        self.server.bind(("127.0.0.1", 0))
+        self.server.listen()
+        self.address = f"127.0.0.1:{self.server.getsockname()[1]}"
+        closed = socket.socket()
+        closed.bind(("127.0.0.1", 0))
+        self.closed_address = f"127.0.0.1:{closed.getsockname()[1]}"
+        closed.close()
+
+    def tearDown(self):
+        self.checker.stop()
+        self.server.close()
+
+    def test_parse_address(self):
+        self.assertEqual(HealthChecker.parse_address("10.0.0.2:3333"), ("10.0.0.2", 3333))
+        self.assertEqual(HealthChecker.parse_address("http://localhost:11434"), ("localhost", 11434))
+        self.assertEqual(HealthChecker.parse_address("https://example.com/v1"), ("example.com", 443))
+
+    def test_probe(self):
+        self.assertTrue(asyncio.run(self.checker.probe(self.address)))
+        self.assertFalse(asyncio.run(self.checker.probe(self.closed_address)))
+        self.assertTrue(self.checker.is_online(self.address))
+        self.assertFalse(self.checker.is_online(self.closed_address))
+
+    def test_unknown_and_expired(self):
+        self.assertIsNone(self.checker.is_online(self.address))
+        self.checker.report(self.address, False)
+        self.assertFalse(self.checker.is_online(self.address))
+        self.checker.ttl = -1
+        self.assertIsNone(self.checker.is_online(self.address))
+
+    def test_background_refresh(self):
+        self.checker.watch(self.address)
+        for _ in range(100):
+            if self.checker.is_online(self.address) is not None:
+                break
+            asyncio.run(asyncio.sleep(0.02))
+        self.assertTrue(self.checker.is_online(self.address))
+
+    def test_provider_fails_fast_when_offline(self):
+        provider = Provider("server", "deepseek-r1:32b", f"http://{self.closed_address}", health_checker=self.checker)
+        self.checker.report(provider.health_address(), False)
+        self.assertTrue(provider.known_offline())
+        self.assertIn("seem offline", provider.respond([{"role": "user", "content": "hi"}], verbose=False))
+
+    def test_cloud_provider_not_watched(self):
+        provider = Provider("test", "test-model", health_checker=self.checker)
+        self.assertIsNone(provider.health_address())
+        self.assertFalse(provider.known_offline())
+
+if __name__ == '__main__':
+    unittest.main()
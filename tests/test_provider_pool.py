@@ -0,0 +1,95 @@
+import unittest
+import os
+import sys
+import asyncio
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  # Add project root to Python path
+from sources.llm_provider import Provider
+from sources.provider_pool import ProviderPool, create_provider
+
+def make_provider(address, answer=None, error=None, delay=0.0):
+    """A server provider answering without network, or failing like the real one would."""
+    provider = Provider("server", "deepseek-r1:32b", address, health_check=False)
+    provider.calls = 0
+
+    def generate(history, verbose=False):
+        provider.calls += 1
+        time.sleep(delay)
+        if error is not None:
+            raise Exception(error)
+        return answer or f"answer from {address}"
+
+    async def generate_async(history, verbose=False):
+        await asyncio.sleep(delay)
+        return generate(history, verbose)
+
+    provider.available_providers["server"] = generate
+    provider.server_async = generate_async
+    return provider
+
+HISTORY = [{"role": "user", "content": "Hello"}]
+
+class TestProviderPool(unittest.TestCase):
+    def test_round_robin_when_idle(self):
+        providers = [make_provider(f"10.0.0.{i}:3333") for i in range(3)]
+        pool = ProviderPool(providers)
+        for _ in range(6):
+            pool.respond(HISTORY, verbose=False)
+        self.assertEqual([provider.calls for provider in providers], [2, 2, 2])
+
+    def test_least_outstanding(self):
+        providers = [make_provider("10.0.0.1:3333", delay=0.2), make_provider("10.0.0.2:3333", delay=0.2)]
+        pool = ProviderPool(providers)
+
+        async def run():
+            return await asyncio.gather(*(pool.respond_async(HISTORY, verbose=False) for _ in range(4)))
+        answers = asyncio.run(run())
+        self.assertEqual(sorted(answers), ["answer from 10.0.0.1:3333"] * 2 + ["answer from 10.0.0.2:3333"] * 2)
+        self.assertTrue(all(node["outstanding"] == 0 for node in pool.stats().values()))
+
+    def test_ewma_prefers_fast_backend(self):
+        slow, fast = make_provider("10.0.0.1:3333", delay=0.1), make_provider("10.0.0.2:3333")
+        pool = ProviderPool([slow, fast], strategy="ewma")
+        for _ in range(6):
+            pool.respond(HISTORY, verbose=False)
+        self.assertEqual(slow.calls, 1)
+        self.assertEqual(fast.calls, 5)
+
+    def test_failover_and_ejection(self):
+        down = make_provider("10.0.0.1:3333", error="Connection refused by server")
+        busy = make_provider("10.0.0.2:3333", error="Server busy, try again later")
+        up = make_provider("10.0.0.3:3333")
+        pool = ProviderPool([down, busy, up])
+        for _ in range(3):
+            self.assertEqual(pool.respond(HISTORY, verbose=False), "answer from 10.0.0.3:3333")
+        self.assertEqual((down.calls, busy.calls, up.calls), (1, 1, 3))
+        stats = pool.stats()
+        self.assertTrue(stats["10.0.0.1:3333"]["ejected"])
+        self.assertEqual(stats["10.0.0.2:3333"]["failures"], 1)
+        self.assertFalse(stats["10.0.0.3:3333"]["ejected"])
+
+    def test_all_backends_down(self):
+        pool = ProviderPool([make_provider("10.0.0.1:3333", error="refused"),
+                             make_provider("10.0.0.2:3333", error="refused")])
+        self.assertEqual(pool.respond(HISTORY, verbose=False), "Server 10.0.0.2:3333 seem offline. Unable to answer.")
+
+    def test_stream_failover(self):
+        pool = ProviderPool([make_provider("10.0.0.1:3333", error="refused"), make_provider("10.0.0.2:3333")])
+
+        async def run():
+            return [token async for token in pool.respond_stream(HISTORY)]
+        self.assertEqual(asyncio.run(run()), ["answer from 10.0.0.2:3333"])
+
+    def test_create_provider(self):
+        self.assertIsInstance(create_provider("server", "model", "10.0.0.1:3333", health_check=False), Provider)
+        pool = create_provider("server", "model", "10.0.0.1:3333, 10.0.0.2:3333", strategy="ewma", health_check=False)
+        self.assertIsInstance(pool, ProviderPool)
+        self.assertEqual(pool.server_ip, "10.0.0.1:3333,10.0.0.2:3333")
+        self.assertEqual(pool.get_model_name(), "model")
+        self.assertIsNone(pool.response_cache)
+        with self.assertRaises(ValueError):
+            ProviderPool([node.provider for node in pool.nodes], strategy="random")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+import os
+import sys
+import asyncio
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  # Add project root to Python path
+from sources.provider_scheduler import ProviderScheduler
+from sources.llm_provider import Provider
+
+class TestProviderScheduler(unittest.TestCase):
+    def test_bounds_concurrency(self):
+        scheduler = ProviderScheduler(max_concurrency=2)
+        peak = []
+
+        async def request():
+            async with scheduler.async_slot():
+                peak.append(scheduler.in_flight)
+                await asyncio.sleep(0.05)
+
+        async def run():
+            await asyncio.gather(*(request() for _ in range(6)))
+        asyncio.run(run())
+        self.assertEqual(max(peak), 2)
+        self.assertEqual(scheduler.in_flight, 0)
+
+    def test_priority_order(self):
+        scheduler = ProviderScheduler(max_concurrency=1)
+        served = []
+
+        async def request(priority):
+            async with scheduler.async_slot(priority):
+                served.append(priority)
+                await asyncio.sleep(0.01)
+
+        async def run():
+            blocker = asyncio.create_task(request("interactive"))
+            await asyncio.sleep(0)
+            tasks = [asyncio.create_task(request(priority))
+                     for priority in ["summarization", "planning", "interactive", "planning"]]
+            await asyncio.sleep(0)
+            await asyncio.gather(blocker, *tasks)
+        asyncio.run(run())
+        self.assertEqual(served, ["interactive", "interactive", "planning", "planning", "summarization"])
+
+    def test_threads_and_priority(self):
+        scheduler = ProviderScheduler(max_concurrency=1)
+        served = []
+        scheduler.acquire("interactive")
+        threads = []
+        for priority in ["summarization", "interactive"]:
+            thread = threading.Thread(target=lambda p=priority: (scheduler.acquire(p), served.append(p), scheduler.release()))
+            thread.start()
+            threads.append(thread)
+            while scheduler.stats()["queued"][priority] == 0:
+                time.sleep(0.001)
+        scheduler.release()
+        for thread in threads:
+            thread.join(timeout=5)
+        self.assertEqual(served, ["interactive", "summarization"])
+
+    def test_cancelled_waiter_gives_back_slot(self):
+        scheduler = ProviderScheduler(max_concurrency=1)
+
+        async def run():
+            await scheduler.acquire_async()
+            waiter = asyncio.create_task(scheduler.acquire_async("planning"))
+            await asyncio.sleep(0)
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+            scheduler.release()
+            await asyncio.wait_for(scheduler.acquire_async(), timeout=1)
+            scheduler.release()
+        asyncio.run(run())
+        self.assertEqual(scheduler.in_flight, 0)
+        self.assertEqual(len(scheduler.waiters), 0)
+
+    def test_unknown_priority(self):
+        with self.assertRaises(ValueError):
+            ProviderScheduler().acquire("urgent")
+
+class TestProviderPriority(unittest.TestCase):
+    def test_provider(self):
+        provider = Provider("server", "deepseek-r1:32b", "10.0.0.1:3333", health_check=False, max_concurrency=1)
+        provider.available_providers["server"] = lambda history, verbose=False: "answer"
+        self.assertEqual(provider.respond([{"role": "user", "content": "hi"}], verbose=False, priority="planning"), "answer")
+        self.assertEqual(provider.scheduler.stats()["requests"]["planning"], 1)
+        self.assertIsNone(Provider("server", "deepseek-r1:32b", "10.0.0.1:3333", health_check=False).scheduler)
+
+if __name__ == '__main__':
+    unittest.main()
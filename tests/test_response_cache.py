@@ -0,0 +1,82 @@
+import unittest
+import os
+import sys
+import asyncio
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  # Add project root to Python path
+from sources.response_cache import ResponseCache
+from sources.llm_provider import Provider
+
+class CountingProvider(Provider):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = 0
+        self.available_providers["test"] = self.counting_fn
+
+    def counting_fn(self, history, verbose=False):
+        self.calls += 1
+        return f"answer {self.calls}"
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.cache = ResponseCache(os.path.join(self.folder.name, "responses.db"), ttl=60)
+        self.history = [{"role": "user", "content": "Plan a trip to Osaka"}]
+
+    def tearDown(self):
+        self.cache.disk.connection.close()
+        self.folder.cleanup()
+
+    def test_key(self):
+        key = self.cache.key("ollama", "qwen", self.history, {})
+        self.assertEqual(key, self.cache.key("ollama", "qwen", [dict(self.history[0])], {}))
+        self.assertNotEqual(key, self.cache.key("ollama", "llama", self.history, {}))
+        self.assertNotEqual(key, self.cache.key("ollama", "qwen", self.history, {"max_tokens": 10}))
+
+    def test_disk_tier(self):
+        key = self.cache.key("ollama", "qwen", self.history, {})
+        self.cache.put(key, "answer")
+        self.cache.memory.clear()
+        self.assertEqual(self.cache.get(key), "answer")
+        self.assertEqual(self.cache.stats()["hits"], 1)
+        self.assertEqual(self.cache.stats()["memory"]["size"], 1)
+
+    def test_ttl(self):
+        key = self.cache.key("ollama", "qwen", self.history, {})
+        self.cache.put(key, "answer")
+        self.cache.ttl = -1
+        self.cache.disk.ttl = -1
+        self.assertIsNone(self.cache.get(key))
+
+    def test_is_sampled(self):
+        self.assertTrue(self.cache.is_sampled({})) # provider default temperature
+        self.assertTrue(self.cache.is_sampled({"max_tokens": 10}))
+        self.assertFalse(self.cache.is_sampled({"temperature": 0}))
+        self.assertTrue(self.cache.is_sampled({"temperature": 0.7}))
+        self.assertTrue(self.cache.is_sampled({"temperature": 0, "n": 2}))
+
+    def test_provider_cache(self):
+        provider = CountingProvider("test", "test-model", response_cache=self.cache)
+        self.assertEqual(provider.respond(self.history, verbose=False), "answer 1")
+        self.assertEqual(provider.respond(self.history, verbose=False), "answer 1")
+        self.assertEqual(asyncio.run(provider.respond_async(self.history, verbose=False)), "answer 1")
+        self.assertEqual(provider.respond(self.history, verbose=False, use_cache=False), "answer 2")
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["bypassed"]), (2, 1, 1))
+
+    def test_default_temperature_bypass(self):
+        for name, address in [("ollama", "127.0.0.1:11434"), ("server", "127.0.0.1:3333")]:
+            provider = Provider(name, "qwen", address, is_local=True, response_cache=self.cache, health_check=False)
+            self.assertEqual(provider.sampling_params(), {})
+            self.assertIsNone(provider.cache_key(self.history))
+        self.assertEqual(self.cache.stats()["bypassed"], 2)
+        self.assertEqual(CountingProvider("test", "test-model").sampling_params(), {"temperature": 0})
+
+    def test_sampled_provider_bypass(self):
+        provider = Provider("lm-studio", "qwen", "http://127.0.0.1:1234", response_cache=self.cache)
+        self.assertIsNone(provider.cache_key(self.history))
+        self.assertEqual(self.cache.stats()["bypassed"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import unittest
+import os
+import sys
+import zlib
+import tempfile
+import asyncio
+import threading
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  # Add project root to Python path
+from sources.model_registry import model_registry
+from sources.retrieval_memory import RetrievalMemory
+from sources.memory import Memory
+from sources.agents.casual_agent import CasualAgent
+from sources.agents.code_agent import CoderAgent
+
+class BagOfWordsEncoder:
+    """Deterministic stand-in for the sentence encoder: hashed bag of words."""
+    dim = 256
+
+    def encode(self, texts):
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for word in text.lower().replace('.', ' ').replace('?', ' ').split():
+                vectors[i, zlib.crc32(word.encode()) % self.dim] += 1
+        return vectors
+
+ENCODER = "test-bag-of-words"
+model_registry.register(f"encoder-{ENCODER}", BagOfWordsEncoder)
+LAZY_ENCODER = "test-bag-of-words-lazy"
+model_registry.register(f"encoder-{LAZY_ENCODER}", BagOfWordsEncoder)
+
+class TestRetrievalMemory(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.retrieval = RetrievalMemory("casual_agent", folder=self.folder.name, encoder_name=ENCODER)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_search_relevant_snippet(self):
+        self.retrieval.add("My cat is named Garfield and likes lasagna.")
+        self.retrieval.add("The meeting with the bank is on tuesday morning.")
+        results = self.retrieval.search("what is the name of my cat", k=1)
+        self.assertEqual(len(results), 1)
+        self.assertIn("Garfield", results[0]["text"])
+
+    def test_persisted_across_sessions(self):
+        self.retrieval.add("The wifi password is hunter2 for the office network.")
+        self.retrieval.save()
+        retrieval = RetrievalMemory("casual_agent", folder=self.folder.name, encoder_name=ENCODER)
+        results = retrieval.search("office wifi password", k=1)
+        self.assertEqual(len(results), 1)
+        self.assertIn("hunter2", results[0]["text"])
+        retrieval.add("The wifi password is hunter2 for the office network.") # already known
+        self.assertEqual(len(retrieval.pending), 0)
+
+    def test_known_snippet_skipped_before_search(self):
+        self.retrieval.add("The wifi password is hunter2 for the office network.")
+        self.retrieval.save()
+        retrieval = RetrievalMemory("casual_agent", folder=self.folder.name, encoder_name=ENCODER)
+        retrieval.add("The wifi password is hunter2 for the office network.")
+        self.assertEqual(len(retrieval.pending), 0)
+
+    def test_partially_written_record_dropped(self):
+        self.retrieval.add("The wifi password is hunter2 for the office network.")
+        self.retrieval.save()
+        with open(self.retrieval.path, 'a', encoding="utf-8") as f:
+            f.write('{"text": "The dentist appointment is on fri') # interrupted save
+        retrieval = RetrievalMemory("casual_agent", folder=self.folder.name, encoder_name=ENCODER)
+        retrieval.add("The dentist appointment is on friday at noon.")
+        retrieval.save()
+        retrieval = RetrievalMemory("casual_agent", folder=self.folder.name, encoder_name=ENCODER)
+        self.assertIn("hunter2", retrieval.search("office wifi password", k=1)[0]["text"])
+        self.assertIn("friday", retrieval.search("when is the dentist appointment", k=1)[0]["text"])
+        self.assertEqual(len(retrieval.index), 2)
+
+    def test_add_without_loading_encoder(self):
+        retrieval = RetrievalMemory("casual_agent", folder=self.folder.name, encoder_name=LAZY_ENCODER)
+        retrieval.add("The wifi password is hunter2 for the office network.")
+        self.assertEqual(len(retrieval.pending), 1)
+        self.assertFalse(model_registry.is_loaded(f"encoder-{LAZY_ENCODER}"))
+
+    def test_memory_recall_bounded_prompt(self):
+        memory = Memory("system", memory_compression=False, token_budget=0,
+                        long_term_memory=self.retrieval, recent_turns=2)
+        memory.push("user", "Remember that my sister lives in Lisbon.")
+        memory.push("assistant", "Noted, your sister lives in Lisbon.")
+        for i in range(5):
+            memory.push("user", f"unrelated question number {i} about cooking pasta")
+            memory.push("assistant", f"unrelated answer number {i} about cooking pasta")
+        memory.push("user", "In which city does my sister live?")
+        prompt = memory.get()
+        self.assertEqual(len(prompt), 3) # system + 2 recent turns
+        self.assertIn("Lisbon", prompt[0]['content'])
+        self.assertEqual(memory.memory[0]['content'], "system")
+
+class TestAgentLongTermMemory(unittest.TestCase):
+    def make_agent(self, agent_class, agent_type):
+        agent = agent_class.__new__(agent_class)
+        agent.type = agent_type
+        agent.memory = Memory("system", memory_compression=False)
+        agent.supports_long_term_memory = agent_class is CasualAgent
+        return agent
+
+    def test_opt_in(self):
+        agent = self.make_agent(CasualAgent, "casual_agent")
+        self.assertIsNone(agent.memory.long_term_memory)
+        agent.set_long_term_memory(True)
+        self.assertIsInstance(agent.memory.long_term_memory, RetrievalMemory)
+        agent.set_long_term_memory(False)
+        self.assertIsNone(agent.memory.long_term_memory)
+        coder = self.make_agent(CoderAgent, "code_agent")
+        coder.set_long_term_memory(True)
+        self.assertIsNone(coder.memory.long_term_memory)
+
+    def test_recall_off_event_loop(self):
+        agent = self.make_agent(CasualAgent, "casual_agent")
+        agent.set_long_term_memory(True)
+        threads = []
+        agent.memory.get = lambda: threads.append(threading.current_thread()) or []
+        asyncio.run(agent.get_memory())
+        self.assertIsNot(threads[0], threading.main_thread())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  # Add project root to Python path
+from sources.router_backends import load_zero_shot_pipeline
+from sources.router_examples import FEW_SHOTS_COMPLEXITY, FEW_SHOTS_TASKS
+
+# downloading facebook/bart-large-mnli is ~1.6GB, only run when explicitly requested
+RUN_PARITY = os.getenv("ROUTER_PARITY_TEST", "false").lower() == "true"
+
+@unittest.skipUnless(RUN_PARITY, "Set ROUTER_PARITY_TEST=true to run the router backends parity test.")
+class TestRouterBackendsParity(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.labels = ["talk", "code", "files", "web", "planification"]
+        cls.texts = [text for text, _ in FEW_SHOTS_TASKS + FEW_SHOTS_COMPLEXITY]
+        cls.reference = cls.top_labels(load_zero_shot_pipeline("torch"))
+
+    @classmethod
+    def top_labels(cls, classifier) -> list:
+        results = classifier(cls.texts, cls.labels)
+        return [result['labels'][0] for result in results]
+
+    def assert_parity(self, backend: str, min_agreement: float):
+        labels = self.top_labels(load_zero_shot_pipeline(backend))
+        agreement = sum(a == b for a, b in zip(labels, self.reference)) / len(self.reference)
+        self.assertGreaterEqual(agreement, min_agreement, f"{backend} backend agrees on {agreement:.2%} of labels")
+
+    def test_quantized_parity(self):
+        self.assert_parity("quantized", 0.9)
+
+    def test_onnx_parity(self):
+        self.assert_parity("onnx", 0.98)
+
+class TestRouterBackends(unittest.TestCase):
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            load_zero_shot_pipeline("tensorrt")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  # Add project root to Python path
+from sources.router_heuristics import HeuristicRouter
+from sources.router_examples import FEW_SHOTS_TASKS
+
+class TestHeuristicRouter(unittest.TestCase):
+    def setUp(self):
+        self.router = HeuristicRouter(FEW_SHOTS_TASKS, threshold=0.9)
+        self.labels = ["talk", "code", "files", "web", "planification"]
+
+    def test_rules(self):
+        test_cases = [
+            ("hi", "talk"),
+            ("Hello!", "talk"),
+            ("Can you search the web for the latest AI news?", "web"),
+            ("Find the report_2024.pdf somewhere", "files"),
+            ("Write a python script that sorts a list", "code"),
+        ]
+        for text, expected in test_cases:
+            with self.subTest(text=text):
+                label, confidence, tier = self.router.predict(text, self.labels)
+                self.assertEqual(label, expected)
+                self.assertEqual(tier, "rules")
+
+    def test_conflicting_rules(self):
+        # code and web rules both match, the rules tier must not decide
+        self.assertIsNone(self.router.match_rules("Write a python script to search the web for news", self.labels))
+
+    def test_label_not_available(self):
+        label, _, _ = self.router.predict("Can you search the web for the latest AI news?", ["talk", "code"])
+        self.assertNotEqual(label, "web")
+
+    def test_stats(self):
+        self.router.record("rules")
+        self.router.record("neural")
+        stats = self.router.stats()
+        self.assertEqual(stats["rules"]["hits"], 1)
+        self.assertEqual(stats["ngram"]["hits"], 0)
+        self.assertEqual(stats["neural"]["hit_rate"], 0.5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,23 @@
+import unittest
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  # Add project root to Python path
+from sources.router_state import router_state_key
+
+class TestRouterStateKey(unittest.TestCase):
+    def setUp(self):
+        self.router_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'llm_router'))
+        self.examples = {"talk": [("hi", "talk")], "complexity": [("hi", "LOW")]}
+
+    def test_key_is_stable(self):
+        self.assertEqual(router_state_key(self.router_path, self.examples),
+                         router_state_key(self.router_path, dict(self.examples)))
+
+    def test_key_changes_with_examples(self):
+        changed = {"talk": [("hi", "talk"), ("hello", "talk")], "complexity": [("hi", "LOW")]}
+        self.assertNotEqual(router_state_key(self.router_path, self.examples),
+                            router_state_key(self.router_path, changed))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  # Add project root to Python path
+from sources.session_journal import SessionJournal, write_latest_session, read_latest_session
+
+class TestSessionJournal(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, "memory_test.txt")
+        self.memory = [{"role": "system", "content": "system"}]
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def read_records(self):
+        with open(self.path, 'r', encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def test_only_changes_appended(self):
+        journal = SessionJournal(self.path)
+        journal.sync(self.memory)
+        self.memory.append({"role": "user", "content": "hello"})
+        journal.sync(self.memory)
+        journal.sync(self.memory)
+        self.memory.append({"role": "assistant", "content": "hi"})
+        journal.sync(self.memory)
+        journal.close()
+        records = self.read_records()
+        self.assertEqual([record["op"] for record in records], ["snapshot", "append", "append"])
+        self.assertEqual(SessionJournal.replay(self.path), self.memory)
+
+    def test_edited_history_truncated(self):
+        journal = SessionJournal(self.path)
+        self.memory += [{"role": "user", "content": "a"}, {"role": "assistant", "content": "b"}]
+        journal.sync(self.memory)
+        self.memory[1]["content"] = "summary of a"
+        journal.sync(self.memory)
+        del self.memory[2]
+        journal.sync(self.memory)
+        journal.close()
+        self.assertEqual(SessionJournal.replay(self.path), self.memory)
+
+    def test_compaction(self):
+        journal = SessionJournal(self.path, compact_every=4)
+        for i in range(10):
+            self.memory.append({"role": "user", "content": str(i)})
+            journal.sync(self.memory)
+        journal.close()
+        self.assertLessEqual(len(self.read_records()), 4)
+        self.assertEqual(SessionJournal.replay(self.path), self.memory)
+
+    def test_torn_tail_ignored(self):
+        journal = SessionJournal(self.path)
+        journal.sync(self.memory)
+        journal.close()
+        with open(self.path, 'a', encoding="utf-8") as f:
+            f.write('{"op": "append", "message": {"role": "us')
+        self.assertEqual(SessionJournal.replay(self.path), self.memory)
+
+    def test_legacy_json_session(self):
+        with open(self.path, 'w') as f:
+            f.write(json.dumps(self.memory))
+        self.assertEqual(SessionJournal.replay(self.path), self.memory)
+
+    def test_latest_session_marker(self):
+        self.assertIsNone(read_latest_session(self.folder.name))
+        write_latest_session(self.folder.name, "memory_test.txt")
+        self.assertIsNone(read_latest_session(self.folder.name)) # file does not exist yet
+        SessionJournal(self.path).sync(self.memory)
+        self.assertEqual(read_latest_session(self.folder.name), "memory_test.txt")
+
+if __name__ == '__main__':
+    unittest.main()
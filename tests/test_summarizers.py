@@ -0,0 +1,65 @@
+import unittest
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  # Add project root to Python path
+from sources.summarizers import TextRankSummarizer, LEDSummarizer, get_summarizer, summarizers_report
+
+TEXT = ("The city council approved the new budget on Monday. "
+        "The budget increases funding for public transport and schools. "
+        "Public transport will get new buses and longer schedules. "
+        "Schools will hire more teachers with the new funding. "
+        "The weather was sunny during the meeting. "
+        "Several residents spoke about the budget for public transport and schools. "
+        "A local bakery opened next to the city hall.")
+
+class TestTextRankSummarizer(unittest.TestCase):
+    def setUp(self):
+        self.summarizer = TextRankSummarizer(ratio=0.3)
+
+    def test_summary_is_extractive_and_shorter(self):
+        summary = self.summarizer.summarize(TEXT, min_length=8)
+        sentences = self.summarizer.split_sentences(TEXT)
+        self.assertLess(len(summary), len(TEXT))
+        for sentence in self.summarizer.split_sentences(summary):
+            self.assertIn(sentence, sentences)
+
+    def test_keeps_original_order(self):
+        summary = self.summarizer.summarize(TEXT, min_length=8)
+        sentences = self.summarizer.split_sentences(TEXT)
+        positions = [sentences.index(sentence) for sentence in self.summarizer.split_sentences(summary)]
+        self.assertEqual(positions, sorted(positions))
+
+    def test_central_sentence_ranked_above_unrelated(self):
+        sentences = self.summarizer.split_sentences(TEXT)
+        scores = self.summarizer.rank(sentences)
+        self.assertGreater(scores[5], scores[4]) # budget/transport/schools vs weather
+        self.assertGreater(scores[5], scores[6]) # budget/transport/schools vs bakery
+
+    def test_short_text_unchanged(self):
+        self.assertEqual(self.summarizer.summarize("One sentence. Two sentences."), "One sentence. Two sentences.")
+
+    def test_report(self):
+        self.summarizer.summarize(TEXT, min_length=8)
+        report = self.summarizer.report()
+        self.assertEqual(report["calls"], 1)
+        self.assertGreaterEqual(report["mean_latency"], 0.0)
+        self.assertLess(report["mean_compression_ratio"], 1.0)
+
+class TestGetSummarizer(unittest.TestCase):
+    def test_shared_instances(self):
+        self.assertIs(get_summarizer("textrank"), get_summarizer("textrank"))
+        self.assertIn("textrank", summarizers_report())
+
+    def test_engines_params(self):
+        self.assertIsInstance(get_summarizer("greedy"), LEDSummarizer)
+        self.assertEqual(get_summarizer("greedy").params("text", 64)["num_beams"], 1)
+        self.assertEqual(get_summarizer("beam").params("text", 64)["num_beams"], 4)
+        self.assertNotEqual(get_summarizer("greedy").params("text", 64), get_summarizer("quantized").params("text", 64))
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            get_summarizer("abstractive")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+import os
+import sys
+import asyncio
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  # Add project root to Python path
+from sources.token_stream import TokenStream
+from sources.llm_provider import Provider
+
+class TestTokenStream(unittest.TestCase):
+    def test_publish_to_subscribers(self):
+        async def run():
+            stream = TokenStream()
+            first, second = stream.subscribe(), stream.subscribe()
+            stream.publish({"event": "token", "content": "a"})
+            return await first.get(), await second.get()
+        self.assertEqual(asyncio.run(run()), ({"event": "token", "content": "a"},) * 2)
+
+    def test_slow_subscriber_drops_oldest(self):
+        async def run():
+            stream = TokenStream(max_queue=2)
+            queue = stream.subscribe()
+            for i in range(3):
+                stream.publish({"event": "token", "content": str(i)})
+            return [queue.get_nowait()["content"] for _ in range(queue.qsize())]
+        self.assertEqual(asyncio.run(run()), ["1", "2"])
+
+    def test_publish_from_thread(self):
+        async def run():
+            stream = TokenStream()
+            queue = stream.subscribe()
+            thread = threading.Thread(target=stream.publish, args=({"event": "end"},))
+            thread.start()
+            thread.join()
+            return await asyncio.wait_for(queue.get(), timeout=1)
+        self.assertEqual(asyncio.run(run()), {"event": "end"})
+
+    def test_events_unsubscribe(self):
+        async def run():
+            stream = TokenStream()
+            events = stream.events(heartbeat=0.01)
+            self.assertIsNone(await events.__anext__())
+            self.assertTrue(stream.has_subscribers)
+            await events.aclose()
+            return stream.has_subscribers
+        self.assertFalse(asyncio.run(run()))
+
+class TestRespondStream(unittest.TestCase):
+    def test_non_streaming_provider_yields_answer(self):
+        provider = Provider("test", "test-model")
+        async def run():
+            return [token async for token in provider.respond_stream([{"role": "user", "content": "hi"}])]
+        tokens = asyncio.run(run())
+        self.assertEqual(len(tokens), 1)
+        self.assertIn('"plan"', tokens[0])
+
+    def test_openai_compatible_endpoints(self):
+        self.assertIsNone(Provider("test", "test-model").openai_compatible_endpoint())
+        endpoint = Provider("lm-studio", "qwen", "http://127.0.0.1:1234").openai_compatible_endpoint()
+        self.assertEqual(endpoint["base_url"], "http://127.0.0.1:1234/v1")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  # Add project root to Python path
+from sources.vector_index import VectorIndex
+
+class TestVectorIndex(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.centers = VectorIndex.normalize(rng.normal(size=(4, 16)))
+        self.vectors = np.concatenate([center + 0.05 * rng.normal(size=(50, 16)) for center in self.centers])
+        self.labels = [label for label in ["web", "code", "files", "talk"] for _ in range(50)]
+
+    def test_empty_search(self):
+        index = VectorIndex(16)
+        self.assertEqual(index.search(self.centers, k=3), [[], [], [], []])
+
+    def test_exact_search(self):
+        index = VectorIndex(16)
+        index.add(self.vectors, self.labels)
+        self.assertEqual(len(index), 200)
+        results = index.search(self.centers, k=5)
+        for expected, neighbors in zip(["web", "code", "files", "talk"], results):
+            self.assertEqual(len(neighbors), 5)
+            self.assertTrue(all(label == expected for _, label in neighbors))
+            scores = [score for score, _ in neighbors]
+            self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_ivf_search(self):
+        index = VectorIndex(16, n_lists=4, n_probe=1)
+        index.add(self.vectors, self.labels)
+        self.assertIsNotNone(index.centroids)
+        results = index.search(self.centers, k=5)
+        for expected, neighbors in zip(["web", "code", "files", "talk"], results):
+            self.assertTrue(all(label == expected for _, label in neighbors))
+
+    def test_add_after_training(self):
+        index = VectorIndex(16, n_lists=4, n_probe=1)
+        index.add(self.vectors, self.labels)
+        index.add(self.centers[:1] * 3, ["new"])
+        self.assertEqual(index.search(self.centers[:1], k=1)[0][0][1], "new")
+
+    def test_inverted_lists(self):
+        index = VectorIndex(16, n_lists=4, n_probe=1)
+        index.add(self.vectors, self.labels)
+        index.add(self.centers, ["web", "code", "files", "talk"])
+        ids = np.sort(np.concatenate(index.lists))
+        self.assertTrue(np.array_equal(ids, np.arange(len(index))))
+        for members in index.lists:
+            self.assertEqual(len({index.payloads[i] for i in members}), 1)
+
+    def test_dimension_mismatch(self):
+        index = VectorIndex(16)
+        with self.assertRaises(ValueError):
+            index.add(np.ones((1, 8)), ["web"])
+        with self.assertRaises(ValueError):
+            index.add(np.ones((2, 16)), ["web"])
+
+if __name__ == '__main__':
+    unittest.main()